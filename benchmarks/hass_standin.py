@@ -0,0 +1,318 @@
+"""Minimal offline stand-in for the parts of Home Assistant the integration imports.
+
+Only what is needed to import the integration, drive the coordinator and
+entity hot paths and run coordinator updates is provided - no event bus, no
+recorder, no state machine and no timers (scheduled retries never fire).
+Never use this outside of the benchmarks.
+"""
+import asyncio
+import enum
+import sys
+import types
+from datetime import datetime, timezone
+
+
+def _module(name: str, **attributes) -> types.ModuleType:
+    """Register a module (and attach it to its parent package)."""
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent in sys.modules:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+class Platform(str, enum.Enum):
+    WEATHER = "weather"
+    SENSOR = "sensor"
+
+
+class UnitOfTemperature(str, enum.Enum):
+    CELSIUS = "°C"
+
+
+class UnitOfPressure(str, enum.Enum):
+    HPA = "hPa"
+
+
+class UnitOfSpeed(str, enum.Enum):
+    METERS_PER_SECOND = "m/s"
+
+
+class UnitOfTime(str, enum.Enum):
+    MILLISECONDS = "ms"
+
+
+class UnitOfInformation(str, enum.Enum):
+    BYTES = "B"
+
+
+class EntityCategory(str, enum.Enum):
+    DIAGNOSTIC = "diagnostic"
+
+
+class HomeAssistantError(Exception):
+    """Base error."""
+
+
+class _Converter:
+    """Unit converter without any units (references are not benchmarked)."""
+
+    @classmethod
+    def convert(cls, value, from_unit, to_unit):
+        if from_unit != to_unit:
+            raise HomeAssistantError(from_unit)
+        return value
+
+
+class State:
+    def __init__(self, entity_id: str, state: str, attributes: dict | None = None) -> None:
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes or {}
+
+
+class States(dict):
+    def async_set(self, entity_id: str, state: str, attributes: dict | None = None) -> None:
+        self[entity_id] = State(entity_id, state, attributes)
+
+
+class Bus:
+    def async_fire(self, event_type, event_data=None) -> None:
+        pass
+
+
+class Config:
+    latitude = 50.0755
+    longitude = 14.4378
+    time_zone = "Europe/Prague"
+
+
+class HomeAssistant:
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        self.data = {}
+        self.states = States()
+        self.bus = Bus()
+        self.config = Config()
+        self.loop = loop or asyncio.new_event_loop()
+
+    def async_create_task(self, coro, *args, **kwargs):
+        if self.loop.is_running():
+            return self.loop.create_task(coro)
+        coro.close()
+        return None
+
+    async def async_add_executor_job(self, func, *args):
+        if self.loop.is_running():
+            return await self.loop.run_in_executor(None, func, *args)
+        return func(*args)
+
+
+def callback(func):
+    return func
+
+
+class ConfigEntry:
+    def __init__(self, data: dict, options: dict | None = None, entry_id: str = "benchmark") -> None:
+        self.data = data
+        self.options = options or {}
+        self.entry_id = entry_id
+
+
+class UpdateFailed(Exception):
+    """Update failed."""
+
+
+class DataUpdateCoordinator:
+    def __init__(self, hass, logger, *, name, update_interval=None, **kwargs) -> None:
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+        self.data = None
+        self.last_update_success = True
+
+    async def async_refresh(self) -> None:
+        try:
+            self.data = await self._async_update_data()
+            self.last_update_success = True
+        except UpdateFailed:
+            self.last_update_success = False
+
+    def async_set_updated_data(self, data) -> None:
+        self.data = data
+        self.last_update_success = True
+
+    async def async_shutdown(self) -> None:
+        pass
+
+
+class CoordinatorEntity:
+    def __init__(self, coordinator, context=None) -> None:
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.last_update_success
+
+    def async_write_ha_state(self) -> None:
+        pass
+
+    def _handle_coordinator_update(self) -> None:
+        self.async_write_ha_state()
+
+
+class Store:
+    """In-memory storage helper."""
+
+    def __init__(self, hass, version, key, **kwargs) -> None:
+        self.key = key
+        self.data = None
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data) -> None:
+        self.data = data
+
+    def async_delay_save(self, data_func, delay=0) -> None:
+        self.data = data_func()
+
+    async def async_remove(self) -> None:
+        self.data = None
+
+
+class Entity:
+    _attr_unique_id = None
+    _attr_name = None
+    hass = None
+    entity_id = None
+
+
+class WeatherEntityFeature(enum.IntFlag):
+    FORECAST_DAILY = 1
+    FORECAST_HOURLY = 2
+
+
+class WeatherEntity(Entity):
+    pass
+
+
+class SensorEntity(Entity):
+    pass
+
+
+class SensorStateClass(str, enum.Enum):
+    MEASUREMENT = "measurement"
+    TOTAL_INCREASING = "total_increasing"
+
+
+def _not_scheduled(*args, **kwargs):
+    """Time tracking is not needed - benchmarks never wait for timers."""
+    return lambda: None
+
+
+def _decorator(*args, **kwargs):
+    return lambda func: func
+
+
+def install() -> None:
+    """Register the stand-in modules (no-op if Home Assistant is importable)."""
+    if "homeassistant" in sys.modules:
+        return
+
+    _module("homeassistant")
+    _module("homeassistant.components")
+    _module("homeassistant.helpers")
+    _module("homeassistant.util")
+    _module(
+        "homeassistant.const",
+        Platform=Platform,
+        UnitOfTemperature=UnitOfTemperature,
+        UnitOfPressure=UnitOfPressure,
+        UnitOfSpeed=UnitOfSpeed,
+        UnitOfTime=UnitOfTime,
+        UnitOfInformation=UnitOfInformation,
+        EntityCategory=EntityCategory,
+        EVENT_HOMEASSISTANT_CLOSE="homeassistant_close",
+    )
+    _module("homeassistant.exceptions", HomeAssistantError=HomeAssistantError)
+    _module(
+        "homeassistant.core",
+        HomeAssistant=HomeAssistant,
+        State=State,
+        Event=object,
+        callback=callback,
+        CALLBACK_TYPE=object,
+    )
+    _module("homeassistant.config_entries", ConfigEntry=ConfigEntry)
+    _module(
+        "homeassistant.helpers.update_coordinator",
+        DataUpdateCoordinator=DataUpdateCoordinator,
+        CoordinatorEntity=CoordinatorEntity,
+        UpdateFailed=UpdateFailed,
+    )
+    _module(
+        "homeassistant.helpers.event",
+        async_call_later=_not_scheduled,
+        async_track_point_in_utc_time=_not_scheduled,
+        async_track_point_in_time=_not_scheduled,
+    )
+    _module("homeassistant.helpers.storage", Store=Store)
+    _module("homeassistant.helpers.entity", Entity=Entity, EntityCategory=EntityCategory)
+    _module("homeassistant.helpers.entity_platform", AddEntitiesCallback=object)
+    _module(
+        "homeassistant.components.weather",
+        WeatherEntity=WeatherEntity,
+        WeatherEntityFeature=WeatherEntityFeature,
+        Forecast=dict,
+        ATTR_FORECAST_CONDITION="condition",
+        ATTR_FORECAST_PRECIPITATION="precipitation",
+        ATTR_FORECAST_TEMP="temperature",
+        ATTR_FORECAST_TIME="datetime",
+        ATTR_FORECAST_WIND_BEARING="wind_bearing",
+        ATTR_FORECAST_WIND_SPEED="wind_speed",
+    )
+    _module(
+        "homeassistant.components.sensor",
+        SensorEntity=SensorEntity,
+        SensorStateClass=SensorStateClass,
+    )
+    _module(
+        "homeassistant.components.websocket_api",
+        websocket_command=_decorator,
+        async_response=lambda func: func,
+        async_register_command=lambda hass, handler: None,
+        ActiveConnection=object,
+        ERR_NOT_FOUND="not_found",
+        ERR_INVALID_FORMAT="invalid_format",
+    )
+    _module(
+        "homeassistant.util.unit_conversion",
+        TemperatureConverter=_Converter,
+        SpeedConverter=_Converter,
+        PressureConverter=_Converter,
+    )
+    _module(
+        "homeassistant.util.dt",
+        utcnow=lambda: datetime.now(timezone.utc),
+        now=lambda: datetime.now().astimezone(),
+    )
+
+    if "voluptuous" not in sys.modules:
+        try:
+            import voluptuous  # noqa: F401
+        except ImportError:
+            _module(
+                "voluptuous",
+                Required=lambda key, **kwargs: key,
+                Optional=lambda key, **kwargs: key,
+                In=lambda container: container,
+                All=lambda *validators, **kwargs: validators[-1],
+                Coerce=lambda type_, **kwargs: type_,
+                Range=lambda **kwargs: None,
+                Schema=lambda *args, **kwargs: None,
+                ALLOW_EXTRA=object(),
+            )
@@ -0,0 +1,241 @@
+"""Load test of N PočasíMeteo coordinators against the mock API server.
+
+Creates 1-500 coordinators (one per station) sharing one pooled HTTP session
+like the integration does, and runs full updates against mock_server.py
+(started in-process unless --base-url is given). Reports update latency
+percentiles, failures, peak memory, event-loop lag and server statistics
+per round, so scaling limits show up before adding more stations.
+
+    python benchmarks/load_test.py --stations 100 --rounds 3
+    python benchmarks/load_test.py --stations 500 --latency 80 --jitter 40 --error-rate 0.02
+
+The first round also triggers the refresh URL of every station in the
+background (as after a Home Assistant restart); later rounds only fetch the
+model files (mostly 304). Add --refresh-delay to make the first round wait
+for upstream to regenerate the data.
+"""
+import argparse
+import asyncio
+import logging
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import aiohttp
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+import hass_standin  # noqa: E402
+
+hass_standin.install()
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.pocasimeteo.const import (  # noqa: E402
+    CONF_BASE_URL,
+    CONF_STATION,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+)
+from custom_components.pocasimeteo.coordinator import (  # noqa: E402
+    PocasimeteoDataUpdateCoordinator,
+)
+from mock_server import MockPocasimeteoServer, add_arguments, options_from_args  # noqa: E402
+
+MAX_STATIONS = 500
+
+# Perioda měření zpoždění event loopu
+LAG_INTERVAL = 0.05
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a sleeping task."""
+
+    def __init__(self, interval: float = LAG_INTERVAL) -> None:
+        """Initialize the monitor."""
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - started - self.interval, 0.0))
+
+    def start(self) -> None:
+        """Start measuring (clears previous samples)."""
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> list[float]:
+        """Stop measuring; returns lag samples in seconds."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return self.samples
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return a percentile (nearest rank) of the values."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def peak_rss_mib() -> float:
+    """Return the peak resident set size of the process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux vrací KiB, macOS bajty
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def _timed_refresh(coordinator, semaphore: asyncio.Semaphore | None) -> tuple[float, bool]:
+    """Run one coordinator update; returns (seconds, success)."""
+    if semaphore is None:
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+    else:
+        async with semaphore:
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+    return time.perf_counter() - started, coordinator.last_update_success
+
+
+async def run_round(coordinators: list, concurrency: int) -> dict:
+    """Update all coordinators once and return the round statistics."""
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(_timed_refresh(coordinator, semaphore) for coordinator in coordinators)
+    )
+    wall = time.perf_counter() - started
+    lag = await monitor.stop()
+
+    latencies = [seconds for seconds, _ in results]
+    failures = sum(1 for _, success in results if not success)
+    return {
+        "wall": wall,
+        "ok": len(results) - failures,
+        "failed": failures,
+        "p50": percentile(latencies, 0.50),
+        "p90": percentile(latencies, 0.90),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies, default=float("nan")),
+        "lag_p99": percentile(lag, 0.99) if lag else 0.0,
+        "lag_max": max(lag, default=0.0),
+    }
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the load test."""
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = MockPocasimeteoServer(options_from_args(args))
+        base_url = await server.start()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    # Stejný connection pool jako integrace (__init__._async_get_session)
+    connector = aiohttp.TCPConnector(
+        limit=args.pool_limit or HTTP_POOL_LIMIT,
+        limit_per_host=args.pool_limit_per_host or HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+    )
+    session = aiohttp.ClientSession(connector=connector)
+    hass = HomeAssistant(asyncio.get_running_loop())
+    rss_before = peak_rss_mib()
+    coordinators = [
+        PocasimeteoDataUpdateCoordinator(
+            hass,
+            ConfigEntry(
+                {CONF_STATION: f"station-{index}"},
+                {CONF_BASE_URL: base_url},
+                entry_id=f"load-test-{index}",
+            ),
+            session,
+        )
+        for index in range(args.stations)
+    ]
+
+    print(
+        f"{args.stations} stations against {base_url} "
+        f"(pool {connector.limit}/{connector.limit_per_host}, "
+        f"concurrency {args.concurrency or 'unlimited'})"
+    )
+    print(
+        f"{'round':>5} {'wall s':>8} {'ok':>5} {'failed':>6} {'p50 ms':>9} {'p90 ms':>9} "
+        f"{'p99 ms':>9} {'max ms':>9} {'lag p99':>8} {'lag max':>8} {'RSS MiB':>8}"
+    )
+    failed = 0
+    try:
+        for round_number in range(1, args.rounds + 1):
+            stats = await run_round(coordinators, args.concurrency)
+            failed += stats["failed"]
+            print(
+                f"{round_number:>5} {stats['wall']:>8.2f} {stats['ok']:>5} {stats['failed']:>6} "
+                f"{stats['p50'] * 1000:>9.1f} {stats['p90'] * 1000:>9.1f} "
+                f"{stats['p99'] * 1000:>9.1f} {stats['max'] * 1000:>9.1f} "
+                f"{stats['lag_p99'] * 1000:>8.1f} {stats['lag_max'] * 1000:>8.1f} "
+                f"{peak_rss_mib():>8.1f}"
+            )
+    finally:
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await session.close()
+        if server is not None:
+            await server.stop()
+
+    print(f"Peak RSS {peak_rss_mib():.1f} MiB ({peak_rss_mib() - rss_before:+.1f} MiB for coordinators)")
+    if args.tracemalloc:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Python heap {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB")
+    if server is not None:
+        print(f"Server: {dict(sorted(server.stats.items()))}")
+    return 1 if failed and args.fail_on_error else 0
+
+
+def main() -> int:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stations", type=int, default=10, help=f"1-{MAX_STATIONS}")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=0, help="max parallel updates (0 = all)")
+    parser.add_argument("--base-url", help="use a running server instead of the in-process mock")
+    parser.add_argument("--pool-limit", type=int, default=0, help=f"default {HTTP_POOL_LIMIT}")
+    parser.add_argument(
+        "--pool-limit-per-host", type=int, default=0, help=f"default {HTTP_POOL_LIMIT_PER_HOST}"
+    )
+    parser.add_argument("--tracemalloc", action="store_true", help="also trace the Python heap (slow)")
+    parser.add_argument("--fail-on-error", action="store_true", help="exit with 1 if an update failed")
+    parser.add_argument("--verbose", action="store_true", help="show integration logs")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if not 1 <= args.stations <= MAX_STATIONS:
+        parser.error(f"--stations must be between 1 and {MAX_STATIONS}")
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
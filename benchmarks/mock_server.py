@@ -0,0 +1,266 @@
+"""Local stand-in for the PočasíMeteo API serving recorded model files.
+
+Serves /{station}/predpoved/ (refresh) and /{station}/predpoved/data/{file}
+for any station name, using the recorded payloads in fixtures/ moved to the
+current hour. Conditional requests are answered with 304 like upstream, and
+faults can be injected: latency, 404s, forced 304s, hanging requests
+(timeouts), malformed JSON and unknown payload layouts. With --refresh-delay
+a station serves stale data until that many seconds after its refresh URL
+was called (upstream regenerating the data).
+
+    python benchmarks/mock_server.py --port 8080 --latency 50 --error-rate 0.05
+
+Point the integration at it with the base URL option (http://127.0.0.1:8080).
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import sys
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import formatdate
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from payloads import LAYOUTS, model_payload, read_fixture, rebase  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pseudo-layout, který integrace nezná (test detekce formátu)
+UNKNOWN_LAYOUT = {"predpoved": {"hodiny": []}, "PosledniAktualizace": None}
+
+# Stáří PosledniAktualizace stanice, která ještě nemá přegenerovaná data
+STALE_AGE_MINUTES = 180
+
+
+@dataclass
+class MockOptions:
+    """Behaviour of the mock server; rates are probabilities per request."""
+
+    layout: str = "root"  # jeden z LAYOUTS nebo "mixed" (podle stanice)
+    latency: float = 0.0  # ms, střední zpoždění odpovědi
+    jitter: float = 0.0  # ms, rozptyl zpoždění (rovnoměrně ±)
+    error_rate: float = 0.0  # 404
+    not_modified_rate: float = 0.0  # 304 i pro změněná data (pokud klient poslal validátory)
+    timeout_rate: float = 0.0  # odpověď se pozdrží o hang_seconds
+    malformed_rate: float = 0.0  # useknutý JSON
+    unknown_layout_rate: float = 0.0  # JSON v neznámém formátu
+    hang_seconds: float = 30.0
+    missing_models: frozenset = field(default_factory=frozenset)  # vždy 404
+    age_minutes: int = 20  # stáří PosledniAktualizace
+    conditional: bool = True  # ETag / Last-Modified a 304
+    refresh_delay: float | None = None  # s, data jsou zastaralá do refresh + delay
+    seed: int | None = None
+
+
+class MockPocasimeteoServer:
+    """In-process mock server (aiohttp)."""
+
+    def __init__(self, options: MockOptions | None = None) -> None:
+        """Initialize the server."""
+        self.options = options or MockOptions()
+        self.stats: Counter = Counter()
+        self._random = random.Random(self.options.seed)
+        self._recorded = {layout: read_fixture(layout) for layout in LAYOUTS}
+        # (layout, model, hodina) -> (tělo, ETag, Last-Modified)
+        self._bodies: dict[tuple, tuple[bytes, str, str]] = {}
+        # Stanice -> čas volání refresh URL
+        self._refreshed: dict[str, float] = {}
+        self._runner: web.AppRunner | None = None
+        self.base_url: str | None = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/{station}/predpoved/", self._handle_refresh)
+        self.app.router.add_get("/{station}/predpoved/data/{filename}", self._handle_model)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening; returns the base URL (port 0 = any free port)."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _layout(self, station: str) -> str:
+        """Return the payload layout served to a station."""
+        if self.options.layout != "mixed":
+            return self.options.layout
+        return LAYOUTS[zlib.crc32(station.encode()) % len(LAYOUTS)]
+
+    def _is_ready(self, station: str) -> bool:
+        """Return True if the station serves regenerated (fresh) data."""
+        if self.options.refresh_delay is None:
+            return True
+        refreshed = self._refreshed.get(station)
+        return refreshed is not None and time.monotonic() >= refreshed + self.options.refresh_delay
+
+    def _body(
+        self, layout: str, model: str, ready: bool = True, regenerated: bool = False
+    ) -> tuple[bytes, str, str]:
+        """Return the model file (built once per hour, or per minute once regenerated)."""
+        # Přegenerovaná data (po refresh URL) nesou čas přegenerování (přesnost na minuty)
+        regenerated = ready and regenerated
+        period = 60 if regenerated else 3600
+        key = (layout, model, int(time.time() // period), ready, regenerated)
+        cached = self._bodies.get(key)
+        if cached is None:
+            payload = model_payload(layout, model, self._recorded[layout])
+            if regenerated:
+                age_minutes = 0
+            else:
+                age_minutes = self.options.age_minutes if ready else STALE_AGE_MINUTES
+            payload = rebase(payload, now=datetime.now(), age_minutes=age_minutes)
+            body = json.dumps(payload, ensure_ascii=False).encode()
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            cached = self._bodies[key] = (body, etag, formatdate(time.time(), usegmt=True))
+        return cached
+
+    def _roll(self, rate: float) -> bool:
+        """Return True with the given probability."""
+        return rate > 0 and self._random.random() < rate
+
+    async def _delay(self) -> None:
+        """Simulate network and server latency."""
+        options = self.options
+        if options.latency or options.jitter:
+            delay = options.latency + self._random.uniform(-options.jitter, options.jitter)
+            await asyncio.sleep(max(delay, 0.0) / 1000)
+
+    async def _handle_refresh(self, request: web.Request) -> web.Response:
+        """Handle the refresh URL."""
+        self.stats["refresh"] += 1
+        await self._delay()
+        self._refreshed.setdefault(request.match_info["station"], time.monotonic())
+        return web.Response(text="OK")
+
+    async def _handle_model(self, request: web.Request) -> web.StreamResponse:
+        """Serve a model file with the configured faults."""
+        options = self.options
+        station = request.match_info["station"]
+        filename = request.match_info["filename"]
+        model = filename.split("_data.json")[0]
+        self.stats["requests"] += 1
+        await self._delay()
+
+        if self._roll(options.timeout_rate):
+            self.stats["timeout"] += 1
+            await asyncio.sleep(options.hang_seconds)
+
+        if model in options.missing_models or self._roll(options.error_rate):
+            self.stats["404"] += 1
+            raise web.HTTPNotFound()
+
+        ready = self._is_ready(station)
+        if not ready:
+            self.stats["stale"] += 1
+        body, etag, last_modified = self._body(
+            self._layout(station), model, ready, station in self._refreshed
+        )
+        sent_validators = "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+        if options.conditional and sent_validators and (
+            request.headers.get("If-None-Match") == etag
+            or request.headers.get("If-Modified-Since") == last_modified
+            or self._roll(options.not_modified_rate)
+        ):
+            self.stats["304"] += 1
+            return web.Response(status=304, headers={"ETag": etag, "Last-Modified": last_modified})
+
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        if options.conditional:
+            headers.update({"ETag": etag, "Last-Modified": last_modified})
+
+        if self._roll(options.unknown_layout_rate):
+            self.stats["unknown_layout"] += 1
+            return web.Response(body=json.dumps(UNKNOWN_LAYOUT).encode(), headers=headers)
+        if self._roll(options.malformed_rate):
+            self.stats["malformed"] += 1
+            return web.Response(body=body[: len(body) // 2], headers=headers)
+
+        self.stats["200"] += 1
+        return web.Response(body=body, headers=headers)
+
+
+def options_from_args(args: argparse.Namespace) -> MockOptions:
+    """Build server options from parsed command line arguments."""
+    return MockOptions(
+        layout=args.layout,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        not_modified_rate=args.not_modified_rate,
+        timeout_rate=args.timeout_rate,
+        malformed_rate=args.malformed_rate,
+        unknown_layout_rate=args.unknown_layout_rate,
+        hang_seconds=args.hang_seconds,
+        missing_models=frozenset(filter(None, args.missing_models.split(","))),
+        age_minutes=args.age_minutes,
+        conditional=not args.no_conditional,
+        refresh_delay=args.refresh_delay,
+        seed=args.seed,
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add mock server options to a command line parser."""
+    parser.add_argument("--layout", default="root", choices=(*LAYOUTS, "mixed"))
+    parser.add_argument("--latency", type=float, default=0.0, help="ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of 404")
+    parser.add_argument("--not-modified-rate", type=float, default=0.0, help="probability of forced 304")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="probability of a hanging request")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="probability of truncated JSON")
+    parser.add_argument("--unknown-layout-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--missing-models", default="", help="comma separated, always 404")
+    parser.add_argument("--age-minutes", type=int, default=20, help="age of PosledniAktualizace")
+    parser.add_argument("--no-conditional", action="store_true", help="no ETag/Last-Modified/304")
+    parser.add_argument(
+        "--refresh-delay", type=float, help="s, stale data until this long after the refresh URL call"
+    )
+    parser.add_argument("--seed", type=int)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the server until interrupted."""
+    server = MockPocasimeteoServer(options_from_args(args))
+    base_url = await server.start(args.host, args.port)
+    print(f"Mock PočasíMeteo API listening on {base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(dict(server.stats))
+
+
+def main() -> None:
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_arguments(parser)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Recorded PočasíMeteo model payloads for benchmarks and the mock server.
+
+fixtures/ holds one recorded payload per layout the coordinator extracts.
+Forecast times are moved to the current hour on load, so staleness and
+current-hour lookups behave like with live data, and rows can be repeated to
+simulate longer forecasts.
+"""
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import hass_standin
+
+hass_standin.install()
+
+from custom_components.pocasimeteo.forecast import (  # noqa: E402
+    API_DATETIME_FORMAT,
+    parse_api_datetime,
+)
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+LAYOUTS = ("root", "named_array", "nested", "named_key")
+TIME_FIELDS = {"Dat": timedelta(hours=1), "Dat_dne": timedelta(days=1)}
+
+# Formát PosledniAktualizace v API
+LAST_UPDATE_FORMAT = "%d.%m.%Y %H:%M"
+
+
+def _scale_rows(rows: list, time_field: str, start: datetime, scale: int) -> list:
+    """Move rows to start and repeat them scale times as a longer forecast."""
+    step = TIME_FIELDS[time_field]
+    result = []
+    for index in range(len(rows) * scale):
+        row = dict(rows[index % len(rows)])
+        row[time_field] = (start + step * index).strftime(API_DATETIME_FORMAT)
+        result.append(row)
+    return result
+
+
+def rebase(node, scale: int = 1, now: datetime | None = None, age_minutes: int = 20):
+    """Move forecast rows of a recorded payload to the current hour and scale them."""
+    now = now or datetime.now()
+    if isinstance(node, dict):
+        result = {}
+        for key, value in node.items():
+            if key == "PosledniAktualizace" and isinstance(value, str):
+                result[key] = (now - timedelta(minutes=age_minutes)).strftime(LAST_UPDATE_FORMAT)
+            else:
+                result[key] = rebase(value, scale, now, age_minutes)
+        return result
+
+    if isinstance(node, list) and node and isinstance(node[0], dict):
+        for time_field in TIME_FIELDS:
+            if time_field in node[0] and parse_api_datetime(node[0][time_field]):
+                start = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+                if time_field == "Dat_dne":
+                    start = start.replace(hour=0)
+                return _scale_rows(node, time_field, start, scale)
+        return [rebase(item, scale, now, age_minutes) for item in node]
+
+    return node
+
+
+def read_fixture(layout: str) -> dict:
+    """Read a recorded payload as it was recorded."""
+    with open(FIXTURE_DIR / f"{layout}.json", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def load_fixture(layout: str, scale: int = 1) -> dict:
+    """Load a recorded payload, moved to the current hour and scaled."""
+    return rebase(read_fixture(layout), scale)
+
+
+def model_payload(layout: str, model: str, recorded: dict) -> dict:
+    """Adapt a recorded MASTER payload so it carries the given model."""
+    if layout == "root":
+        return {**recorded, "nazevModelu": model}
+    if layout == "nested":
+        return {**recorded, "data": [{**recorded["data"][0], "nazevModelu": model}]}
+    if layout == "named_key":
+        return {
+            key: value for key, value in recorded.items() if key != "MASTER"
+        } | {model: recorded["MASTER"]}
+    # named_array obsahuje všechny modely
+    return recorded
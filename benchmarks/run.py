@@ -0,0 +1,225 @@
+"""Benchmarks of the PočasíMeteo coordinator parsing and weather entity hot paths.
+
+Runs offline against the Home Assistant stand-in (hass_standin.py) with the
+recorded model payloads in fixtures/ - one per payload layout the coordinator
+extracts. Forecast times in the payloads are shifted to the current hour so
+staleness and current-hour lookups behave like in production. Every case is
+measured at realistic (1x) and 10x scale (ten times more forecast rows), with
+time per call and memory allocated per call (tracemalloc peak).
+
+    python benchmarks/run.py
+    python benchmarks/run.py --scale 1 --save baseline.json
+    python benchmarks/run.py --compare baseline.json
+
+--compare exits with status 1 if any case got slower than the baseline by
+more than --tolerance, so per-state-write regressions are caught before release.
+"""
+import argparse
+import copy
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+import hass_standin  # noqa: E402
+
+hass_standin.install()
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.pocasimeteo.const import WEATHER_MODELS  # noqa: E402
+from custom_components.pocasimeteo.coordinator import (  # noqa: E402
+    PocasimeteoDataUpdateCoordinator,
+)
+from custom_components.pocasimeteo.jsonstream import StreamingModelParser  # noqa: E402
+from custom_components.pocasimeteo.weather import PocasimeteoWeather  # noqa: E402
+from payloads import LAYOUTS, load_fixture  # noqa: E402
+
+CHUNK_SIZE = 16384
+
+# Jedno měření (dávka volání) trvá alespoň tolik sekund
+MIN_BATCH_SECONDS = 0.02
+REPEATS = 5
+
+
+def _run_coroutine(coroutine):
+    """Run a coroutine that never suspends without an event loop."""
+    try:
+        coroutine.send(None)
+    except StopIteration as result:
+        return result.value
+    raise RuntimeError("Coroutine suspended")
+
+
+def measure(func) -> tuple[float, float]:
+    """Return (microseconds per call, KiB allocated at peak per call)."""
+    func()
+
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_BATCH_SECONDS:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, int(MIN_BATCH_SECONDS / elapsed) + 1)
+
+    best = elapsed
+    for _ in range(REPEATS - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best / loops * 1e6, (peak - baseline) / 1024
+
+
+def build_cases(scale: int) -> dict:
+    """Prepare benchmark cases of one scale; returns {name: callable}."""
+    hass = HomeAssistant()
+    entry = ConfigEntry({"station": "benchmark"})
+    coordinator = PocasimeteoDataUpdateCoordinator(hass, entry, session=None)
+    cases = {}
+
+    documents = {layout: load_fixture(layout, scale) for layout in LAYOUTS}
+    for layout, document in documents.items():
+        body = json.dumps(document, ensure_ascii=False).encode()
+
+        def parse(body=body):
+            parser = StreamingModelParser("MASTER")
+            for start in range(0, len(body), CHUNK_SIZE):
+                parser.feed(body[start:start + CHUNK_SIZE])
+            return parser.close()
+
+        cases[f"parse[{layout}]"] = parse
+
+        # Ustálený stav - formát souboru je z minula známý (rychlá cesta)
+        coordinator._extract_model_data(document, "MASTER")
+        cases[f"extract_model_data[{layout}]"] = (
+            lambda document=document: coordinator._extract_model_data(document, "MASTER")
+        )
+
+    # Všechny modely z jednoho souboru (named_array obsahuje všech 7 modelů)
+    extracted = {
+        model: coordinator._extract_model_data(documents["named_array"], model)
+        for model in WEATHER_MODELS
+    }
+    cases["normalize_model_data"] = lambda: coordinator._normalize_model_data(extracted["MASTER"])
+    fetched = {model: coordinator._normalize_model_data(data) for model, data in extracted.items()}
+
+    processed = {"available_models": list(WEATHER_MODELS), "models": copy.copy(fetched)}
+    cases["check_data_staleness"] = lambda: coordinator._check_data_staleness(processed)
+
+    def master_fallback():
+        data = {"available_models": list(WEATHER_MODELS), "models": {"MASTER": fetched["MASTER"]}}
+        coordinator._apply_master_fallback(data)
+        return data
+
+    cases["master_fallback"] = master_fallback
+
+    coordinator.data = coordinator._build_data(
+        fetched, fetched, coordinator._get_sunrise_sunset(), save_snapshot=False
+    )
+    entity = PocasimeteoWeather(coordinator, entry, "MASTER", is_primary=True)
+
+    def current_state():
+        return (
+            entity.native_temperature,
+            entity.humidity,
+            entity.native_pressure,
+            entity.native_wind_speed,
+            entity.wind_bearing,
+            entity.condition,
+        )
+
+    def current_state_cold():
+        entity._current_index_cache = None
+        return current_state()
+
+    def attributes_cold():
+        entity._attributes_cache = None
+        entity._forecast_cache = None
+        return entity.extra_state_attributes
+
+    def state_write():
+        # Nová data koordinátoru: stav i atributy se zapisují celé znovu
+        entity._last_fingerprint = None
+        entity._forecast_cache = None
+        entity._handle_coordinator_update()
+        return current_state(), entity.extra_state_attributes
+
+    def state_write_skipped():
+        entity._handle_coordinator_update()
+
+    cases["weather.current_state"] = current_state
+    cases["weather.current_state_cold"] = current_state_cold
+    cases["weather.extra_state_attributes"] = lambda: entity.extra_state_attributes
+    cases["weather.extra_state_attributes_cold"] = attributes_cold
+    cases["weather.async_forecast_hourly"] = lambda: _run_coroutine(entity.async_forecast_hourly())
+    cases["weather.async_forecast_daily"] = lambda: _run_coroutine(entity.async_forecast_daily())
+    cases["weather.state_write"] = state_write
+    cases["weather.state_write_skipped"] = state_write_skipped
+    return cases
+
+
+def main() -> int:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--filter", default="", help="run only cases containing this text")
+    parser.add_argument("--save", help="write results as JSON")
+    parser.add_argument("--compare", help="compare with results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25 %%)")
+    args = parser.parse_args()
+
+    # Logování by měřilo handlery, ne integraci
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    print(f"{'case':<42} {'scale':>5} {'us/call':>12} {'KiB/call':>10}")
+    for scale in args.scale:
+        for name, func in build_cases(scale).items():
+            if args.filter not in name:
+                continue
+            microseconds, kibibytes = measure(func)
+            results[f"{name}@{scale}x"] = {"us": round(microseconds, 3), "kib": round(kibibytes, 2)}
+            print(f"{name:<42} {scale:>4}x {microseconds:>12.2f} {kibibytes:>10.2f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"python": sys.version.split()[0], "results": results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = [
+            f"{case}: {result['us']:.2f} us vs {baseline[case]['us']:.2f} us"
+            for case, result in results.items()
+            if case in baseline and result["us"] > baseline[case]["us"] * (1 + args.tolerance)
+        ]
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
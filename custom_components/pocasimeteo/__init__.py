@@ -2,20 +2,124 @@
 import logging
 from pathlib import Path
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+import aiohttp
+import voluptuous as vol
 
-from .const import DOMAIN
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import Event, HomeAssistant
+
+from .const import (
+    CONF_SCHEDULE_MAX_CONCURRENT,
+    CONF_SCHEDULE_WINDOW,
+    CONF_STATION,
+    DATA_CONFIG,
+    DATA_SCHEDULER,
+    DATA_SESSION,
+    DATA_SESSION_CLOSE,
+    DOMAIN,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    SCHEDULE_MAX_CONCURRENT_STATIONS,
+    SCHEDULE_MAX_WINDOW_MINUTES,
+    SCHEDULE_WINDOW_MINUTES,
+)
+from .accuracy import AccuracyTracker
 from .coordinator import PocasimeteoDataUpdateCoordinator
+from .scheduler import PocasimeteoScheduler
+from .websocket import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.WEATHER]
+PLATFORMS = [Platform.WEATHER, Platform.SENSOR]
+
+# Volitelné nastavení plánovače (stanice se přidávají přes UI)
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_SCHEDULE_WINDOW, default=SCHEDULE_WINDOW_MINUTES): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=SCHEDULE_MAX_WINDOW_MINUTES)
+                ),
+                vol.Optional(
+                    CONF_SCHEDULE_MAX_CONCURRENT, default=SCHEDULE_MAX_CONCURRENT_STATIONS
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+def _async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the pooled HTTP session shared by all stations, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    session = domain_data.get(DATA_SESSION)
+
+    if session is None or session.closed:
+        _LOGGER.debug("Creating shared HTTP session")
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        domain_data[DATA_SESSION] = session
+
+        # Config entries se při ukončení HA neuvolňují - session se musí zavřít sama
+        async def _async_close_session(_event: Event) -> None:
+            domain_data.pop(DATA_SESSION_CLOSE, None)
+            if domain_data.get(DATA_SESSION) is session:
+                domain_data.pop(DATA_SESSION)
+            _LOGGER.debug("Closing shared HTTP session (Home Assistant is stopping)")
+            await session.close()
+
+        if (unsub := domain_data.pop(DATA_SESSION_CLOSE, None)) is not None:
+            unsub()
+        domain_data[DATA_SESSION_CLOSE] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_close_session
+        )
+
+    return session
+
+
+def _async_get_scheduler(hass: HomeAssistant) -> PocasimeteoScheduler:
+    """Return the update scheduler shared by all stations, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := domain_data.get(DATA_SCHEDULER)) is None:
+        config = domain_data.get(DATA_CONFIG, {})
+        scheduler = domain_data[DATA_SCHEDULER] = PocasimeteoScheduler(
+            hass,
+            window_minutes=config.get(CONF_SCHEDULE_WINDOW, SCHEDULE_WINDOW_MINUTES),
+            max_concurrent=config.get(CONF_SCHEDULE_MAX_CONCURRENT, SCHEDULE_MAX_CONCURRENT_STATIONS),
+        )
+    return scheduler
+
+
+async def _async_release_shared_resources(hass: HomeAssistant) -> None:
+    """Close the shared HTTP session and scheduler once no coordinator uses them."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if any(isinstance(value, PocasimeteoDataUpdateCoordinator) for value in domain_data.values()):
+        return
+
+    if (scheduler := domain_data.pop(DATA_SCHEDULER, None)) is not None:
+        scheduler.async_shutdown()
+
+    if (unsub := domain_data.pop(DATA_SESSION_CLOSE, None)) is not None:
+        unsub()
+
+    if (session := domain_data.pop(DATA_SESSION, None)) is not None:
+        _LOGGER.debug("Closing shared HTTP session")
+        await session.close()
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the PočasíMeteo component."""
+    hass.data.setdefault(DOMAIN, {})[DATA_CONFIG] = config.get(DOMAIN, {})
+    async_register_websocket_commands(hass)
     return True
 
 
@@ -23,13 +127,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up PočasíMeteo from a config entry."""
     _LOGGER.info("▶ Setting up PočasíMeteo integration")
 
+    coordinator = None
     try:
         _LOGGER.info("→ Creating coordinator")
-        coordinator = PocasimeteoDataUpdateCoordinator(hass, entry)
+        coordinator = PocasimeteoDataUpdateCoordinator(hass, entry, _async_get_session(hass))
+
+        await coordinator.async_load_accuracy()
 
-        _LOGGER.info("→ Running first refresh")
-        await coordinator.async_config_entry_first_refresh()
-        _LOGGER.info("✓ First refresh completed")
+        # Entity se vytvoří hned z uloženého snapshotu, čerstvá data se stáhnou na pozadí
+        _LOGGER.info("→ Restoring snapshot")
+        restored = await coordinator.async_load_snapshot()
+
+        if not restored:
+            _LOGGER.info("→ Running first refresh")
+            await coordinator.async_config_entry_first_refresh()
+            _LOGGER.info("✓ First refresh completed")
 
         hass.data.setdefault(DOMAIN, {})
         hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -38,12 +150,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
         _LOGGER.info("✓ PočasíMeteo setup completed successfully")
 
+        if restored:
+            _LOGGER.info("→ Refreshing snapshot data in background")
+            hass.async_create_task(coordinator.async_refresh())
+
+        # Další aktualizace řídí společný scheduler
+        _async_get_scheduler(hass).async_register(coordinator)
+
         # Listen to options updates
         entry.async_on_unload(entry.add_update_listener(async_update_entry))
 
         return True
     except Exception as err:
         _LOGGER.error("✗ Error setting up PočasíMeteo: %s", err, exc_info=True)
+        domain_data = hass.data.get(DOMAIN, {})
+        if coordinator is not None:
+            # Zruš naplánovaná opakování - HA zkusí setup znovu sám
+            if (scheduler := domain_data.get(DATA_SCHEDULER)) is not None:
+                scheduler.async_unregister(coordinator)
+            await coordinator.async_shutdown()
+        # Odeber coordinator, jinak by sdílené prostředky vypadaly stále používané
+        domain_data.pop(entry.entry_id, None)
+        await _async_release_shared_resources(hass)
         raise
 
 
@@ -55,6 +183,15 @@ async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
-    
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        _async_get_scheduler(hass).async_unregister(coordinator)
+        await coordinator.async_shutdown()
+        await _async_release_shared_resources(hass)
+
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a deleted config entry."""
+    await PocasimeteoDataUpdateCoordinator.async_remove_snapshot(hass, entry.data[CONF_STATION])
+    await AccuracyTracker.async_remove(hass, entry.data[CONF_STATION])
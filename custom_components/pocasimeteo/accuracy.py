@@ -0,0 +1,382 @@
+"""Rolling forecast accuracy of PočasíMeteo models.
+
+Every update archives each model's forecast for all evaluated lead times.
+When a valid time arrives, the archived forecasts are scored against the
+configured reference entities and the errors go to fixed-size ring buffers
+with one slot per hour, one buffer per (model, variable, horizon). Running
+sums are maintained for every window, so MAE, RMSE and bias are available in
+O(1) without replaying any history. Archive and buffers persist across
+restarts.
+"""
+import base64
+import logging
+import math
+import sys
+import zlib
+from array import array
+
+from homeassistant.const import UnitOfPressure, UnitOfSpeed, UnitOfTemperature
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util.unit_conversion import (
+    PressureConverter,
+    SpeedConverter,
+    TemperatureConverter,
+)
+
+from .const import (
+    ACCURACY_CIRCULAR_VARIABLES,
+    ACCURACY_HORIZONS,
+    ACCURACY_SAVE_DELAY,
+    ACCURACY_STORAGE_VERSION,
+    ACCURACY_VARIABLES,
+    ACCURACY_WINDOWS,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_NAN = math.nan
+
+# Pořadí veličin a předstihů v plochých polích archivu
+VARIABLES = tuple(ACCURACY_VARIABLES)
+FIELDS = tuple(field for field, _ in ACCURACY_VARIABLES.values())
+_CIRCULAR = tuple(variable in ACCURACY_CIRCULAR_VARIABLES for variable in VARIABLES)
+_BLOCK = len(VARIABLES)
+
+# Převod referenčních hodnot na jednotky API (°C, m/s, hPa)
+_CONVERTERS = {
+    "temperature": (TemperatureConverter, UnitOfTemperature.CELSIUS),
+    "wind": (SpeedConverter, UnitOfSpeed.METERS_PER_SECOND),
+    "wind_gust": (SpeedConverter, UnitOfSpeed.METERS_PER_SECOND),
+    "pressure": (PressureConverter, UnitOfPressure.HPA),
+}
+
+
+def _pack(values: array) -> str:
+    """Encode floats compactly (little-endian float32, zlib, base64) for storage."""
+    packed = array("f", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return base64.b64encode(zlib.compress(packed.tobytes())).decode()
+
+
+def _unpack(text: str) -> array:
+    """Decode floats stored by _pack."""
+    packed = array("f")
+    packed.frombytes(zlib.decompress(base64.b64decode(text)))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return array("d", packed)
+
+
+def reference_value(state: State | None, variable: str) -> float:
+    """Return a reference entity value in API units, or NaN if unusable."""
+    if state is None:
+        return _NAN
+    try:
+        value = float(state.state)
+    except (TypeError, ValueError):
+        return _NAN
+
+    converter = _CONVERTERS.get(variable)
+    unit = state.attributes.get("unit_of_measurement")
+    if converter is not None and unit and unit != converter[1]:
+        try:
+            value = converter[0].convert(value, unit, converter[1])
+        except (HomeAssistantError, ValueError):
+            _LOGGER.debug(f"Unsupported unit {unit} of reference {state.entity_id}")
+            return _NAN
+    return value
+
+
+def collect_forecasts(tables: dict, hour: int) -> list[tuple[str, int, int, array]]:
+    """Read each model's forecast for every evaluated lead time.
+
+    Returns (model, horizon index, valid hour, values of VARIABLES) tuples.
+    Runs in the executor; forecast tables are read-only.
+    """
+    entries = []
+    for model, hourly in tables.items():
+        columns = [hourly.column(field) for field in FIELDS]
+        for horizon_index, horizon in enumerate(ACCURACY_HORIZONS):
+            valid = hour + horizon
+            nearest = hourly.nearest_index(valid * 3600)
+            if nearest is None:
+                break
+            index = nearest[0]
+            # Jen řádek platný přesně pro danou hodinu
+            if abs(hourly.times[index] - valid * 3600) >= 1800:
+                continue
+            values = array("d", (_NAN if column is None else column[index] for column in columns))
+            entries.append((model, horizon_index, valid, values))
+    return entries
+
+
+def score_forecasts(due: dict[str, array], reference: array) -> list[tuple[str, str, int, float]]:
+    """Score archived forecasts valid now against reference values in one pass.
+
+    due maps model -> flat array (horizons x variables); returns
+    (model, variable, horizon, error) for every available pair.
+    """
+    errors = []
+    tiled = reference * len(ACCURACY_HORIZONS)
+    for model, forecasts in due.items():
+        for position, (forecast, actual) in enumerate(zip(forecasts, tiled)):
+            error = forecast - actual
+            if error != error:
+                continue
+            variable_index = position % _BLOCK
+            if _CIRCULAR[variable_index]:
+                error = (error + 180.0) % 360.0 - 180.0
+            errors.append(
+                (model, VARIABLES[variable_index], ACCURACY_HORIZONS[position // _BLOCK], error)
+            )
+    return errors
+
+
+def evaluate_forecasts(
+    tables: dict, hour: int, due: dict[str, array], reference: array
+) -> tuple[list, list]:
+    """Archive new forecasts and score everything valid in this hour."""
+    entries = collect_forecasts(tables, hour)
+
+    # Předpověď pro aktuální hodinu (předstih 0) se vyhodnotí hned
+    due = {model: array("d", forecasts) for model, forecasts in due.items()}
+    for model, horizon_index, valid, values in entries:
+        if valid == hour:
+            forecasts = due.get(model)
+            if forecasts is None:
+                forecasts = due[model] = array("d", [_NAN]) * (_BLOCK * len(ACCURACY_HORIZONS))
+            forecasts[horizon_index * _BLOCK:(horizon_index + 1) * _BLOCK] = values
+
+    return entries, score_forecasts(due, reference)
+
+
+class ErrorRing:
+    """Hourly forecast errors with running sums for several windows.
+
+    Slot of an hour is hour % capacity; a window of w hours covers the hours
+    (head - w, head], where head is the latest hour seen.
+    """
+
+    __slots__ = ("capacity", "windows", "errors", "head", "_sums")
+
+    def __init__(self, windows: dict[str, int] = ACCURACY_WINDOWS) -> None:
+        """Initialize an empty ring."""
+        self.windows = windows
+        self.capacity = max(windows.values())
+        self.errors = array("d", [_NAN]) * self.capacity
+        self.head: int | None = None
+        # Pro každé okno: [počet, součet, součet |e|, součet e²]
+        self._sums = {name: [0, 0.0, 0.0, 0.0] for name in windows}
+
+    def _add(self, hour: int, error: float, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) an error in all windows covering hour."""
+        for name, size in self.windows.items():
+            if hour > self.head - size:
+                sums = self._sums[name]
+                sums[0] += sign
+                sums[1] += sign * error
+                sums[2] += sign * abs(error)
+                sums[3] += sign * error * error
+
+    def _advance(self, hour: int) -> None:
+        """Move head forward, expiring hours that leave each window."""
+        head = self.head
+        capacity = self.capacity
+        errors = self.errors
+        for name, size in self.windows.items():
+            sums = self._sums[name]
+            # Hodiny (head - size, hour - size] z okna vypadnou
+            for old in range(head - size + 1, min(hour - size, head) + 1):
+                error = errors[old % capacity]
+                if error == error:
+                    sums[0] -= 1
+                    sums[1] -= error
+                    sums[2] -= abs(error)
+                    sums[3] -= error * error
+        # Sloty nových hodin ještě obsahují data staršího oběhu
+        for new in range(max(head + 1, hour - capacity + 1), hour + 1):
+            errors[new % capacity] = _NAN
+        self.head = hour
+
+    def add(self, hour: int, error: float) -> None:
+        """Record the forecast error of an hour (replaces an earlier sample)."""
+        if error != error:
+            return
+        if self.head is None:
+            self.head = hour
+        elif hour > self.head:
+            self._advance(hour)
+        elif hour <= self.head - self.capacity:
+            return
+
+        slot = hour % self.capacity
+        old = self.errors[slot]
+        if old == old:
+            self._add(hour, old, -1)
+        self.errors[slot] = error
+        self._add(hour, error, 1)
+
+    def stats(self, window: str) -> dict:
+        """Return MAE, RMSE and bias of a window."""
+        count, total, total_abs, total_sq = self._sums[window]
+        if count <= 0:
+            return {"samples": 0, "mae": None, "rmse": None, "bias": None}
+        return {
+            "samples": count,
+            "mae": round(total_abs / count, 3),
+            "rmse": round(math.sqrt(max(total_sq, 0.0) / count), 3),
+            "bias": round(total / count, 3),
+        }
+
+    def as_dict(self) -> dict:
+        """Return persistable state."""
+        return {
+            "head": self.head,
+            "errors": _pack(self.errors),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, windows: dict[str, int] = ACCURACY_WINDOWS) -> "ErrorRing":
+        """Restore a ring and recompute its running sums."""
+        ring = cls(windows)
+        head = data.get("head")
+        errors = data.get("errors") or []
+        if isinstance(errors, str):
+            errors = _unpack(errors)
+        if head is None or len(errors) != ring.capacity:
+            return ring
+
+        ring.head = head
+        for hour in range(head - ring.capacity + 1, head + 1):
+            error = errors[hour % ring.capacity]
+            if error is not None and error == error:
+                ring.errors[hour % ring.capacity] = error
+                ring._add(hour, error, 1)
+        return ring
+
+
+class AccuracyTracker:
+    """Rolling accuracy of all models of one station."""
+
+    def __init__(self, hass: HomeAssistant, station: str) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._store = Store(hass, ACCURACY_STORAGE_VERSION, f"{DOMAIN}.accuracy.{station}")
+        self._rings: dict[tuple[str, str, int], ErrorRing] = {}
+        self._summary: dict | None = None
+        # Archiv předpovědí: platná hodina -> model -> hodnoty (předstihy x veličiny)
+        self._archive: dict[int, dict[str, array]] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted ring buffers."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Failed to load accuracy data: %s", err)
+            return
+
+        for item in (stored or {}).get("rings", []):
+            try:
+                key = (item["model"], item["variable"], int(item["horizon"]))
+                self._rings[key] = ErrorRing.from_dict(item)
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.debug(f"Skipping invalid accuracy record: {err}")
+
+        # Archiv je platný jen při stejném rozložení veličin a předstihů
+        archive = (stored or {}).get("archive", {})
+        if archive.get("variables") == list(VARIABLES) and archive.get("horizons") == list(
+            ACCURACY_HORIZONS
+        ):
+            for valid, models in archive.get("hours", {}).items():
+                self._archive[int(valid)] = {model: _unpack(data) for model, data in models.items()}
+        self._summary = None
+
+    @staticmethod
+    async def async_remove(hass: HomeAssistant, station: str) -> None:
+        """Delete persisted accuracy data of a station."""
+        await Store(hass, ACCURACY_STORAGE_VERSION, f"{DOMAIN}.accuracy.{station}").async_remove()
+
+    @callback
+    def add_sample(self, model: str, variable: str, horizon: int, hour: int, error: float) -> None:
+        """Record a forecast error of a model for an hour (epoch hours)."""
+        key = (model, variable, horizon)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = ErrorRing()
+        ring.add(hour, error)
+        self._summary = None
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Persist ring buffers (delayed and coalesced)."""
+        self._store.async_delay_save(self._data_to_save, ACCURACY_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        """Return data to persist."""
+        return {
+            "rings": [
+                {"model": model, "variable": variable, "horizon": horizon, **ring.as_dict()}
+                for (model, variable, horizon), ring in self._rings.items()
+            ],
+            "archive": {
+                "variables": list(VARIABLES),
+                "horizons": list(ACCURACY_HORIZONS),
+                "hours": {
+                    str(valid): {model: _pack(values) for model, values in models.items()}
+                    for valid, models in self._archive.items()
+                },
+            },
+        }
+
+    async def async_evaluate(
+        self, tables: dict, reference: array, now: float
+    ) -> list[tuple[str, str, int, float]]:
+        """Archive current forecasts and score forecasts valid in this hour.
+
+        tables maps model -> hourly ForecastTable, reference holds the actual
+        values of VARIABLES (NaN = not configured). Array work runs in the
+        executor; ring buffers are updated on the event loop.
+        """
+        hour = int(now // 3600)
+        due = self._archive.pop(hour, {})
+        entries, errors = await self.hass.async_add_executor_job(
+            evaluate_forecasts, tables, hour, due, reference
+        )
+
+        size = _BLOCK * len(ACCURACY_HORIZONS)
+        for model, horizon_index, valid, values in entries:
+            if valid <= hour:
+                continue
+            forecasts = self._archive.setdefault(valid, {}).get(model)
+            if forecasts is None:
+                forecasts = self._archive[valid][model] = array("d", [_NAN]) * size
+            forecasts[horizon_index * _BLOCK:(horizon_index + 1) * _BLOCK] = values
+
+        # Předpovědi pro hodiny, které už uplynuly (výpadek HA), se zahodí
+        for valid in [valid for valid in self._archive if valid < hour]:
+            del self._archive[valid]
+
+        for model, variable, horizon, error in errors:
+            self.add_sample(model, variable, horizon, hour, error)
+        self.async_schedule_save()
+        return errors
+
+    def stats(self, model: str, variable: str, horizon: int, window: str) -> dict | None:
+        """Return rolling statistics of one ring buffer."""
+        ring = self._rings.get((model, variable, horizon))
+        return ring.stats(window) if ring is not None else None
+
+    def summary(self) -> dict:
+        """Return {model: {variable: {horizon: {window: stats}}}} (cached until a new sample)."""
+        if self._summary is None:
+            summary: dict = {}
+            for (model, variable, horizon), ring in self._rings.items():
+                summary.setdefault(model, {}).setdefault(variable, {})[horizon] = {
+                    window: ring.stats(window) for window in ring.windows
+                }
+            self._summary = summary
+        return self._summary
@@ -9,19 +9,33 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
-from .const import CONF_MODEL, CONF_STATION, DOMAIN, WEATHER_MODELS_LABELS
+from .const import (
+    CONF_BASE_URL,
+    CONF_FETCH_CONCURRENCY,
+    CONF_FORECAST_ATTRIBUTES,
+    CONF_INSTRUMENTATION,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_MODEL,
+    CONF_REFERENCE_HUMIDITY_ENTITY,
+    CONF_REFERENCE_PRESSURE_ENTITY,
+    CONF_REFERENCE_RAINFALL_ENTITY,
+    CONF_REFERENCE_TEMPERATURE_ENTITY,
+    CONF_REFERENCE_WIND_DIRECTION_ENTITY,
+    CONF_REFERENCE_WIND_ENTITY,
+    CONF_REFERENCE_WIND_GUST_ENTITY,
+    CONF_STATION,
+    DEFAULT_BASE_URL,
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_FORECAST_ATTRIBUTES,
+    DEFAULT_INSTRUMENTATION,
+    DOMAIN,
+    WEATHER_MODELS,
+    WEATHER_MODELS_LABELS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-# Config option keys
-CONF_REFERENCE_TEMPERATURE_ENTITY = "reference_temperature_entity"
-CONF_REFERENCE_WIND_ENTITY = "reference_wind_entity"
-CONF_REFERENCE_WIND_GUST_ENTITY = "reference_wind_gust_entity"
-CONF_REFERENCE_RAINFALL_ENTITY = "reference_rainfall_entity"
-CONF_REFERENCE_HUMIDITY_ENTITY = "reference_humidity_entity"
-CONF_REFERENCE_PRESSURE_ENTITY = "reference_pressure_entity"
-CONF_REFERENCE_WIND_DIRECTION_ENTITY = "reference_wind_direction_entity"
-
 
 class PocasimeteoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for PočasíMeteo."""
@@ -162,6 +176,57 @@ class PocasimeteoOptionsFlow(config_entries.OptionsFlow):
                         domain="sensor",
                     )
                 ),
+                vol.Optional(
+                    CONF_FETCH_CONCURRENCY,
+                    default=self.config_entry.options.get(
+                        CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=1,
+                        max=len(WEATHER_MODELS),
+                        step=1,
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
+                vol.Optional(
+                    CONF_FORECAST_ATTRIBUTES,
+                    default=self.config_entry.options.get(
+                        CONF_FORECAST_ATTRIBUTES, DEFAULT_FORECAST_ATTRIBUTES
+                    ),
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_LATITUDE,
+                    description={
+                        "suggested_value": self.config_entry.options.get(CONF_LATITUDE)
+                    },
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=-90, max=90, step="any", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Optional(
+                    CONF_LONGITUDE,
+                    description={
+                        "suggested_value": self.config_entry.options.get(CONF_LONGITUDE)
+                    },
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=-180, max=180, step="any", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Optional(
+                    CONF_INSTRUMENTATION,
+                    default=self.config_entry.options.get(
+                        CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION
+                    ),
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_BASE_URL,
+                    default=self.config_entry.options.get(CONF_BASE_URL, DEFAULT_BASE_URL),
+                ): selector.TextSelector(
+                    selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                ),
             }
         )
 
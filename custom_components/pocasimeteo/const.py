@@ -10,6 +10,18 @@ CONF_MODEL = "model"
 PRAGUE_COORDINATES = {"latitude": 50.0755, "longitude": 14.4378}
 PRAGUE_TIMEZONE = ZoneInfo("Europe/Prague")
 
+# Poloha stanice pro východ/západ slunce (options); bez nich se použije
+# poloha nastavená v Home Assistant, případně Praha
+CONF_LATITUDE = "latitude"
+CONF_LONGITUDE = "longitude"
+
+# Počet dní dopředu, pro které se předpočítá východ a západ slunce
+SUN_CALENDAR_DAYS = 3
+
+# Výchozí a maximální počet dní pro výpis nadcházejících svátků (websocket pocasimeteo/holidays)
+HOLIDAYS_UPCOMING_DAYS = 30
+HOLIDAYS_UPCOMING_MAX_DAYS = 366
+
 # Příklady dostupných stanic (uživatel může zadat libovolnou stanici)
 # Formát: název stanice odpovídající URL na pocasimeteo.cz
 # Např.: praha-6-ruzyne, brno, ostrava, plzen, liberec, olomouc, atd.
@@ -29,19 +41,159 @@ WEATHER_MODELS = {
 # Backwards compatibility - pro selectory v config flow
 WEATHER_MODELS_LABELS = {name: info["label"] for name, info in WEATHER_MODELS.items()}
 
-# URL šablona pro API
-API_URL_TEMPLATE = "https://ext.pocasimeteo.cz/{station}/predpoved/data/weather_data.json"
+# Virtuální modely - počítají se z ostatních modelů, nestahují se z API
+ENSEMBLE_MODEL = "BEST"
+VIRTUAL_MODELS = {
+    ENSEMBLE_MODEL: {"label": "BEST"},
+}
+
+# Všechny modely, pro které existují entity
+ALL_MODELS = {**WEATHER_MODELS, **VIRTUAL_MODELS}
+
+# Referenční entity (skutečně naměřené hodnoty) pro vyhodnocení přesnosti modelů
+CONF_REFERENCE_TEMPERATURE_ENTITY = "reference_temperature_entity"
+CONF_REFERENCE_WIND_ENTITY = "reference_wind_entity"
+CONF_REFERENCE_WIND_GUST_ENTITY = "reference_wind_gust_entity"
+CONF_REFERENCE_RAINFALL_ENTITY = "reference_rainfall_entity"
+CONF_REFERENCE_HUMIDITY_ENTITY = "reference_humidity_entity"
+CONF_REFERENCE_PRESSURE_ENTITY = "reference_pressure_entity"
+CONF_REFERENCE_WIND_DIRECTION_ENTITY = "reference_wind_direction_entity"
+
+# Klíč v hass.data[DOMAIN] pro sdílenou HTTP session všech stanic
+DATA_SESSION = "session"
+# Odhlášení listeneru, který session zavře při ukončení Home Assistant
+DATA_SESSION_CLOSE = "session_close"
+
+# Connection pool sdílené HTTP session
+HTTP_POOL_LIMIT = 32  # Celkový počet spojení
+HTTP_POOL_LIMIT_PER_HOST = 8  # Spojení na jeden host (ext.pocasimeteo.cz)
+HTTP_KEEPALIVE_TIMEOUT = 120  # s, jak dlouho držet nečinné spojení otevřené
+HTTP_DNS_CACHE_TTL = 3600  # s, cache DNS záznamů
+
+# Základní URL API - v options lze nastavit jinou (např. lokální testovací server)
+CONF_BASE_URL = "base_url"
+DEFAULT_BASE_URL = "https://ext.pocasimeteo.cz"
+
+# URL šablony pro API
+API_URL_TEMPLATE = "{base_url}/{station}/predpoved/data/weather_data.json"
+REFRESH_URL_TEMPLATE = "{base_url}/{station}/predpoved/"
+MODEL_URL_TEMPLATE = "{base_url}/{station}/predpoved/data/{filename}"
 
-# Aktualizační interval - 1 minutu po každé celé hodině (s malou náhodností pro distribuci zátěže)
-# Pozn: Tento interval se ignoruje v coordinatoru, kde se místo toho nastavuje konkrétní čas
+# Aktualizační interval - jednou za hodinu
+# Pozn: Aktualizace plánuje společný scheduler (viz níže), ne samotný coordinator
 UPDATE_INTERVAL = timedelta(hours=1)
 
+# Klíč v hass.data[DOMAIN] pro společný scheduler všech stanic
+DATA_SCHEDULER = "scheduler"
+
+# Rozložení aktualizací stanic v čase - každá stanice dostane pevný posun
+# v okně SCHEDULE_WINDOW_MINUTES minut začínajícím SCHEDULE_START_MINUTE po celé hodině
+SCHEDULE_START_MINUTE = 1
+SCHEDULE_WINDOW_MINUTES = 10
+
+# Maximální počet stanic aktualizovaných současně
+SCHEDULE_MAX_CONCURRENT_STATIONS = 4
+
+# Nastavení plánovače v configuration.yaml (společné pro všechny stanice):
+# pocasimeteo:
+#   schedule_window_minutes: 10
+#   max_concurrent_stations: 4
+CONF_SCHEDULE_WINDOW = "schedule_window_minutes"
+CONF_SCHEDULE_MAX_CONCURRENT = "max_concurrent_stations"
+SCHEDULE_MAX_WINDOW_MINUTES = 50  # okno + start musí skončit před další hodinou
+
+# Klíč v hass.data[DOMAIN] pro nastavení z configuration.yaml
+DATA_CONFIG = "config"
+
+# Refresh URL (přegenerování dat na serveru) běží odděleně od stahování -
+# scheduler ho zavolá REFRESH_LEAD_SECONDS před plánovaným stažením stanice
+REFRESH_LEAD_SECONDS = 60
+REFRESH_MIN_INTERVAL_MINUTES = 55  # refresh URL max jednou za tuto dobu
+
+# Zastaralá data po nedávném refreshi - připravenost nových dat se zjišťuje
+# z PosledniAktualizace MASTER (podmíněné požadavky, krátký backoff)
+READINESS_POLL_DELAYS = (0.5, 1, 2, 4)  # s, pauza před každým dalším pokusem
+READINESS_WINDOW_SECONDS = 300  # jak dlouho po refreshi má smysl na nová data čekat
+READINESS_RESERVE_SECONDS = 5  # s, část UPDATE_TIMEOUT vyhrazená pro zpracování dat
+
 # Maximální věk dat v minutách (starší data jsou považována za zastaralá)
 DATA_MAX_AGE_MINUTES = 90
 
 # Interval pro zkrácený update pokud jsou data zastaralá (v minutách)
 DATA_STALE_UPDATE_INTERVAL_MINUTES = 5
 
+# Rychlé opakování stažení zastaralých/chybějících modelů (exponenciální backoff)
+RETRY_BASE_SECONDS = 30  # první pokus, každý další má dvojnásobné zpoždění
+RETRY_JITTER = 0.2  # náhodný rozptyl ±20 % aby se stanice nesynchronizovaly
+RETRY_MAX_ATTEMPTS = 8  # pak se čeká na další hodinový update
+
+# Snapshot posledních dobrých dat na disku (obnova po restartu HA)
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # s, zápis se odkládá aby neblokoval update
+
+# Klouzavá přesnost modelů (ring buffer chyb po hodinách, uložený na disku)
+ACCURACY_STORAGE_VERSION = 1
+ACCURACY_SAVE_DELAY = 60  # s
+ACCURACY_WINDOWS = {"24h": 24, "7d": 24 * 7, "30d": 24 * 30}  # okna v hodinách
+
+# Předstihy předpovědi (v hodinách), pro které se přesnost vyhodnocuje
+ACCURACY_HORIZONS = (0, 1, 3, 6, 12, 24, 36)
+
+# Vyhodnocované veličiny: název -> (pole API, klíč referenční entity v options)
+ACCURACY_VARIABLES = {
+    "temperature": ("Te", CONF_REFERENCE_TEMPERATURE_ENTITY),
+    "wind": ("V", CONF_REFERENCE_WIND_ENTITY),
+    "wind_gust": ("VN", CONF_REFERENCE_WIND_GUST_ENTITY),
+    "rainfall": ("S", CONF_REFERENCE_RAINFALL_ENTITY),
+    "humidity": ("Vl", CONF_REFERENCE_HUMIDITY_ENTITY),
+    "pressure": ("Tl", CONF_REFERENCE_PRESSURE_ENTITY),
+    "wind_direction": ("VSS", CONF_REFERENCE_WIND_DIRECTION_ENTITY),
+}
+
+# Veličiny ve stupních - chyba se počítá po kružnici (350° vs 10° = 20°)
+ACCURACY_CIRCULAR_VARIABLES = frozenset(("wind_direction",))
+
+# Vážený průměr modelů (BEST): váha = 1 / MAE² za okno, zvlášť pro veličinu a předstih
+ENSEMBLE_SKILL_WINDOW = "7d"
+ENSEMBLE_MIN_SAMPLES = 12  # méně vzorků = přesnost modelu se ještě nepoužije
+ENSEMBLE_MAE_FLOOR = 0.05  # dolní mez MAE, aby jeden model nedostal nekonečnou váhu
+
+# Matice všech modelů na společné hodinové mřížce (senzor rozptylu modelů)
+MATRIX_SUMMARY_HOURS = 24  # kolik hodin statistik je v atributech senzoru
+MATRIX_RAIN_HOURS = 6  # okno pro "ukazuje některý model déšť?"
+MATRIX_RAIN_THRESHOLD = 0.1  # mm/h, menší srážky se nepočítají
+
+# Celkový časový limit jednoho updatu (v sekundách)
+UPDATE_TIMEOUT = 60
+
+# Časový limit pro stažení jednoho modelu (v sekundách)
+MODEL_FETCH_TIMEOUT = 10
+
+# Velikost bloku při postupném čtení a parsování souboru modelu (v bajtech)
+HTTP_CHUNK_SIZE = 16384
+
+# Uchovaný horizont předpovědi (zbytek souboru se při parsování zahazuje)
+FORECAST_HOURLY_LIMIT = 48  # hodin
+FORECAST_DAILY_LIMIT = 7  # dní
+
+# Počet modelů stahovaných souběžně (1 = postupně jeden po druhém)
+CONF_FETCH_CONCURRENCY = "fetch_concurrency"
+DEFAULT_FETCH_CONCURRENCY = len(WEATHER_MODELS)
+
+# Předpověď v atributech entity (forecast_hourly/forecast_daily) - recorder ji
+# nikdy neukládá; vypnutím se z atributů vynechá úplně a karta si ji načte
+# přes websocket příkaz pocasimeteo/forecast
+CONF_FORECAST_ATTRIBUTES = "forecast_attributes"
+DEFAULT_FORECAST_ATTRIBUTES = True
+FORECAST_ATTRIBUTES = ("forecast_hourly", "forecast_daily")
+
+# Měření doby jednotlivých kroků aktualizace a entit (diagnostika + diagnostické senzory)
+CONF_INSTRUMENTATION = "instrumentation"
+DEFAULT_INSTRUMENTATION = False
+
+# Klíč v hass.data[DOMAIN] pro weather entity podle entity_id (websocket API)
+DATA_ENTITIES = "entities"
+
 # Mapování API ikon na skutečné PNG soubory (s prefixem "a")
 # Defaultní logika: "01" → "a01.png", "46" → "a46.png", atd.
 # Bez speciálního mapování - mapování probíhá čistě v frontend kódu
@@ -62,25 +214,31 @@ CONDITION_MAP = {
 }
 
 
-def get_best_model_for_forecast(hours_ahead: int = 0) -> str:
+def get_best_model_for_forecast(
+    hours_ahead: int = 0, accuracy: dict | None = None, variable: str = "temperature"
+) -> str:
     """
-    Určí nejlepší model pro předpověď podle času dopředu.
-    
+    Určí nejlepší model pro předpověď podle naměřené přesnosti.
+
     Args:
         hours_ahead: Kolik hodin dopředu předpovídáme
-        
+        accuracy: Souhrn přesnosti {model: {veličina: {předstih: {okno: statistiky}}}}
+        variable: Veličina, podle které se modely porovnávají
+
     Returns:
-        Název nejlepšího modelu
+        Název modelu s nejnižší MAE pro daný předstih (bez měření MASTER)
     """
-    if hours_ahead <= 6:
-        # Krátkodobá předpověď (0-6h): ALADIN je nejlepší pro ČR
-        return "ALADIN"
-    elif hours_ahead <= 24:
-        # Středněkrátkodobá (6-24h): ICON nebo ALADIN
-        return "ICON"
-    elif hours_ahead <= 72:
-        # Střednědobá (1-3 dny): ECMWF je nejpřesnější
-        return "ECMWF"
-    else:
-        # Dlouhodobá (3+ dny): MASTER (ensemble) je nejspolehlivější
-        return "MASTER"
+    # Nejbližší vyhodnocovaný předstih, který není delší než požadovaný
+    horizon = max(h for h in ACCURACY_HORIZONS if h <= max(hours_ahead, 0))
+
+    best_model, best_mae = "MASTER", None
+    for model, variables in (accuracy or {}).items():
+        if model not in WEATHER_MODELS:
+            continue
+        stats = variables.get(variable, {}).get(horizon, {}).get(ENSEMBLE_SKILL_WINDOW, {})
+        mae = stats.get("mae")
+        if mae is None or stats.get("samples", 0) < ENSEMBLE_MIN_SAMPLES:
+            continue
+        if best_mae is None or mae < best_mae:
+            best_model, best_mae = model, mae
+    return best_model
@@ -1,35 +1,68 @@
 """Data update coordinator for PočasíMeteo."""
 import asyncio
-import copy
+import hashlib
 import logging
+import math
 import random
-from datetime import datetime, timedelta
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import aiohttp
 import async_timeout
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-# Pokus importovat astral - pokud není dostupný, použij jednoduchý fallback
-try:
-    from astral import Observer
-    from astral.sun import sun
-    ASTRAL_AVAILABLE = True
-except ImportError:
-    ASTRAL_AVAILABLE = False
-
 from .const import (
+    ACCURACY_VARIABLES,
+    ALL_MODELS,
     API_URL_TEMPLATE,
+    CONF_BASE_URL,
+    CONF_FETCH_CONCURRENCY,
+    CONF_INSTRUMENTATION,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_REFERENCE_TEMPERATURE_ENTITY,
     CONF_STATION,
     DATA_MAX_AGE_MINUTES,
     DATA_STALE_UPDATE_INTERVAL_MINUTES,
+    DEFAULT_BASE_URL,
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_INSTRUMENTATION,
     DOMAIN,
-    UPDATE_INTERVAL,
+    ENSEMBLE_MODEL,
+    HTTP_CHUNK_SIZE,
+    MODEL_FETCH_TIMEOUT,
+    MODEL_URL_TEMPLATE,
+    RETRY_BASE_SECONDS,
+    RETRY_JITTER,
+    RETRY_MAX_ATTEMPTS,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+    UPDATE_TIMEOUT,
+    WEATHER_MODELS,
     PRAGUE_COORDINATES,
     PRAGUE_TIMEZONE,
+    READINESS_POLL_DELAYS,
+    READINESS_RESERVE_SECONDS,
+    READINESS_WINDOW_SECONDS,
+    REFRESH_MIN_INTERVAL_MINUTES,
+    REFRESH_URL_TEMPLATE,
 )
+from .accuracy import VARIABLES, AccuracyTracker, reference_value
+from .ensemble import blend_models, skill_signature
+from .forecast import daily_table, hourly_table
+from .instrumentation import Instrumentation
+from .jsonstream import StreamingModelParser
+from .layouts import ModelLayoutCache
+from .matrix import ModelMatrix
+from .sun import SunCalendar, get_sun_calendar
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,131 +70,110 @@ _LOGGER = logging.getLogger(__name__)
 class PocasimeteoDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching PočasíMeteo data."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        session: aiohttp.ClientSession,
+    ) -> None:
         """Initialize."""
         self.hass = hass  # Ulož hass pro později
+        self._entry = entry
+        # Sdílená HTTP session (connection pool) pro všechny stanice
+        self._session = session
         self.station = entry.data[CONF_STATION]
-        self.api_url = API_URL_TEMPLATE.format(station=self.station)
+        self.base_url = (entry.options.get(CONF_BASE_URL) or DEFAULT_BASE_URL).rstrip("/")
+        self.api_url = API_URL_TEMPLATE.format(base_url=self.base_url, station=self.station)
         # URL pro refresh dat (musí se zavolat před stažením JSON)
-        self.refresh_url = f"https://ext.pocasimeteo.cz/{self.station}/predpoved/"
+        self.refresh_url = REFRESH_URL_TEMPLATE.format(base_url=self.base_url, station=self.station)
 
-        # Hodinový interval aktualizace
+        # Aktualizace plánuje společný PocasimeteoScheduler (rozložení zátěže mezi stanice)
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=UPDATE_INTERVAL,
+            update_interval=None,
         )
 
         # Pro sledování zastaralých dat
         self._last_successful_update = None
         self._data_is_stale = False
 
-        # Pro sledování refresh URL - volá se max jednou za hodinu
+        # Pro sledování refresh URL - volá se max jednou za hodinu, na pozadí
         self._last_refresh_time = None
+        self._refresh_requested_at: datetime | None = None
+        self._refresh_task: asyncio.Task | None = None
 
-        # Nastav scheduler na 1-2 minuty po každé celé hodině
-        self._setup_hourly_schedule(hass)
-
-    def _setup_hourly_schedule(self, hass: HomeAssistant) -> None:
-        """Setup scheduler to run update at 1-2 minutes past every hour."""
-        from homeassistant.helpers.event import async_track_point_in_time
-
-        async def schedule_next_update() -> None:
-            """Schedule the next update at 1-2 minutes past the hour."""
-            now = datetime.now(PRAGUE_TIMEZONE)
+        # Validátory (ETag/Last-Modified) a poslední extrahovaná data pro každý model
+        self._model_cache: dict[str, dict] = {}
 
-            # Vypočítej čas příštího updatu (1-2 minut po celé hodině)
-            # Vyber náhodně mezi minutou 1 a 2 pro distribuci zátěže
-            minute_offset = random.randint(1, 2)
-
-            # Pokud jsme už během tohoto minútového okna, jdi na příští hodinu
-            if now.minute >= minute_offset:
-                # Příští hodina
-                next_update_time = now.replace(minute=minute_offset, second=0, microsecond=0)
-                next_update_time = next_update_time.replace(hour=(now.hour + 1) % 24)
-                if now.hour + 1 >= 24:
-                    next_update_time = next_update_time.replace(day=now.day + 1, hour=0)
-            else:
-                # Tato hodina
-                next_update_time = now.replace(minute=minute_offset, second=0, microsecond=0)
+        # Čítače pro diagnostiku (cache hit/miss apod.)
+        self.stats: Counter = Counter()
 
-            _LOGGER.debug(f"Scheduling next update at {next_update_time.strftime('%H:%M')}")
-
-            # Zaregistruj callback na příští čas
-            async_track_point_in_time(
-                hass,
-                self.async_request_refresh,
-                next_update_time
-            )
-
-            # Zaregistruj se znovu pro příště
-            async_track_point_in_time(
-                hass,
-                lambda _: asyncio.create_task(schedule_next_update()),
-                next_update_time + timedelta(minutes=1)
-            )
+        # Doby jednotlivých kroků (jen pokud je měření zapnuté v options)
+        self.instrumentation = Instrumentation(
+            bool(entry.options.get(CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION))
+        )
 
-        # Nastartuj scheduler
-        hass.async_create_task(schedule_next_update())
+        # Formát JSON každého modelu z minula (rychlá cesta extrakce)
+        self._layouts = ModelLayoutCache(self.stats)
 
-    def _get_sunrise_sunset(self) -> dict:
-        """Calculate sunrise and sunset times for Prague."""
-        try:
-            if ASTRAL_AVAILABLE:
-                # Používej astral library pokud je dostupný
-                observer = Observer(
-                    latitude=PRAGUE_COORDINATES["latitude"],
-                    longitude=PRAGUE_COORDINATES["longitude"],
-                    elevation=0
-                )
-                sun_data = sun(observer, date=datetime.now(PRAGUE_TIMEZONE).date(), tzinfo=PRAGUE_TIMEZONE)
-                sunrise_str = sun_data["sunrise"].strftime("%H:%M")
-                sunset_str = sun_data["sunset"].strftime("%H:%M")
-            else:
-                # Fallback na jednoduchý algoritmus bez závislostí
-                import math
-                today = datetime.now()
-                day_of_year = today.timetuple().tm_yday
+        # Generace dat - zvyšuje se s každými nově publikovanými daty
+        self.generation = 0
 
-                latitude = PRAGUE_COORDINATES["latitude"]
-                latitude_rad = math.radians(latitude)
+        # Rychlé opakování pro jednotlivé modely (zastaralá nebo chybějící data)
+        self._retry_attempts: dict[str, int] = {}
+        self._retry_due: dict[str, float] = {}
+        self._retry_unsub: CALLBACK_TYPE | None = None
+        self._retry_in_progress = False
 
-                # Aproximace sluneční deklinace
-                solar_declination = 0.4093 * math.sin((2 * math.pi * (day_of_year - 81)) / 365)
+        # Klouzavá přesnost modelů (ring buffery uložené na disku)
+        self.accuracy = AccuracyTracker(hass, self.station)
+        # Vstupy poslední směsi BEST: (MAE určující váhy modelů, hodina, čerstvé modely)
+        self._ensemble_inputs: tuple | None = None
 
-                # Časový úhel pro sunrise/sunset
-                cos_hour_angle = -math.tan(latitude_rad) * math.tan(solar_declination)
-                cos_hour_angle = max(-1, min(1, cos_hour_angle))
-                hour_angle = math.acos(cos_hour_angle)
+        # Východ/západ slunce v místě stanice (předpočítaný na několik dní)
+        self.sun = self._get_sun_calendar()
 
-                # Sluneční čas
-                sunrise_solar_time = 12 - (hour_angle * 180 / math.pi) / 15
-                sunset_solar_time = 12 + (hour_angle * 180 / math.pi) / 15
+        # Data pocházejí ze snapshotu a ještě se nepodařil žádný update z API -
+        # entity zůstávají dostupné i když první updaty selžou (výpadek API)
+        self.serving_snapshot = False
 
-                # Místní čas (Praha UTC+2 v létě, UTC+1 v zimě)
-                # Zjednoduš na UTC+2 pro leto a UTC+1 pro zimu
-                is_summer = 3 <= today.month <= 10  # Zjednodušená detekce léta
-                timezone_offset = 2 if is_summer else 1
+        # Snapshot posledních dobrých dat na disku pro okamžitý start
+        self._snapshot_store = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot.{self.station}"
+        )
 
-                sunrise_hour = sunrise_solar_time + timezone_offset
-                sunset_hour = sunset_solar_time + timezone_offset
+    def _get_sun_calendar(self) -> SunCalendar:
+        """Return the sun calendar of the station location.
 
-                # Normalizuj na 24h formát
-                sunrise_hour = sunrise_hour % 24
-                sunset_hour = sunset_hour % 24
+        Uses the coordinates from the options, then the location configured in
+        Home Assistant and Prague as the last resort.
+        """
+        options = self._entry.options
+        config = self.hass.config
+        latitude = options.get(CONF_LATITUDE)
+        longitude = options.get(CONF_LONGITUDE)
+        if latitude is None or longitude is None:
+            latitude = getattr(config, "latitude", None)
+            longitude = getattr(config, "longitude", None)
+        if latitude is None or longitude is None:
+            latitude = PRAGUE_COORDINATES["latitude"]
+            longitude = PRAGUE_COORDINATES["longitude"]
 
-                sunrise_str = f"{int(sunrise_hour):02d}:{int((sunrise_hour % 1) * 60):02d}"
-                sunset_str = f"{int(sunset_hour):02d}:{int((sunset_hour % 1) * 60):02d}"
+        try:
+            time_zone = ZoneInfo(config.time_zone)
+        except (AttributeError, TypeError, ValueError, ZoneInfoNotFoundError):
+            time_zone = PRAGUE_TIMEZONE
 
-            _LOGGER.debug(f"Sunrise: {sunrise_str}, Sunset: {sunset_str}")
+        return get_sun_calendar(float(latitude), float(longitude), time_zone)
 
-            return {
-                "sunrise": sunrise_str,
-                "sunset": sunset_str,
-                "sunrise_datetime": None,
-                "sunset_datetime": None,
-            }
+    def _get_sunrise_sunset(self) -> dict:
+        """Return today's sunrise and sunset at the station location."""
+        try:
+            sun_times = self.sun.as_dict(time.time())
+            _LOGGER.debug(f"Sunrise: {sun_times['sunrise']}, Sunset: {sun_times['sunset']}")
+            return sun_times
         except Exception as err:
             _LOGGER.error(f"Error calculating sunrise/sunset: {err}")
             # Fallback na typické hodnoty pro Prahu
@@ -172,43 +184,65 @@ class PocasimeteoDataUpdateCoordinator(DataUpdateCoordinator):
                 "sunset_datetime": None,
             }
 
-    async def _async_refresh_data(self, session):
-        """Refresh data on the server side."""
+    @callback
+    def async_start_refresh(self) -> None:
+        """Call the refresh URL in the background unless it ran recently or still runs.
+
+        The model fetch never waits for the refresh - it polls the model
+        timestamps instead (see _async_await_fresh_data).
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            _LOGGER.debug("Refresh URL call already running")
+            return
+
         # Kontrola, zda se refresh už provádel
         now = datetime.now()
 
-        # Pokud byla poslední refresh před více než 55 minutami, nebo ještě vůbec nebyla
+        # Pokud byla poslední refresh před více než REFRESH_MIN_INTERVAL_MINUTES, nebo ještě vůbec nebyla
         if self._last_refresh_time is None:
-            time_since_refresh = float('inf')
-            should_refresh = True
             _LOGGER.info("First refresh since startup - calling refresh URL")
         else:
             time_since_refresh = (now - self._last_refresh_time).total_seconds() / 60
-            should_refresh = time_since_refresh > 55
-            if should_refresh:
-                _LOGGER.info(f"Refresh interval passed ({time_since_refresh:.0f}m) - calling refresh URL")
-            else:
+            if time_since_refresh <= REFRESH_MIN_INTERVAL_MINUTES:
                 _LOGGER.debug(f"Skipping refresh URL (last refresh was {time_since_refresh:.0f}m ago)")
+                return
+            _LOGGER.info(f"Refresh interval passed ({time_since_refresh:.0f}m) - calling refresh URL")
 
-        # Provádí refresh jen pokud je to poprvé, nebo pokud je to déle než 55 minut
-        if should_refresh:
-            try:
-                _LOGGER.info("Calling refresh URL: %s", self.refresh_url)
-                response = await session.get(self.refresh_url, timeout=15, allow_redirects=True)
-
-                if response.status == 200:
-                    _LOGGER.info("✓ Refresh URL called successfully (HTTP %s)", response.status)
-                    self._last_refresh_time = now
-                    # Počkáme, aby se data na serveru aktualizovala
-                    await asyncio.sleep(3)
-                else:
-                    _LOGGER.warning("✗ Refresh URL returned HTTP %s", response.status)
+        self._refresh_requested_at = now
+        self._refresh_task = self.hass.async_create_task(self._async_refresh_data(self._session, now))
 
-            except asyncio.TimeoutError:
-                _LOGGER.error("✗ Timeout calling refresh URL after 15 seconds")
-            except Exception as err:
-                _LOGGER.error("✗ Error calling refresh URL: %s", err, exc_info=True)
-                # I když refresh selže, pokračujeme ve fetchování existujících dat
+    def _refresh_is_recent(self) -> bool:
+        """Return True if the refresh URL was requested recently enough to wait for new data."""
+        return (
+            self._refresh_requested_at is not None
+            and (datetime.now() - self._refresh_requested_at).total_seconds() < READINESS_WINDOW_SECONDS
+        )
+
+    async def _async_refresh_data(self, session, requested_at: datetime) -> None:
+        """Refresh data on the server side."""
+        try:
+            _LOGGER.info("Calling refresh URL: %s", self.refresh_url)
+            # Odpověď musí být uvolněna zpět do sdíleného connection poolu
+            with self.instrumentation.timer("refresh_url"):
+                async with session.get(
+                    self.refresh_url, timeout=aiohttp.ClientTimeout(total=15), allow_redirects=True
+                ) as response:
+                    status = response.status
+
+            if status == 200:
+                _LOGGER.info("✓ Refresh URL called successfully (HTTP %s)", status)
+                self._last_refresh_time = requested_at
+                return
+            _LOGGER.warning("✗ Refresh URL returned HTTP %s", status)
+
+        except asyncio.TimeoutError:
+            _LOGGER.error("✗ Timeout calling refresh URL after 15 seconds")
+        except Exception as err:
+            _LOGGER.error("✗ Error calling refresh URL: %s", err, exc_info=True)
+            # I když refresh selže, pokračujeme ve fetchování existujících dat
+
+        # Neúspěšný refresh - na nová data se nečeká
+        self._refresh_requested_at = None
 
     def _parse_timestamp(self, timestamp_str: str) -> datetime | None:
         """Parse timestamp from API format 'DD.MM.YYYY HH:MM'."""
@@ -236,291 +270,850 @@ class PocasimeteoDataUpdateCoordinator(DataUpdateCoordinator):
         return int(age.total_seconds() / 60)
 
     def _extract_model_data(self, response_data: dict, model_name: str) -> dict | None:
-        """Extract model data from various API response formats."""
-        if not isinstance(response_data, dict):
-            _LOGGER.debug(f"Response data for {model_name} is not a dict")
-            return None
+        """Extract model data, dispatching on the layout the model file used last time."""
+        extracted = self._layouts.extract(response_data, model_name)
+        if extracted is not None:
+            _LOGGER.debug(
+                f"Extract {model_name} ({self._layouts.layouts[model_name]}): "
+                f"data_array={len(extracted['data'])} items, data_dne={len(extracted['data_dne'])} items, "
+                f"last_update={extracted['last_update']}"
+            )
+        return extracted
+
+    async def _async_fetch_model(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        model_name: str,
+        filename: str,
+    ) -> dict | None:
+        """Fetch and extract data for a single model within its own deadline.
+
+        Uses conditional requests (ETag / Last-Modified) and reuses the previously
+        extracted payload whenever the upstream file has not changed. The body is
+        parsed while it streams in, keeping only the retained forecast horizon.
+        """
+        # Sestav URL pro daný model (ve stejné složce)
+        model_url = MODEL_URL_TEMPLATE.format(
+            base_url=self.base_url, station=self.station, filename=filename
+        )
+        cached = self._model_cache.get(model_name)
 
-        # Preferuj root-level data pokud jsou k dispozici
-        data_array = response_data.get("data", [])
-        data_dne = response_data.get("data_dne", [])
-        last_update = response_data.get("PosledniAktualizace", "")
-
-        _LOGGER.debug(f"Extract {model_name}: data_array={len(data_array)} items, data_dne={len(data_dne)} items, last_update={last_update}")
-
-        # Kontrola: Pokud data[0] je objekt s "data" polem, je to vnořená struktura (ALADIN, atd)
-        if isinstance(data_array, list) and len(data_array) > 0:
-            first_item = data_array[0]
-            if isinstance(first_item, dict):
-                # Pokud data[0] má vlastní "data" pole, vyextrahuj je
-                if "data" in first_item and isinstance(first_item.get("data"), list):
-                    # Toto je vnořená struktura - vyextrahuj data z prvního objektu
-                    data_array = first_item.get("data", [])
-                    # Pokud nemáme data_dne na root, vezmi ze struktury
-                    if not data_dne and "data_dne" in first_item:
-                        data_dne = first_item.get("data_dne", [])
-                # Pokud pouze chybí data_dne na root, zkus v data[0]
-                elif not data_dne and "data_dne" in first_item and isinstance(first_item["data_dne"], list):
-                    data_dne = first_item["data_dne"]
-
-        # Format 1: Přímý formát - data jsou přímo v response
-        if isinstance(data_array, list):
-            return {
-                "data": data_array,
-                "data_dne": data_dne,
-                "last_update": last_update
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        # Doba parsování JSON se měří jen se zapnutým měřením
+        timing = self.instrumentation.enabled
+        decode_seconds = 0.0
+        received = 0
+
+        async with semaphore:
+            try:
+                with self.instrumentation.timer(f"fetch.{model_name}"):
+                    async with async_timeout.timeout(MODEL_FETCH_TIMEOUT):
+                        async with session.get(model_url, headers=headers) as response:
+                            if response.status == 304 and cached:
+                                self.stats["http_not_modified"] += 1
+                                _LOGGER.debug(f"Model {model_name} not modified (HTTP 304)")
+                                return dict(cached["extracted"])
+                            if response.status != 200:
+                                self.stats["http_error"] += 1
+                                _LOGGER.debug(f"Model {model_name} not available (status {response.status})")
+                                return None
+                            etag = response.headers.get("ETag")
+                            last_modified = response.headers.get("Last-Modified")
+                            parser = StreamingModelParser(model_name, response.charset or "utf-8-sig")
+                            hasher = hashlib.blake2b(digest_size=16)
+                            cached_last_update = cached["extracted"]["last_update"] if cached else None
+
+                            # Parsuj průběžně po blocích - celé tělo se nikdy nedrží v paměti
+                            async for chunk in response.content.iter_chunked(HTTP_CHUNK_SIZE):
+                                received += len(chunk)
+                                hasher.update(chunk)
+                                if parser is None:
+                                    continue
+                                if timing:
+                                    started = time.perf_counter()
+                                parser.feed(chunk)
+                                if timing:
+                                    decode_seconds += time.perf_counter() - started
+                                # Stejná PosledniAktualizace jako minule - zbytek se už neparsuje
+                                if cached_last_update and parser.last_update == cached_last_update:
+                                    parser = None
+            except asyncio.TimeoutError:
+                self.stats["http_timeout"] += 1
+                _LOGGER.debug(f"Timeout fetching {model_name} from {model_url}")
+                return None
+            except (ValueError, LookupError) as err:
+                self.stats["invalid_json"] += 1
+                _LOGGER.debug(f"Invalid JSON for {model_name}: {err}")
+                return None
+            except Exception as err:
+                self.stats["http_error"] += 1
+                _LOGGER.debug(f"Error fetching {model_name}: {err}")
+                return None
+            finally:
+                self.stats["http_bytes"] += received
+
+        body_hash = hasher.hexdigest()
+
+        # Stejný obsah jako minule - není co extrahovat
+        if cached and cached["body_hash"] == body_hash:
+            self.stats["http_body_unchanged"] += 1
+            cached.update(etag=etag, last_modified=last_modified)
+            _LOGGER.debug(f"Model {model_name} body unchanged")
+            return dict(cached["extracted"])
+
+        # Stejná PosledniAktualizace jako minule - není co extrahovat
+        if parser is None:
+            self.stats["http_timestamp_unchanged"] += 1
+            cached.update(etag=etag, last_modified=last_modified, body_hash=body_hash)
+            _LOGGER.debug(f"Model {model_name} timestamp unchanged ({cached_last_update})")
+            return dict(cached["extracted"])
+
+        try:
+            if timing:
+                started = time.perf_counter()
+            data = parser.close()
+            if timing:
+                self.instrumentation.record("decode", decode_seconds + time.perf_counter() - started)
+        except ValueError as err:
+            self.stats["invalid_json"] += 1
+            _LOGGER.debug(f"Invalid JSON for {model_name}: {err}")
+            return None
+        if parser.dropped_rows:
+            _LOGGER.debug(f"Model {model_name}: {parser.dropped_rows} rows beyond the retained horizon dropped")
+
+        self.stats["http_miss"] += 1
+
+        with self.instrumentation.timer("extract"):
+            # Zkus extrahovat data v různých formátech
+            extracted_data = self._extract_model_data(data, model_name)
+            if not extracted_data:
+                _LOGGER.warning(f"Failed to extract data for {model_name} from {model_url}")
+                return None
+
+            # Jednorázová normalizace do sloupcové podoby
+            extracted_data = self._normalize_model_data(extracted_data)
+
+        self._model_cache[model_name] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body_hash": body_hash,
+            "extracted": extracted_data,
+        }
+
+        _LOGGER.debug(f"Successfully fetched data for {model_name}")
+        return dict(extracted_data)
+
+    def layout_info(self) -> dict:
+        """Return detected payload layouts and layout drift for diagnostics."""
+        return self._layouts.as_dict()
+
+    def http_cache_info(self) -> dict:
+        """Return cached validators of every model file for diagnostics."""
+        return {
+            model_name: {
+                "etag": cached["etag"],
+                "last_modified": cached["last_modified"],
+                "last_update": cached["extracted"].get("last_update"),
             }
+            for model_name, cached in self._model_cache.items()
+        }
 
-        # Format 2: Model je zagníždený v klíči s názvem modelu (např. "MASTER": {...})
-        if model_name in response_data and isinstance(response_data[model_name], dict):
-            model_obj = response_data[model_name]
-            model_data_array = model_obj.get("data", [])
-            model_data_dne = model_obj.get("data_dne", [])
-            model_last_update = model_obj.get("PosledniAktualizace", "")
-
-            # Kontrola: Pokud data[0] je objekt s "data" polem, vyextrahuj vnitřní data
-            if isinstance(model_data_array, list) and len(model_data_array) > 0:
-                first_item = model_data_array[0]
-                if isinstance(first_item, dict):
-                    if "data" in first_item and isinstance(first_item.get("data"), list):
-                        model_data_array = first_item.get("data", [])
-                        if not model_data_dne and "data_dne" in first_item:
-                            model_data_dne = first_item.get("data_dne", [])
-                    elif not model_data_dne and "data_dne" in first_item and isinstance(first_item["data_dne"], list):
-                        model_data_dne = first_item["data_dne"]
-
-            if isinstance(model_data_array, list):
-                return {
-                    "data": model_data_array,
-                    "data_dne": model_data_dne,
-                    "last_update": model_last_update
-                }
+    async def _async_fetch_models(
+        self, session: aiohttp.ClientSession, models_to_fetch: dict[str, str]
+    ) -> dict:
+        """Fetch all models concurrently and collect results as they arrive.
 
-        # Format 3: Data v poli objektů s názvem modelu
-        if isinstance(response_data.get("data"), list):
-            for item in response_data["data"]:
-                if isinstance(item, dict) and item.get("nazevModelu") == model_name:
-                    item_data = item.get("data", [])
-                    item_data_dne = item.get("data_dne", [])
-
-                    # Kontrola: Pokud data[0] je objekt s "data" polem, vyextrahuj vnitřní data
-                    if isinstance(item_data, list) and len(item_data) > 0:
-                        first_subitem = item_data[0]
-                        if isinstance(first_subitem, dict):
-                            if "data" in first_subitem and isinstance(first_subitem.get("data"), list):
-                                item_data = first_subitem.get("data", [])
-                                if not item_data_dne and "data_dne" in first_subitem:
-                                    item_data_dne = first_subitem.get("data_dne", [])
-                            elif not item_data_dne and "data_dne" in first_subitem and isinstance(first_subitem["data_dne"], list):
-                                item_data_dne = first_subitem["data_dne"]
-
-                    return {
-                        "data": item_data,
-                        "data_dne": item_data_dne,
-                        "last_update": item.get("PosledniAktualizace", "")
-                    }
+        MASTER is mandatory - as soon as its download fails, the remaining
+        downloads are cancelled and the update fails.
+        """
+        concurrency = max(
+            1,
+            int(self._entry.options.get(CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY)),
+        )
+        semaphore = asyncio.Semaphore(concurrency)
 
-        return None
+        tasks = {
+            asyncio.ensure_future(
+                self._async_fetch_model(session, semaphore, model_name, filename)
+            ): model_name
+            for model_name, filename in models_to_fetch.items()
+        }
 
-    def _check_data_staleness(self, processed_data: dict) -> dict:
-        """Check if data is stale and add staleness info."""
-        # Vezmi timestamp z prvního modelu (všechny by měly mít stejný)
-        first_model_data = next(iter(processed_data["models"].values()), {})
-        last_update = first_model_data.get("last_update", "")
+        models = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model_name = tasks[task]
+                    extracted_data = task.result()
+                    if extracted_data:
+                        models[model_name] = extracted_data
+                    elif model_name == "MASTER":
+                        raise UpdateFailed("Failed to fetch MASTER model data")
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return models
+
+    def _is_regenerated(self, model_data: dict) -> bool:
+        """Return True if the model's PosledniAktualizace is not older than the refresh request."""
+        requested_at = self._refresh_requested_at
+        if requested_at is None:
+            return True
+        last_update = self._parse_timestamp(model_data.get("last_update", ""))
+        if last_update is None:
+            return True
+        # PosledniAktualizace má přesnost na minuty
+        return last_update >= requested_at.replace(second=0, microsecond=0)
+
+    async def _async_await_fresh_data(
+        self,
+        session: aiohttp.ClientSession,
+        fetched: dict,
+        models_to_fetch: dict[str, str],
+        deadline: float,
+    ) -> dict:
+        """Wait for upstream to regenerate the data after a recent refresh URL call.
+
+        Only MASTER is polled (conditional requests, mostly cheap 304s) with
+        short backoff while its PosledniAktualizace is older than the refresh
+        request; once it advances, the other models are fetched again. Gives
+        up after READINESS_POLL_DELAYS or at deadline (loop time) and leaves
+        the rest to the stale-data retries.
+        """
+        master = fetched.get("MASTER")
+        if master is None or not self._refresh_is_recent() or self._is_regenerated(master):
+            return fetched
 
-        data_age_minutes = self._get_data_age_minutes(last_update)
-        is_stale = False
+        _LOGGER.debug(
+            f"MASTER data ({master['last_update']}) predates the refresh request - waiting for new data"
+        )
+        loop = self.hass.loop
+        with self.instrumentation.timer("readiness"):
+            for delay in READINESS_POLL_DELAYS:
+                # Čekání nesmí vyčerpat limit celého updatu - stažená data by se zahodila
+                if deadline - loop.time() <= delay:
+                    break
+                await asyncio.sleep(delay)
+                self.stats["readiness_poll"] += 1
+                try:
+                    async with async_timeout.timeout(deadline - loop.time()):
+                        polled = await self._async_fetch_models(
+                            session, {"MASTER": models_to_fetch["MASTER"]}
+                        )
+                except asyncio.TimeoutError:
+                    break
+                except UpdateFailed:
+                    continue
+                if not self._is_regenerated(polled["MASTER"]):
+                    continue
 
-        if data_age_minutes is not None and data_age_minutes > DATA_MAX_AGE_MINUTES:
-            is_stale = True
-            _LOGGER.warning(
-                f"Data is stale: {data_age_minutes} minutes old (max allowed: {DATA_MAX_AGE_MINUTES})"
+                _LOGGER.debug(f"New MASTER data ready ({polled['MASTER']['last_update']})")
+                others = {
+                    name: filename for name, filename in models_to_fetch.items() if name != "MASTER"
+                }
+                try:
+                    async with async_timeout.timeout(max(0.0, deadline - loop.time())):
+                        refetched = await self._async_fetch_models(session, others)
+                except (UpdateFailed, asyncio.TimeoutError):
+                    refetched = {}
+                return {**fetched, **refetched, **polled}
+
+        self.stats["readiness_timeout"] += 1
+        _LOGGER.debug("MASTER data still not regenerated - using the data we have")
+        return fetched
+
+    def _apply_master_fallback(self, processed_data: dict) -> None:
+        """Fill models missing upstream with MASTER data so their entities can exist."""
+        master_data = processed_data["models"].get("MASTER", {})
+        for model in WEATHER_MODELS:
+            if model not in processed_data["models"]:
+                if master_data:
+                    _LOGGER.warning(f"Model {model} not available from API - using MASTER as fallback")
+                    # Tabulky předpovědi jsou jen pro čtení - fallback na ně pouze odkazuje,
+                    # vlastní anotace modelu (data_stale, ...) se ukládají do tohoto malého dictu
+                    processed_data["models"][model] = {
+                        "hourly": master_data["hourly"],
+                        "daily": master_data["daily"],
+                        "last_update": master_data["last_update"],
+                        "fallback_of": "MASTER",
+                    }
+                else:
+                    _LOGGER.error(f"Model {model} not available and MASTER is also missing")
+
+    def _merge_models(self, fetched: dict, requested) -> tuple[dict, set[str]]:
+        """Merge freshly fetched models into the previous per-model state.
+
+        Models whose forecast did not move keep sharing the previous tables,
+        models that were requested but failed keep their previous real data.
+        Returns the new models dict and the names of models that changed.
+        """
+        previous_models = self.data["models"] if self.data else {}
+        models = {}
+        changed = set()
+
+        for model_name in WEATHER_MODELS:
+            previous = previous_models.get(model_name)
+            if previous is not None and previous.get("fallback_of"):
+                previous = None
+            model_data = fetched.get(model_name)
+
+            if model_data is None:
+                if previous is not None:
+                    if model_name in requested:
+                        _LOGGER.warning(f"Model {model_name} not available from API - keeping previous data")
+                    models[model_name] = dict(previous)
+                continue
+
+            if previous is not None and (
+                previous["hourly"] is model_data["hourly"]
+                or (model_data["last_update"] and previous["last_update"] == model_data["last_update"])
+            ):
+                # Beze změny - sdílej tabulky předchozí generace
+                models[model_name] = dict(previous)
+            else:
+                models[model_name] = dict(model_data)
+                changed.add(model_name)
+
+        return models, changed
+
+    def _build_data(
+        self,
+        fetched: dict,
+        requested,
+        sun_times: dict,
+        fallback_time: datetime | None = None,
+        save_snapshot: bool = True,
+    ) -> dict:
+        """Build a new data generation from fetched models and the previous state.
+
+        The result lists the models whose forecast changed in "changed_models"
+        and every model carries the generation of its last change.
+        """
+        models, changed = self._merge_models(fetched, requested)
+        previous_models = self.data["models"] if self.data else {}
+
+        processed_data = {
+            "available_models": list(ALL_MODELS.keys()),
+            "models": models,
+            "sun_times": sun_times,
+        }
+
+        # Pokud nemáme data pro ostatní modely, použij MASTER data jako fallback
+        # aby entity mohly existovat
+        self._apply_master_fallback(processed_data)
+        for model_name, model_data in models.items():
+            if model_data.get("fallback_of") and (
+                "MASTER" in changed or not previous_models.get(model_name, {}).get("fallback_of")
+            ):
+                changed.add(model_name)
+
+        if changed and save_snapshot:
+            # Ulož poslední dobrá data pro rychlý start po restartu
+            self._async_save_snapshot(
+                {
+                    model_name: model_data
+                    for model_name, model_data in models.items()
+                    if not model_data.get("fallback_of")
+                }
             )
 
-        # Přidej info o zastaralosti do všech modelů
-        for model_data in processed_data["models"].values():
+        instrumentation = self.instrumentation
+        with instrumentation.timer("staleness"):
+            processed_data = self._check_data_staleness(processed_data, fallback_time=fallback_time)
+        with instrumentation.timer("ensemble"):
+            self._apply_ensemble(processed_data, changed)
+        with instrumentation.timer("matrix"):
+            self._apply_matrix(processed_data, changed)
+
+        generation = self._next_generation()
+        for model_name, model_data in models.items():
+            if model_name in changed or "generation" not in model_data:
+                model_data["generation"] = generation
+        processed_data["generation"] = generation
+        processed_data["changed_models"] = frozenset(changed)
+        processed_data["accuracy"] = self.accuracy.summary()
+
+        return processed_data
+
+    def _apply_ensemble(self, processed_data: dict, changed: set[str]) -> None:
+        """Add the virtual BEST model blended from all real models.
+
+        The blend is rebuilt only when a model changed, the measured accuracy
+        moved, the set of fresh source models changed or a new hour shifted
+        the lead times; otherwise the previous tables are shared like those of
+        any unchanged model, with the data age taken from the current sources.
+        """
+        models = processed_data["models"]
+        summary = self.accuracy.summary()
+        skill = skill_signature(summary)
+        now = time.time()
+        hour = int(now // 3600)
+        previous = (self.data["models"] if self.data else {}).get(ENSEMBLE_MODEL)
+
+        # Fallback modely jsou jen kopie MASTER, zastaralé modely se použijí jen když nic jiného není
+        sources = {
+            model_name: model_data
+            for model_name, model_data in models.items()
+            if model_name in WEATHER_MODELS and not model_data.get("fallback_of")
+        }
+        fresh = {name: data for name, data in sources.items() if not data.get("data_stale")}
+        inputs = (skill, hour, frozenset(fresh))
+        data_age_minutes = min(
+            (data["data_age_minutes"] for data in (fresh or sources).values()
+             if data.get("data_age_minutes") is not None),
+            default=None,
+        )
+
+        if previous is not None and not changed and self._ensemble_inputs == inputs:
+            models[ENSEMBLE_MODEL] = {**previous, "data_age_minutes": data_age_minutes}
+            return
+
+        started = time.perf_counter()
+        ensemble = blend_models(fresh or sources, summary, now)
+        if ensemble is None:
+            return
+
+        ensemble["data_age_minutes"] = data_age_minutes
+        ensemble["data_stale"] = not fresh
+        models[ENSEMBLE_MODEL] = ensemble
+        changed.add(ENSEMBLE_MODEL)
+        self._ensemble_inputs = inputs
+
+        _LOGGER.debug(
+            f"Blended {ENSEMBLE_MODEL} from {ensemble['sources']} in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    def _apply_matrix(self, processed_data: dict, changed: set[str]) -> None:
+        """Align all real models on a common hour grid (shared while unchanged)."""
+        previous = self.data.get("matrix") if self.data else None
+        if previous is not None and not changed & set(WEATHER_MODELS):
+            processed_data["matrix"] = previous
+            return
+
+        processed_data["matrix"] = ModelMatrix(
+            {
+                model_name: model_data["hourly"]
+                for model_name, model_data in processed_data["models"].items()
+                if model_name in WEATHER_MODELS and not model_data.get("fallback_of")
+            }
+        )
+
+    def _next_generation(self) -> int:
+        """Return a new data generation number."""
+        self.generation += 1
+        return self.generation
+
+    def _normalize_model_data(self, extracted_data: dict) -> dict:
+        """Convert extracted raw API lists into columnar forecast tables."""
+        return {
+            "hourly": hourly_table(extracted_data.get("data", [])),
+            "daily": daily_table(extracted_data.get("data_dne", [])),
+            "last_update": extracted_data.get("last_update", ""),
+        }
+
+    def _get_model_age_minutes(
+        self, model_data: dict, fallback_time: datetime | None = None
+    ) -> int | None:
+        """Get age of a model's data in minutes from its own upstream timestamp."""
+        data_age_minutes = self._get_data_age_minutes(model_data.get("last_update", ""))
+        if data_age_minutes is None and fallback_time is not None:
+            data_age_minutes = int((datetime.now() - fallback_time).total_seconds() / 60)
+        return data_age_minutes
+
+    def _check_data_staleness(
+        self, processed_data: dict, fallback_time: datetime | None = None
+    ) -> dict:
+        """Check if data is stale and add staleness info.
+
+        Every model is judged by its own PosledniAktualizace (models publish on
+        different cadences). fallback_time is used for the age when the upstream
+        timestamp is missing (e.g. the time a snapshot was saved).
+        """
+        stale_models = []
+        for model_name, model_data in processed_data["models"].items():
+            data_age_minutes = self._get_model_age_minutes(model_data, fallback_time)
+            is_stale = data_age_minutes is not None and data_age_minutes > DATA_MAX_AGE_MINUTES
             model_data["data_age_minutes"] = data_age_minutes
             model_data["data_stale"] = is_stale
+            if is_stale and not model_data.get("fallback_of"):
+                stale_models.append(f"{model_name} ({data_age_minutes} min)")
 
-        # Ulož stav
-        self._data_is_stale = is_stale
+        if stale_models:
+            _LOGGER.warning(
+                f"Data is stale for {', '.join(stale_models)} (max allowed: {DATA_MAX_AGE_MINUTES} min)"
+            )
+
+        # Ulož stav (MASTER je povinný model)
+        self._data_is_stale = processed_data["models"].get("MASTER", {}).get("data_stale", False)
         self._last_successful_update = datetime.now()
 
         return processed_data
 
+    def _retry_delay(self, attempt: int) -> float:
+        """Return the backoff delay in seconds before the given retry attempt."""
+        delay = min(
+            RETRY_BASE_SECONDS * 2 ** attempt,
+            DATA_STALE_UPDATE_INTERVAL_MINUTES * 60,
+        )
+        return delay * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER)
+
+    @callback
+    def _async_schedule_retries(self, checked_models, retry_models: set[str]) -> None:
+        """Plan fast retries for models that failed or returned stale data.
+
+        Models from checked_models that are fine again go back to the hourly
+        cadence. The others are retried with exponential backoff and jitter
+        until RETRY_MAX_ATTEMPTS is reached.
+        """
+        now = self.hass.loop.time()
+        for model_name in checked_models:
+            if model_name not in retry_models:
+                if self._retry_attempts.pop(model_name, None):
+                    _LOGGER.info(f"Model {model_name} is up to date again - back to hourly updates")
+                self._retry_due.pop(model_name, None)
+                continue
+
+            attempt = self._retry_attempts.get(model_name, 0)
+            if attempt >= RETRY_MAX_ATTEMPTS:
+                self._retry_due.pop(model_name, None)
+                _LOGGER.debug(f"Model {model_name}: no more retries until the next hourly update")
+                continue
+
+            delay = self._retry_delay(attempt)
+            self._retry_attempts[model_name] = attempt + 1
+            self._retry_due[model_name] = now + delay
+            _LOGGER.debug(f"Model {model_name}: retry #{attempt + 1} in {delay:.0f}s")
+
+        self._async_arm_retry_timer()
+
+    @callback
+    def _async_schedule_update_retry(self) -> None:
+        """Plan a fast retry of a failed full update."""
+        if not self._retry_in_progress:
+            self._retry_attempts.clear()
+        self._async_schedule_retries(("MASTER",), {"MASTER"})
+
+    @callback
+    def _async_arm_retry_timer(self) -> None:
+        """(Re)start the timer for the earliest due retry."""
+        if self._retry_unsub is not None:
+            self._retry_unsub()
+            self._retry_unsub = None
+
+        if not self._retry_due:
+            return
+
+        delay = max(0.0, min(self._retry_due.values()) - self.hass.loop.time())
+        self._retry_unsub = async_call_later(self.hass, delay, self._async_handle_retry_timer)
+
+    @callback
+    def _async_handle_retry_timer(self, _now) -> None:
+        """Run due retries."""
+        self._retry_unsub = None
+        self.hass.async_create_task(self._async_retry_models())
+
+    async def _async_retry_models(self) -> None:
+        """Refetch models whose retry is due."""
+        now = self.hass.loop.time()
+        due_models = {model for model, due in self._retry_due.items() if due <= now}
+        for model_name in due_models:
+            self._retry_due.pop(model_name)
+
+        if not due_models:
+            self._async_arm_retry_timer()
+            return
+
+        # Bez MASTER (nebo bez jakýchkoliv dat) je potřeba kompletní update
+        if self.data is None or "MASTER" in due_models:
+            self.stats["retry_update"] += 1
+            _LOGGER.info("Retrying full update for station %s", self.station)
+            self._retry_in_progress = True
+            try:
+                await self.async_refresh()
+            finally:
+                self._retry_in_progress = False
+            return
+
+        self.stats["retry_models"] += len(due_models)
+        await self._async_refresh_models(due_models)
+
+    async def _async_refresh_models(self, model_names: set[str]) -> None:
+        """Refetch only the given models and publish them merged into current data."""
+        _LOGGER.info(f"Retrying models for station {self.station}: {sorted(model_names)}")
+        models_to_fetch = {
+            name: WEATHER_MODELS[name]["file"] for name in model_names if name in WEATHER_MODELS
+        }
+        try:
+            async with async_timeout.timeout(UPDATE_TIMEOUT):
+                fetched = await self._async_fetch_models(self._session, models_to_fetch)
+        except Exception as err:
+            _LOGGER.debug(f"Retry of {sorted(model_names)} failed: {err}")
+            fetched = {}
+
+        retry_models = set(model_names) - set(fetched)
+        for model_name, model_data in fetched.items():
+            age = self._get_model_age_minutes(model_data)
+            if age is not None and age > DATA_MAX_AGE_MINUTES:
+                retry_models.add(model_name)
+
+        processed_data = self._build_data(fetched, model_names, self.data["sun_times"])
+        if processed_data["changed_models"]:
+            _LOGGER.info(
+                f"✓ Updated models for station {self.station}: {sorted(processed_data['changed_models'])}"
+            )
+            self.async_set_updated_data(processed_data)
+
+        self._async_schedule_retries(model_names, retry_models)
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending retries and a running refresh URL call."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
+        if self._retry_unsub is not None:
+            self._retry_unsub()
+            self._retry_unsub = None
+        self._retry_due.clear()
+        await super().async_shutdown()
+
+    def _async_save_snapshot(self, models: dict) -> None:
+        """Schedule an atomic write of the last good model data to disk."""
+        # Jen modely skutečně stažené z API - fallback kopie se doplní při obnově
+        models = dict(models)
+
+        def _snapshot_data() -> dict:
+            return {
+                "saved_at": datetime.now().isoformat(),
+                "models": {
+                    model_name: {
+                        "data": model_data["hourly"].records(),
+                        "data_dne": model_data["daily"].records(),
+                        "last_update": model_data["last_update"],
+                    }
+                    for model_name, model_data in models.items()
+                },
+            }
+
+        self._snapshot_store.async_delay_save(_snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    async def async_load_snapshot(self) -> bool:
+        """Hydrate coordinator data from the on-disk snapshot of the last good update.
+
+        Returns True if usable data was restored.
+        """
+        try:
+            snapshot = await self._snapshot_store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Failed to load snapshot for %s: %s", self.station, err)
+            return False
+
+        if not snapshot or "MASTER" not in snapshot.get("models", {}):
+            _LOGGER.debug("No usable snapshot for %s", self.station)
+            return False
+
+        try:
+            saved_at = datetime.fromisoformat(snapshot["saved_at"])
+        except (KeyError, TypeError, ValueError):
+            saved_at = None
+
+        models = {
+            model_name: self._normalize_model_data(model_data)
+            for model_name, model_data in snapshot["models"].items()
+            if model_name in WEATHER_MODELS
+        }
+        processed_data = self._build_data(
+            models,
+            models,
+            self._get_sunrise_sunset(),
+            fallback_time=saved_at,
+            save_snapshot=False,
+        )
+        # Snapshot není čerstvý update z API
+        self._last_successful_update = saved_at
+        self.serving_snapshot = True
+
+        _LOGGER.info(
+            "✓ Restored snapshot for %s (saved %s)", self.station, snapshot.get("saved_at")
+        )
+        self.async_set_updated_data(processed_data)
+        return True
+
+    async def async_load_accuracy(self) -> None:
+        """Load persisted rolling accuracy of the station."""
+        await self.accuracy.async_load()
+
+    @staticmethod
+    async def async_remove_snapshot(hass: HomeAssistant, station: str) -> None:
+        """Delete the on-disk snapshot of a station."""
+        await Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot.{station}").async_remove()
+
     async def _async_update_data(self):
         """Fetch data from API."""
         _LOGGER.info("▶ Starting PočasíMeteo data update for station: %s", self.station)
+        started = time.perf_counter()
+        # Čekání na přegenerovaná data musí skončit dřív než limit celého updatu
+        deadline = self.hass.loop.time() + UPDATE_TIMEOUT - READINESS_RESERVE_SECONDS
         try:
-            async with async_timeout.timeout(60):  # Delší timeout pro více requestů
-                async with aiohttp.ClientSession() as session:
-                    _LOGGER.debug("ClientSession created successfully")
-
-                    # KROK 0: Spočítej sunrise/sunset
-                    sun_times = self._get_sunrise_sunset()
+            async with async_timeout.timeout(UPDATE_TIMEOUT):  # Delší timeout pro více requestů
+                session = self._session
 
-                    # KROK 1: Refresh URL - volá se max jednou za hodinu
-                    _LOGGER.info("→ KROK 1: Calling refresh data method")
-                    await self._async_refresh_data(session)
-                    _LOGGER.info("→ KROK 1: Refresh data method completed")
+                # KROK 0: Spočítej sunrise/sunset
+                sun_times = self._get_sunrise_sunset()
 
-                    # KROK 2: Stáhni data pro všechny modely
-                    _LOGGER.info("→ KROK 2: Fetching data for all models")
+                # KROK 1: Refresh URL - volá se max jednou za hodinu, na pozadí
+                # (obvykle ho už předem spustil scheduler)
+                _LOGGER.info("→ KROK 1: Starting refresh URL in background")
+                self.async_start_refresh()
 
-                    # Import WEATHER_MODELS from const
-                    from .const import WEATHER_MODELS
+                # KROK 2: Stáhni data pro všechny modely
+                _LOGGER.info("→ KROK 2: Fetching data for all models")
 
-                    available_model_names = list(WEATHER_MODELS.keys())
+                available_model_names = list(WEATHER_MODELS.keys())
 
-                    processed_data = {
-                        "available_models": available_model_names,
-                        "models": {},
-                        "sun_times": sun_times  # Přidej sunrise/sunset do kořenových dat
-                    }
+                # Všechny dostupné modely s odpovídajícími soubory (z WEATHER_MODELS)
+                models_to_fetch = {
+                    name: info["file"] for name, info in WEATHER_MODELS.items()
+                }
 
-                    # Všechny dostupné modely s odpovídajícími soubory (z WEATHER_MODELS)
-                    models_to_fetch = {
-                        name: info["file"] for name, info in WEATHER_MODELS.items()
-                    }
+                # Fetchuj data pro všechny modely souběžně - nezměněné soubory
+                # odpoví levně (HTTP 304 / stejný hash) a nic se znovu neparsuje
+                fetched = await self._async_fetch_models(session, models_to_fetch)
+                fetched = await self._async_await_fresh_data(
+                    session, fetched, models_to_fetch, deadline
+                )
 
-                    # Fetchuj data pro všechny modely
-                    for model_name, filename in models_to_fetch.items():
-                        # Sestav URL pro daný model (ve stejné složce)
-                        model_url = f"https://ext.pocasimeteo.cz/{self.station}/predpoved/data/{filename}"
-
-                        try:
-                            async with session.get(model_url, timeout=10) as response:
-                                if response.status == 200:
-                                    data = await response.json()
-
-                                    # Zkus extrahovat data v různých formátech
-                                    extracted_data = self._extract_model_data(data, model_name)
-                                    if extracted_data:
-                                        processed_data["models"][model_name] = extracted_data
-                                        _LOGGER.debug(f"Successfully fetched data for {model_name}")
-                                    else:
-                                        _LOGGER.warning(f"Failed to extract data for {model_name} from {model_url}")
-                                else:
-                                    _LOGGER.debug(f"Model {model_name} not available (status {response.status})")
-                        except asyncio.TimeoutError:
-                            _LOGGER.debug(f"Timeout fetching {model_name} from {model_url}")
-                        except Exception as err:
-                            _LOGGER.debug(f"Error fetching {model_name}: {err}")
-
-                    # Pokud nemáme alespoň MASTER, je to chyba
-                    if "MASTER" not in processed_data["models"]:
-                        raise UpdateFailed("Failed to fetch MASTER model data")
+                # Pokud nemáme alespoň MASTER, je to chyba
+                if "MASTER" not in fetched:
+                    raise UpdateFailed("Failed to fetch MASTER model data")
+
+                # Debug: Log které modely byly úspěšně fetchnuty z API
+                _LOGGER.info(f"Models fetched from API: {list(fetched.keys())}")
+
+                # KROK 3: Nová generace - nezměněné modely sdílí data s předchozí
+                _LOGGER.info("→ KROK 3: Merging models and checking data staleness")
+                processed_data = self._build_data(fetched, models_to_fetch, sun_times)
+
+                # Debug: Log které modely mají data a kolik
+                for model_name in available_model_names:
+                    model_data = processed_data["models"].get(model_name, {})
+                    hourly_count = len(model_data.get("hourly", ()))
+                    daily_count = len(model_data.get("daily", ()))
+                    last_update = model_data.get("last_update", "N/A")
+                    _LOGGER.info(f"  → {model_name}: hourly={hourly_count}, daily={daily_count}, last_update={last_update}")
+
+                _LOGGER.info(
+                    "✓ Successfully fetched data for %d models (changed: %s)",
+                    len(processed_data["models"]),
+                    sorted(processed_data["changed_models"]),
+                )
 
-                    # Debug: Log které modely byly úspěšně fetchnuty z API
-                    _LOGGER.info(f"Models fetched from API: {list(processed_data['models'].keys())}")
-
-                    # Pokud nemáme data pro ostatní modely, použij MASTER data jako fallback
-                    # aby entity mohly existovat
-                    master_data = processed_data["models"].get("MASTER", {})
-                    for model in available_model_names:
-                        if model not in processed_data["models"]:
-                            if master_data:
-                                _LOGGER.warning(f"Model {model} not available from API - using MASTER as fallback")
-                                # DŮLEŽITÉ: Použij deepcopy, aby každý model měl vlastní kopii dat
-                                # Shallow copy by způsobila, že všechny modely sdílejí stejné list objekty
-                                processed_data["models"][model] = copy.deepcopy(master_data)
-                            else:
-                                _LOGGER.error(f"Model {model} not available and MASTER is also missing")
-
-                    _LOGGER.info(f"Successfully fetched data for {len(processed_data['models'])} models")
-
-                    # Debug: Log které modely mají data a kolik
-                    for model_name in available_model_names:
-                        model_data = processed_data["models"].get(model_name, {})
-                        hourly_count = len(model_data.get("data", []))
-                        daily_count = len(model_data.get("data_dne", []))
-                        last_update = model_data.get("last_update", "N/A")
-                        _LOGGER.info(f"  → {model_name}: hourly={hourly_count}, daily={daily_count}, last_update={last_update}")
-
-                    # Kontrola zastaralosti dat
-                    _LOGGER.info("→ KROK 3: Checking data staleness")
-                    processed_data = self._check_data_staleness(processed_data)
-
-                    _LOGGER.info("✓ Successfully fetched data for %d models", len(processed_data["models"]))
-
-                    # Zaznamenej accuracy dat - pokud je k dispozici reference_temperature_entity
+                # Zaznamenej accuracy dat - pokud je k dispozici reference_temperature_entity
+                with self.instrumentation.timer("accuracy"):
                     await self._track_model_accuracy(processed_data)
+                processed_data["accuracy"] = self.accuracy.summary()
+
+                # Chybějící nebo zastaralé modely se zkusí znovu dříve než za hodinu
+                if not self._retry_in_progress:
+                    self._retry_attempts.clear()
+                self._async_schedule_retries(
+                    available_model_names,
+                    {
+                        model_name
+                        for model_name in available_model_names
+                        if model_name not in fetched
+                        or processed_data["models"][model_name]["data_stale"]
+                    },
+                )
 
-                    return processed_data
+                self.instrumentation.record("update", time.perf_counter() - started)
+                self.serving_snapshot = False
+                return processed_data
 
+        except UpdateFailed:
+            self._async_schedule_update_retry()
+            raise
         except aiohttp.ClientError as err:
             _LOGGER.error("✗ API communication error: %s", err, exc_info=True)
+            self._async_schedule_update_retry()
             raise UpdateFailed(f"Error communicating with API: {err}")
         except Exception as err:
             _LOGGER.error("✗ Unexpected error: %s", err, exc_info=True)
+            self._async_schedule_update_retry()
             raise UpdateFailed(f"Unexpected error: {err}")
 
     async def _track_model_accuracy(self, processed_data: dict) -> None:
-        """Track accuracy of each model against reference temperature entity.
+        """Track accuracy of each model against the configured reference entities.
 
-        Fires an event for each model comparing forecast temperature vs actual.
-        Home Assistant will record this in history for later analysis.
+        Forecasts of every evaluated lead time are archived; forecasts valid in
+        the current hour are scored against the reference values and added to
+        the rolling accuracy ring buffers. An event is still fired for the
+        temperature of the current hour so the comparison also shows up in
+        Home Assistant history.
         """
         try:
-            # Ziskej reference_temperature_entity z config entry options
-            reference_entity = None
-            for entry in self.hass.config_entries.async_entries(DOMAIN):
-                if entry.data.get(CONF_STATION) == self.station:
-                    # Hledej v options (nastavení integrací)
-                    reference_entity = entry.options.get("reference_temperature_entity")
-                    break
+            # Ziskej reference entity z config entry options (nenastavené = NaN)
+            reference = array("d")
+            configured = False
+            for variable, (_, option) in ACCURACY_VARIABLES.items():
+                reference_entity = self._entry.options.get(option)
+                if reference_entity:
+                    configured = True
+                    reference.append(
+                        reference_value(self.hass.states.get(reference_entity), variable)
+                    )
+                else:
+                    reference.append(math.nan)
 
-            if not reference_entity:
-                _LOGGER.debug("No reference_temperature_entity configured for accuracy tracking")
+            if not configured:
+                _LOGGER.debug("No reference entities configured for accuracy tracking")
                 return
 
-            # Ziskej aktuální teplotu z reference entity
-            ref_entity_state = self.hass.states.get(reference_entity)
-            if not ref_entity_state or not ref_entity_state.state:
-                _LOGGER.debug(f"Reference entity {reference_entity} has no state")
-                return
+            # Fallback modely jsou jen kopie MASTER
+            tables = {
+                model_name: model_data["hourly"]
+                for model_name, model_data in processed_data["models"].items()
+                if model_data.get("hourly") and not model_data.get("fallback_of")
+            }
 
-            try:
-                actual_temp = float(ref_entity_state.state)
-            except (ValueError, TypeError):
-                _LOGGER.debug(f"Reference entity {reference_entity} state is not a number: {ref_entity_state.state}")
-                return
+            errors = await self.accuracy.async_evaluate(tables, reference, time.time())
 
-            # Pro každý model vypočítej chybu (absolutní diference)
-            for model_name, model_data in processed_data["models"].items():
-                forecast_data = model_data.get("data", [])
-                if not forecast_data:
+            # Vyslij event pro zaznamenání v HA history (teplota, aktuální hodina)
+            actual_temp = reference[VARIABLES.index("temperature")]
+            for model_name, variable, horizon, error in errors:
+                if variable != "temperature" or horizon != 0:
                     continue
+                forecast_temp = actual_temp + error
+                self.hass.bus.async_fire(
+                    "pocasimeteo_accuracy_update",
+                    {
+                        "model": model_name,
+                        "station": self.station,
+                        "reference_entity": self._entry.options.get(
+                            CONF_REFERENCE_TEMPERATURE_ENTITY
+                        ),
+                        "actual_temperature": actual_temp,
+                        "forecast_temperature": round(forecast_temp, 2),
+                        "absolute_error": abs(error),
+                        "timestamp": datetime.now(PRAGUE_TIMEZONE).isoformat()
+                    }
+                )
 
-                # Vezmi teplotu z prvního forecastu (nejbližší budoucnost)
-                first_forecast = forecast_data[0] if isinstance(forecast_data, list) else forecast_data
-
-                if isinstance(first_forecast, dict):
-                    try:
-                        forecast_temp = float(first_forecast.get("teplota", 0))
-                    except (ValueError, TypeError):
-                        continue
-
-                    # Vypočítej absolutní chybu
-                    error = abs(forecast_temp - actual_temp)
-
-                    # Vyslij event pro zaznamenání v HA history
-                    self.hass.bus.async_fire(
-                        "pocasimeteo_accuracy_update",
-                        {
-                            "model": model_name,
-                            "station": self.station,
-                            "reference_entity": reference_entity,
-                            "actual_temperature": actual_temp,
-                            "forecast_temperature": forecast_temp,
-                            "absolute_error": error,
-                            "timestamp": datetime.now(PRAGUE_TIMEZONE).isoformat()
-                        }
-                    )
+                _LOGGER.debug(
+                    f"Model {model_name}: actual={actual_temp}°C, forecast={forecast_temp:.1f}°C, error={error:.1f}°C"
+                )
 
-                    _LOGGER.debug(
-                        f"Model {model_name}: actual={actual_temp}°C, forecast={forecast_temp}°C, error={error:.1f}°C"
-                    )
+            _LOGGER.debug(f"Scored {len(errors)} archived forecasts for {self.station}")
 
         except Exception as err:
             _LOGGER.debug(f"Error tracking model accuracy: {err}", exc_info=True)
@@ -0,0 +1,58 @@
+"""Diagnostics support for PočasíMeteo."""
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import PocasimeteoDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: PocasimeteoDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    models = {}
+    if coordinator.data:
+        for model_name, model_data in coordinator.data.get("models", {}).items():
+            models[model_name] = {
+                "last_update": model_data.get("last_update"),
+                "hourly_items": len(model_data.get("hourly", ())),
+                "daily_items": len(model_data.get("daily", ())),
+                "data_stale": model_data.get("data_stale"),
+                "data_age_minutes": model_data.get("data_age_minutes"),
+                "fallback_of": model_data.get("fallback_of"),
+                "generation": model_data.get("generation"),
+            }
+            if "weights" in model_data:
+                models[model_name]["sources"] = model_data.get("sources")
+                models[model_name]["weights"] = model_data["weights"]
+
+    matrix = {}
+    if coordinator.data and coordinator.data.get("matrix") is not None:
+        model_matrix = coordinator.data["matrix"]
+        matrix = {
+            "models": list(model_matrix.models),
+            "hours": len(model_matrix),
+            "cells": len(model_matrix.mask),
+            "missing_cells": model_matrix.mask.count(0),
+        }
+
+    return {
+        "station": coordinator.station,
+        "options": dict(entry.options),
+        "last_update_success": coordinator.last_update_success,
+        "generation": coordinator.data.get("generation") if coordinator.data else None,
+        "changed_models": sorted(coordinator.data.get("changed_models", ())) if coordinator.data else [],
+        "models": models,
+        "matrix": matrix,
+        "http_cache": coordinator.http_cache_info(),
+        "layouts": coordinator.layout_info(),
+        "stats": dict(coordinator.stats),
+        "instrumentation": {
+            "enabled": coordinator.instrumentation.enabled,
+            "timings": coordinator.instrumentation.as_dict(),
+        },
+    }
@@ -0,0 +1,300 @@
+"""Accuracy-weighted ensemble of PočasíMeteo models (virtual model BEST).
+
+All models are aligned on the time grid of a reference model and blended
+column by column: every model contributes with weight 1 / MAE² of its recent
+forecast error for that variable and lead time. Models without enough
+measured samples are left out; when no model has been measured yet for a
+variable and lead time, the models are averaged with equal weights.
+"""
+import logging
+import math
+from array import array
+from bisect import bisect_right
+
+from .const import (
+    ACCURACY_CIRCULAR_VARIABLES,
+    ACCURACY_HORIZONS,
+    ACCURACY_VARIABLES,
+    ENSEMBLE_MAE_FLOOR,
+    ENSEMBLE_MIN_SAMPLES,
+    ENSEMBLE_SKILL_WINDOW,
+)
+from .forecast import (
+    DAILY_ICON_FIELD,
+    DAILY_NUMERIC_FIELDS,
+    DAILY_TIME_FIELD,
+    HOURLY_ICON_FIELD,
+    HOURLY_NUMERIC_FIELDS,
+    HOURLY_TIME_FIELD,
+    ForecastTable,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_NAN = math.nan
+
+# Sloupec API -> veličina, podle jejíž přesnosti se modely váží
+HOURLY_SKILL = {field: variable for variable, (field, _) in ACCURACY_VARIABLES.items()}
+DAILY_SKILL = {
+    "Tmax": "temperature",
+    "Tmin": "temperature",
+    "S_den": "rainfall",
+    "Vmax": "wind",
+    "VNmax": "wind_gust",
+}
+# Sloupce bez vlastního vyhodnocení (oblačnost, ikona, ...) se váží podle teploty
+SKILL_FALLBACK_VARIABLE = "temperature"
+
+# Sloupce ve stupních - průměrují se jako vektory
+CIRCULAR_FIELDS = frozenset(ACCURACY_VARIABLES[variable][0] for variable in ACCURACY_CIRCULAR_VARIABLES)
+
+# Směr větru slovně (VS) se odvozuje ze smíšeného směru ve stupních (VSS)
+WIND_DIRECTION_TEXT_FIELD = "VS"
+WIND_DIRECTION_FIELD = "VSS"
+COMPASS_POINTS = ("S", "SV", "V", "JV", "J", "JZ", "Z", "SZ")
+
+# Denní předpověď platí pro celý den - předstih se počítá k poledni
+DAILY_LEAD_OFFSET = 12 * 3600
+
+
+def model_weights(summary: dict, models: list[str], variable: str) -> list[list[float]]:
+    """Return weights[horizon index][model index] of a variable."""
+    weights = []
+    for horizon in ACCURACY_HORIZONS:
+        row = []
+        for model in models:
+            stats = (
+                summary.get(model, {}).get(variable, {}).get(horizon, {}).get(ENSEMBLE_SKILL_WINDOW, {})
+            )
+            mae = stats.get("mae")
+            if mae is None or stats.get("samples", 0) < ENSEMBLE_MIN_SAMPLES:
+                row.append(0.0)
+            else:
+                row.append(1.0 / max(mae, ENSEMBLE_MAE_FLOOR) ** 2)
+        if not any(row):
+            # Zatím bez měření - prostý průměr
+            row = [1.0] * len(models)
+        weights.append(row)
+    return weights
+
+
+def skill_signature(summary: dict) -> tuple:
+    """Return the measured MAE the blend weights depend on, to detect weight changes."""
+    return tuple(
+        (model, variable, horizon, stats["mae"])
+        for model, variables in sorted(summary.items())
+        for variable, horizons in sorted(variables.items())
+        for horizon, windows in sorted(horizons.items())
+        if (stats := windows.get(ENSEMBLE_SKILL_WINDOW, {})).get("mae") is not None
+        and stats.get("samples", 0) >= ENSEMBLE_MIN_SAMPLES
+    )
+
+
+def horizon_indexes(times: array, now: float, offset: float = 0.0) -> list[int]:
+    """Return the index of the evaluated horizon covering each row's lead time."""
+    last = len(ACCURACY_HORIZONS) - 1
+    return [
+        min(max(bisect_right(ACCURACY_HORIZONS, (timestamp + offset - now) / 3600) - 1, 0), last)
+        for timestamp in times
+    ]
+
+
+def align(grid: array, table: ForecastTable) -> list[int]:
+    """Return the row of table at every grid time (-1 = missing)."""
+    rows = {timestamp: index for index, timestamp in enumerate(table.times)}
+    return [rows.get(timestamp, -1) for timestamp in grid]
+
+
+def _weighted_sums(
+    columns: list, alignments: list, horizons: list[int], weights: list, transform=None
+) -> tuple[array, array]:
+    """Return per-row sums of weight * value and of weights over all models."""
+    size = len(horizons)
+    totals = array("d", bytes(8 * size))
+    weight_sums = array("d", bytes(8 * size))
+    for model_index, (column, rows) in enumerate(zip(columns, alignments)):
+        if column is None:
+            continue
+        for index, (row, horizon) in enumerate(zip(rows, horizons)):
+            if row < 0:
+                continue
+            value = column[row]
+            if value != value:
+                continue
+            weight = weights[horizon][model_index]
+            if not weight:
+                continue
+            totals[index] += weight * (value if transform is None else transform(value))
+            weight_sums[index] += weight
+    return totals, weight_sums
+
+
+def blend_column(
+    columns: list, alignments: list, horizons: list[int], weights: list, circular: bool = False
+) -> array:
+    """Blend one numeric column of all models (NaN where no model has a value)."""
+    if not circular:
+        totals, weight_sums = _weighted_sums(columns, alignments, horizons, weights)
+        return array(
+            "d", (total / weight if weight else _NAN for total, weight in zip(totals, weight_sums))
+        )
+
+    # Směr jako jednotkový vektor - průměr 350° a 10° je 0°, ne 180°
+    sines, weight_sums = _weighted_sums(
+        columns, alignments, horizons, weights, lambda value: math.sin(math.radians(value))
+    )
+    cosines, _ = _weighted_sums(
+        columns, alignments, horizons, weights, lambda value: math.cos(math.radians(value))
+    )
+    return array(
+        "d",
+        (
+            math.degrees(math.atan2(sine, cosine)) % 360.0 if weight else _NAN
+            for sine, cosine, weight in zip(sines, cosines, weight_sums)
+        ),
+    )
+
+
+def pick_text(
+    texts: list, alignments: list, horizons: list[int], weights: list
+) -> list[str | None]:
+    """Take a text value (icon) from the model with the highest weight in each row."""
+    result = []
+    for index, horizon in enumerate(horizons):
+        best, best_weight = None, -1.0
+        for model_index, (values, rows) in enumerate(zip(texts, alignments)):
+            row = rows[index]
+            if values is None or row < 0 or values[row] is None:
+                continue
+            weight = weights[horizon][model_index]
+            if weight > best_weight:
+                best, best_weight = values[row], weight
+        result.append(best)
+    return result
+
+
+def compass_point(degrees: float) -> str | None:
+    """Return the Czech compass point (S, SV, V, ...) of a direction in degrees."""
+    if degrees != degrees:
+        return None
+    return COMPASS_POINTS[int((degrees + 22.5) // 45) % len(COMPASS_POINTS)]
+
+
+def blend_table(
+    reference: ForecastTable,
+    tables: list[ForecastTable],
+    models: list[str],
+    summary: dict,
+    now: float,
+    time_field: str,
+    icon_field: str,
+    numeric_fields: tuple[str, ...],
+    skill: dict[str, str],
+    offset: float = 0.0,
+) -> tuple[ForecastTable, dict[str, list]]:
+    """Blend tables of all models on the time grid of the reference table.
+
+    Returns the blended table and the weights used for every variable.
+    """
+    grid = reference.times
+    alignments = [align(grid, table) for table in tables]
+    horizons = horizon_indexes(grid, now, offset)
+
+    weights_by_variable: dict[str, list] = {}
+
+    def weights_for(variable: str) -> list:
+        weights = weights_by_variable.get(variable)
+        if weights is None:
+            weights = weights_by_variable[variable] = model_weights(summary, models, variable)
+        return weights
+
+    numeric = {}
+    integral = set()
+    for field in numeric_fields:
+        column = blend_column(
+            [table.column(field) for table in tables],
+            alignments,
+            horizons,
+            weights_for(skill.get(field, SKILL_FALLBACK_VARIABLE)),
+            circular=field in CIRCULAR_FIELDS,
+        )
+        # Celočíselné sloupce (vlhkost, oblačnost, směr) zůstanou celočíselné
+        if field in CIRCULAR_FIELDS:
+            integral.add(field)
+            column = array("d", (value if value != value else round(value) % 360 for value in column))
+        elif all(table.is_integral(field) for table in tables):
+            integral.add(field)
+            column = array("d", (value if value != value else round(value) for value in column))
+        else:
+            column = array("d", (value if value != value else round(value, 1) for value in column))
+        numeric[field] = column
+
+    fallback_weights = weights_for(SKILL_FALLBACK_VARIABLE)
+    text = {}
+    for field in reference.text_fields():
+        if field == WIND_DIRECTION_TEXT_FIELD and WIND_DIRECTION_FIELD in numeric:
+            text[field] = [compass_point(value) for value in numeric[WIND_DIRECTION_FIELD]]
+        else:
+            text[field] = pick_text(
+                [table.texts(field) for table in tables], alignments, horizons, fallback_weights
+            )
+
+    table = ForecastTable.from_columns(
+        time_field, icon_field, array("d", grid), list(reference.iso), numeric, integral, text
+    )
+    return table, weights_by_variable
+
+
+def blend_models(models: dict[str, dict], summary: dict, now: float) -> dict | None:
+    """Blend data of the given models into data of the virtual model.
+
+    models maps model name -> model data with hourly and daily tables; the
+    first model (MASTER when available) provides the time grid.
+    """
+    names = [name for name, model_data in models.items() if len(model_data.get("hourly", ()))]
+    if not names:
+        return None
+    reference_name = "MASTER" if "MASTER" in names else names[0]
+    reference = models[reference_name]
+
+    hourly, weights = blend_table(
+        reference["hourly"],
+        [models[name]["hourly"] for name in names],
+        names,
+        summary,
+        now,
+        HOURLY_TIME_FIELD,
+        HOURLY_ICON_FIELD,
+        HOURLY_NUMERIC_FIELDS,
+        HOURLY_SKILL,
+    )
+    daily, _ = blend_table(
+        reference["daily"],
+        [models[name]["daily"] for name in names],
+        names,
+        summary,
+        now,
+        DAILY_TIME_FIELD,
+        DAILY_ICON_FIELD,
+        DAILY_NUMERIC_FIELDS,
+        DAILY_SKILL,
+        DAILY_LEAD_OFFSET,
+    )
+
+    # Podíly modelů pro diagnostiku: {veličina: {předstih: {model: podíl}}}
+    shares = {}
+    for variable, rows in weights.items():
+        shares[variable] = {}
+        for horizon, row in zip(ACCURACY_HORIZONS, rows):
+            total = sum(row)
+            shares[variable][horizon] = {
+                name: round(weight / total, 3) for name, weight in zip(names, row) if weight
+            }
+
+    return {
+        "hourly": hourly,
+        "daily": daily,
+        "last_update": reference.get("last_update", ""),
+        "sources": names,
+        "weights": shares,
+    }
@@ -0,0 +1,266 @@
+"""Columnar forecast store for PočasíMeteo.
+
+Raw API records (list of dicts with string timestamps) are normalized once per
+update into typed arrays, so entities can read values by index instead of
+parsing strings on every state write.
+"""
+import logging
+import math
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+from .const import CONDITION_MAP, PRAGUE_TIMEZONE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Formát času v API ("Dat", "Dat_dne"), např. "11/19/25 14:00:00"
+API_DATETIME_FORMAT = "%m/%d/%y %H:%M:%S"
+
+# Sloupce hodinové předpovědi (data)
+HOURLY_TIME_FIELD = "Dat"
+HOURLY_ICON_FIELD = "Ik"
+HOURLY_NUMERIC_FIELDS = ("Te", "S", "V", "VN", "VSS", "Vl", "Tl", "O", "SP", "SK")
+HOURLY_TEXT_FIELDS = ("Ik", "VS")
+
+# Sloupce denní předpovědi (data_dne)
+DAILY_TIME_FIELD = "Dat_dne"
+DAILY_ICON_FIELD = "IkD"
+DAILY_NUMERIC_FIELDS = ("Tmax", "Tmin", "S_den", "Vmax", "VNmax")
+DAILY_TEXT_FIELDS = ("IkD",)
+
+_NAN = math.nan
+
+
+def parse_api_datetime(value) -> datetime | None:
+    """Parse API timestamp 'MM/DD/YY HH:MM:SS' into a naive local datetime."""
+    if not isinstance(value, str):
+        return None
+
+    # Rychlá cesta bez strptime pro standardní formát
+    if len(value) == 17 and value[2] == "/" and value[5] == "/" and value[8] == " ":
+        try:
+            return datetime(
+                2000 + int(value[6:8]),
+                int(value[0:2]),
+                int(value[3:5]),
+                int(value[9:11]),
+                int(value[12:14]),
+                int(value[15:17]),
+            )
+        except ValueError:
+            pass
+
+    try:
+        return datetime.strptime(value.strip(), API_DATETIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def icon_condition(icon: str | None) -> str:
+    """Map raw API icon ("01d.png", "46.png") to a Home Assistant condition."""
+    if not icon:
+        return "unknown"
+    return CONDITION_MAP.get(icon.split(".")[0][:2], "unknown")
+
+
+class ForecastTable:
+    """Forecast rows (hourly or daily) stored column by column.
+
+    Numeric fields are kept in typed arrays (NaN marks a missing value), times as
+    epoch seconds, icon codes and conditions as interned strings. Tables are
+    shared between models (MASTER fallback) and data generations, so they must
+    be treated as read-only.
+    """
+
+    __slots__ = (
+        "time_field",
+        "icon_field",
+        "times",
+        "iso",
+        "conditions",
+        "_numeric",
+        "_integral",
+        "_text",
+    )
+
+    def __init__(
+        self,
+        rows: list,
+        time_field: str,
+        icon_field: str,
+        numeric_fields: tuple[str, ...],
+        text_fields: tuple[str, ...],
+    ) -> None:
+        """Normalize raw API rows."""
+        self.time_field = time_field
+        self.icon_field = icon_field
+
+        # Jen řádky s platným časem, seřazené podle času
+        parsed = []
+        for row in rows if isinstance(rows, list) else ():
+            if not isinstance(row, dict):
+                continue
+            dt = parse_api_datetime(row.get(time_field))
+            if dt is None:
+                _LOGGER.debug(f"Skipping row with invalid {time_field}: {row.get(time_field)}")
+                continue
+            parsed.append((dt, row))
+        parsed.sort(key=lambda item: item[0])
+
+        self.times = array("d", (dt.replace(tzinfo=PRAGUE_TIMEZONE).timestamp() for dt, _ in parsed))
+        self.iso = [dt.isoformat() for dt, _ in parsed]
+
+        self._numeric: dict[str, array] = {}
+        self._integral: set[str] = set()
+        for field in numeric_fields:
+            column = array("d")
+            integral = True
+            for _, row in parsed:
+                value = row.get(field)
+                if value is None or isinstance(value, bool):
+                    column.append(_NAN)
+                elif isinstance(value, int):
+                    column.append(value)
+                else:
+                    try:
+                        column.append(float(value))
+                    except (TypeError, ValueError):
+                        column.append(_NAN)
+                    integral = False
+            self._numeric[field] = column
+            if integral:
+                self._integral.add(field)
+
+        intern = sys.intern
+        self._text: dict[str, list] = {}
+        for field in text_fields:
+            self._text[field] = [
+                intern(value) if isinstance(value, str) else None
+                for value in (row.get(field) for _, row in parsed)
+            ]
+
+        icons = self._text.get(icon_field) or [None] * len(parsed)
+        self.conditions = [intern(icon_condition(icon)) for icon in icons]
+
+    @classmethod
+    def from_columns(
+        cls,
+        time_field: str,
+        icon_field: str,
+        times: array,
+        iso: list[str],
+        numeric: dict[str, array],
+        integral: set[str],
+        text: dict[str, list],
+    ) -> "ForecastTable":
+        """Build a table directly from already normalized columns."""
+        table = cls.__new__(cls)
+        table.time_field = time_field
+        table.icon_field = icon_field
+        table.times = times
+        table.iso = iso
+        table._numeric = numeric
+        table._integral = integral
+        intern = sys.intern
+        table._text = {
+            field: [intern(value) if isinstance(value, str) else None for value in values]
+            for field, values in text.items()
+        }
+        icons = table._text.get(icon_field) or [None] * len(times)
+        table.conditions = [intern(icon_condition(icon)) for icon in icons]
+        return table
+
+    def __len__(self) -> int:
+        """Return number of rows."""
+        return len(self.times)
+
+    def nearest_index(self, timestamp: float) -> tuple[int, float, float] | None:
+        """Find the row nearest to timestamp using bisection on the sorted times.
+
+        Returns (index, valid_from, valid_until) - the same row stays the nearest
+        one for every timestamp in [valid_from, valid_until).
+        """
+        times = self.times
+        count = len(times)
+        if not count:
+            return None
+
+        position = bisect_left(times, timestamp)
+        if position == 0:
+            index = 0
+        elif position == count:
+            index = count - 1
+        elif timestamp - times[position - 1] <= times[position] - timestamp:
+            index = position - 1
+        else:
+            index = position
+
+        # Hranice platnosti jsou v polovině mezi sousedními řádky
+        valid_from = (times[index - 1] + times[index]) / 2 if index > 0 else -math.inf
+        valid_until = (times[index] + times[index + 1]) / 2 if index + 1 < count else math.inf
+        return index, valid_from, valid_until
+
+    def value(self, field: str, index: int, default=None):
+        """Return the value of a field in a row, or default if missing."""
+        column = self._numeric.get(field)
+        if column is not None:
+            value = column[index]
+            if value != value:  # NaN
+                return default
+            return int(value) if field in self._integral else value
+
+        texts = self._text.get(field)
+        if texts is not None:
+            value = texts[index]
+            return default if value is None else value
+
+        return default
+
+    def column(self, field: str) -> array | None:
+        """Return the raw numeric column of a field (NaN = missing)."""
+        return self._numeric.get(field)
+
+    def is_integral(self, field: str) -> bool:
+        """Return True if a numeric field holds only whole numbers."""
+        return field in self._integral
+
+    def texts(self, field: str) -> list | None:
+        """Return the raw text column of a field (None = missing)."""
+        return self._text.get(field)
+
+    def text_fields(self) -> tuple[str, ...]:
+        """Return names of the text columns."""
+        return tuple(self._text)
+
+    def record(self, index: int) -> dict:
+        """Rebuild the raw API record of a row (lazily, on demand)."""
+        dt = datetime.fromtimestamp(self.times[index], PRAGUE_TIMEZONE)
+        record = {self.time_field: dt.strftime(API_DATETIME_FORMAT)}
+        for field in self._numeric:
+            value = self.value(field, index)
+            if value is not None:
+                record[field] = value
+        for field, texts in self._text.items():
+            if texts[index] is not None:
+                record[field] = texts[index]
+        return record
+
+    def records(self) -> list[dict]:
+        """Rebuild all raw API records."""
+        return [self.record(index) for index in range(len(self))]
+
+
+def hourly_table(rows: list) -> ForecastTable:
+    """Normalize raw hourly API rows ("data")."""
+    return ForecastTable(
+        rows, HOURLY_TIME_FIELD, HOURLY_ICON_FIELD, HOURLY_NUMERIC_FIELDS, HOURLY_TEXT_FIELDS
+    )
+
+
+def daily_table(rows: list) -> ForecastTable:
+    """Normalize raw daily API rows ("data_dne")."""
+    return ForecastTable(
+        rows, DAILY_TIME_FIELD, DAILY_ICON_FIELD, DAILY_NUMERIC_FIELDS, DAILY_TEXT_FIELDS
+    )
@@ -0,0 +1,80 @@
+"""Czech public holiday calendar.
+
+Holidays of a year (fixed dates and Easter computed by the Gregorian
+computus) are built once into a read-only date -> name index, so lookups on
+the attribute hot path are a single dict access.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from types import MappingProxyType
+from typing import Mapping
+
+# Státní svátky s pevným datem (měsíc, den, název)
+FIXED_HOLIDAYS = (
+    (1, 1, "Nový rok"),
+    (5, 1, "Svátek práce"),
+    (5, 8, "Den vítězství"),
+    (7, 5, "Den slovanských věrozvěstů"),
+    (7, 6, "Upálení Jana Husa"),
+    (9, 28, "Den české státnosti"),
+    (10, 28, "Vznik samostatného československého státu"),
+    (11, 17, "Den boje za svobodu a demokracii"),
+    (12, 24, "Štědrý den"),
+    (12, 25, "Boží hod"),
+    (12, 26, "Den svatého Štěpána"),
+)
+
+# Velikonoční svátky (posun ve dnech od Velikonoční neděle, název)
+EASTER_HOLIDAYS = (
+    (-2, "Velký pátek"),
+    (0, "Velikonoční neděle"),
+    (1, "Velikonoční pondělí"),
+)
+
+# Rok -> index datum -> název (vytváří se jednou za rok)
+_YEARS: dict[int, Mapping[date, str]] = {}
+
+
+def easter_sunday(year: int) -> date:
+    """Return the date of (Western) Easter Sunday by the anonymous Gregorian computus."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def holidays_of_year(year: int) -> Mapping[date, str]:
+    """Return the read-only index of holidays of a year, ordered by date."""
+    if (index := _YEARS.get(year)) is None:
+        easter = easter_sunday(year)
+        holidays = {date(year, month, day): name for month, day, name in FIXED_HOLIDAYS}
+        holidays.update({easter + timedelta(days=offset): name for offset, name in EASTER_HOLIDAYS})
+        index = _YEARS[year] = MappingProxyType(dict(sorted(holidays.items())))
+    return index
+
+
+def holiday_name(day: date) -> str | None:
+    """Return the name of the holiday on the day, or None."""
+    index = _YEARS.get(day.year)
+    if index is None:
+        index = holidays_of_year(day.year)
+    return index.get(day)
+
+
+def upcoming_holidays(start: date, days: int) -> list[tuple[date, str]]:
+    """Return (date, name) of holidays from start (inclusive) for the given number of days."""
+    end = start + timedelta(days=days)
+    return [
+        (day, name)
+        for year in range(start.year, end.year + 1)
+        for day, name in holidays_of_year(year).items()
+        if start <= day < end
+    ]
@@ -0,0 +1,83 @@
+"""Per-stage timings of the coordinator and entity hot paths.
+
+Timings are only measured when instrumentation is enabled in the options;
+otherwise timer() hands out a shared no-op context manager, so instrumented
+code costs one attribute lookup and an empty with block.
+"""
+from __future__ import annotations
+
+from contextlib import nullcontext
+from time import perf_counter
+
+# Sdílený no-op context manager (nullcontext lze použít opakovaně)
+_DISABLED = nullcontext()
+
+
+class _StageTimer:
+    """Context manager measuring one run of a stage."""
+
+    __slots__ = ("_instrumentation", "_stage", "_started")
+
+    def __init__(self, instrumentation: Instrumentation, stage: str) -> None:
+        self._instrumentation = instrumentation
+        self._stage = stage
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._instrumentation.record(self._stage, perf_counter() - self._started)
+
+
+class Instrumentation:
+    """Collect count, last, max and total duration of named stages."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        """Initialize."""
+        self.enabled = enabled
+        # stage -> [počet, poslední, maximum, součet] v sekundách
+        self._stages: dict[str, list] = {}
+
+    def timer(self, stage: str):
+        """Return a context manager timing the stage (no-op when disabled)."""
+        if not self.enabled:
+            return _DISABLED
+        return _StageTimer(self, stage)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record one run of a stage."""
+        if not self.enabled:
+            return
+        timing = self._stages.get(stage)
+        if timing is None:
+            self._stages[stage] = [1, seconds, seconds, seconds]
+            return
+        timing[0] += 1
+        timing[1] = seconds
+        if seconds > timing[2]:
+            timing[2] = seconds
+        timing[3] += seconds
+
+    def last_ms(self, stage: str) -> float | None:
+        """Return the last duration of a stage in milliseconds."""
+        timing = self._stages.get(stage)
+        return round(timing[1] * 1000, 3) if timing else None
+
+    def as_dict(self, prefix: str = "") -> dict:
+        """Return timings in milliseconds of all stages starting with prefix."""
+        return {
+            stage: {
+                "count": count,
+                "last_ms": round(last * 1000, 3),
+                "max_ms": round(maximum * 1000, 3),
+                "mean_ms": round(total / count * 1000, 3),
+                "total_ms": round(total * 1000, 3),
+            }
+            for stage, (count, last, maximum, total) in sorted(self._stages.items())
+            if stage.startswith(prefix)
+        }
+
+    def reset(self) -> None:
+        """Forget all recorded timings."""
+        self._stages.clear()
@@ -0,0 +1,277 @@
+"""Streaming, pruning JSON parser for PočasíMeteo model files.
+
+Model files are parsed chunk by chunk as they arrive and only the parts the
+integration uses are materialized: PosledniAktualizace, nazevModelu and the
+data/data_dne rows, capped to the retained forecast horizon. Everything else
+is tokenized and dropped, so memory does not grow with the size of the file.
+
+The grammar is checked for the whole document, including dropped parts, and
+malformed input raises ValueError like json.loads would.
+"""
+import codecs
+import json
+import re
+
+from .const import FORECAST_DAILY_LIMIT, FORECAST_HOURLY_LIMIT
+
+# Klíče, které se zachovají v libovolné hloubce dokumentu (+ název modelu)
+KEEP_KEYS = frozenset(("data", "data_dne", "PosledniAktualizace", "nazevModelu"))
+
+# Maximální počet prvků zachovaných v polích podle klíče
+ARRAY_LIMITS = {
+    "data": FORECAST_HOURLY_LIMIT,
+    "data_dne": FORECAST_DAILY_LIMIT,
+}
+
+# Ochrana proti nekonečnému bufferu u poškozených dat (jeden token nesmí být větší)
+MAX_PENDING_CHARS = 1 << 20
+
+_TOKEN_RE = re.compile(
+    r'[ \t\n\r]*(?:"((?:[^"\\\x00-\x1f]++|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*+)"'  # 1: řetězec
+    r"|([{}\[\]:,])"  # 2: interpunkce
+    r"|(-?(?:0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?)"  # 3: číslo (4, 5: desetinná část, exponent)
+    r"|(true|false|null))"  # 6: literál
+)
+# Celý "plochý" objekt (řádek předpovědi bez vnořených struktur) včetně kontroly
+# gramatiky - zachovaný řádek parsuje json v C, zahozený se jen přeskočí
+_STRING = r'"(?:[^"\\\x00-\x1f]++|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*+"'
+_SCALAR = rf"(?:{_STRING}|-?(?:0|[1-9]\d*+)(?:\.\d++)?(?:[eE][+-]?\d++)?|true|false|null)"
+_MEMBER = rf"[ \t\n\r]*+{_STRING}[ \t\n\r]*+:[ \t\n\r]*+{_SCALAR}[ \t\n\r]*+"
+_FLAT_OBJECT_RE = re.compile(rf"\{{(?:{_MEMBER}(?:,{_MEMBER})*+|[ \t\n\r]*+)\}}")
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_LITERALS = {"true": True, "false": False, "null": None}
+
+# Co smí v otevřeném objektu/poli následovat
+_KEY_OR_END, _KEY, _COLON, _VALUE, _VALUE_OR_END, _COMMA_OR_END = range(6)
+_EXPECTING = {
+    _KEY_OR_END: "property name enclosed in double quotes",
+    _KEY: "property name enclosed in double quotes",
+    _COLON: "':' delimiter",
+    _VALUE: "value",
+    _VALUE_OR_END: "value",
+    _COMMA_OR_END: "',' delimiter",
+}
+
+
+class _Frame:
+    """An open object or array."""
+
+    __slots__ = ("value", "is_dict", "key", "state", "keep_all", "limit", "rows", "dropped")
+
+    def __init__(self, value, is_dict: bool, keep_all: bool, limit: int | None, rows: bool) -> None:
+        self.value = value  # None = podstrom se zahazuje
+        self.is_dict = is_dict
+        self.key = None
+        self.state = _KEY_OR_END if is_dict else _VALUE_OR_END
+        self.keep_all = keep_all  # řádek předpovědi - zachovej všechny skalární hodnoty
+        self.limit = limit
+        self.rows = rows  # pole řádků předpovědi (data, data_dne)
+        self.dropped = 0
+
+
+class StreamingModelParser:
+    """Incrementally parse a model file, keeping only the forecast skeleton."""
+
+    def __init__(self, model_name: str, charset: str = "utf-8-sig") -> None:
+        """Initialize the parser (raises LookupError for an unknown charset)."""
+        self._keep_keys = KEEP_KEYS | {model_name}
+        self._decoder = codecs.getincrementaldecoder(charset)()
+        self._buffer = ""
+        self._stack: list[_Frame] = []
+        self._root = None
+        self._done = False
+        self._started = False
+        # PosledniAktualizace z kořene dokumentu, jakmile je přečtena
+        self.last_update: str | None = None
+        # Počet zahozených řádků nad limit (pro diagnostiku)
+        self.dropped_rows = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the response body."""
+        self._buffer += self._decoder.decode(chunk)
+        self._parse(final=False)
+
+    def close(self):
+        """Finish parsing and return the pruned document."""
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._parse(final=True)
+        if not self._done:
+            raise ValueError("Unexpected end of JSON document")
+        return self._root
+
+    def _parse(self, final: bool) -> None:
+        """Consume all complete tokens from the buffer."""
+        buffer = self._buffer
+        if not self._started:
+            # BOM může být v datech i když server hlásí charset utf-8
+            if not buffer:
+                return
+            buffer = buffer.lstrip("\ufeff")
+            self._started = True
+
+        length = len(buffer)
+        position = 0
+        match_token = _TOKEN_RE.match
+        stack = self._stack
+        while True:
+            match = match_token(buffer, position)
+            if match is None:
+                break
+
+            # Řádek předpovědi celý v bufferu - jedním voláním json.loads
+            if match.group(2) == "{" and stack and stack[-1].rows:
+                row = _FLAT_OBJECT_RE.match(buffer, match.start(2))
+                if row is not None:
+                    position = row.end()
+                    self._expect_value()
+                    parent, keep = self._keep(True)
+                    if keep:
+                        self._attach(parent, json.loads(row.group()))
+                    continue
+
+            end = match.end()
+            # Číslo na konci bufferu může pokračovat v dalším chunku ("12" -> "12.5")
+            if (
+                not final
+                and match.group(3) is not None
+                and (end == length or buffer[end] in ".eE")
+            ):
+                break
+            position = end
+            self._token(match)
+
+        rest = buffer[position:]
+        if rest and _WHITESPACE_RE.fullmatch(rest):
+            rest = ""
+        if rest and (final or len(rest) > MAX_PENDING_CHARS):
+            raise ValueError(f"Invalid JSON near: {rest[:40]!r}")
+        self._buffer = rest
+
+    def _token(self, match: re.Match) -> None:
+        """Process a single token."""
+        if self._done:
+            raise ValueError("Extra data after JSON document")
+
+        punct = match.group(2)
+        if punct is None:
+            string = match.group(1)
+            if string is not None:
+                if "\\" in string:
+                    string = json.loads(f'"{string}"')
+                frame = self._stack[-1] if self._stack else None
+                if frame is not None and frame.is_dict and frame.state <= _KEY:
+                    frame.key = string
+                    frame.state = _COLON
+                    return
+                self._value(string)
+            elif match.group(3) is not None:
+                number = match.group(3)
+                if match.group(4) is None and match.group(5) is None:
+                    self._value(int(number))
+                else:
+                    self._value(float(number))
+            else:
+                self._value(_LITERALS[match.group(6)])
+            return
+
+        if punct == "{" or punct == "[":
+            self._open(punct == "{")
+        elif punct == "}" or punct == "]":
+            self._close(punct)
+        elif not self._stack:
+            raise ValueError("Expecting value")
+        else:
+            frame = self._stack[-1]
+            if punct == ",":
+                if frame.state != _COMMA_OR_END:
+                    raise ValueError(f"Expecting {_EXPECTING[frame.state]}")
+                frame.state = _KEY if frame.is_dict else _VALUE
+            else:
+                # ":" jen odděluje klíč od hodnoty - klíč je již uložen
+                if frame.state != _COLON:
+                    raise ValueError(f"Expecting {_EXPECTING[frame.state]}")
+                frame.state = _VALUE
+
+    def _expect_value(self) -> None:
+        """Check that a value may follow in the open container."""
+        if not self._stack:
+            return
+        frame = self._stack[-1]
+        if frame.state != _VALUE and frame.state != _VALUE_OR_END:
+            raise ValueError(f"Expecting {_EXPECTING[frame.state]}")
+        frame.state = _COMMA_OR_END
+
+    def _close(self, punct: str) -> None:
+        """Handle the end of an object or array."""
+        if not self._stack or self._stack[-1].is_dict != (punct == "}"):
+            raise ValueError(f"Unexpected '{punct}'")
+        frame = self._stack[-1]
+        if frame.state != _COMMA_OR_END and frame.state != (
+            _KEY_OR_END if frame.is_dict else _VALUE_OR_END
+        ):
+            raise ValueError(f"Expecting {_EXPECTING[frame.state]}")
+        self._stack.pop()
+        self.dropped_rows += frame.dropped
+        if not self._stack:
+            self._done = True
+
+    def _keep(self, is_container: bool) -> tuple[_Frame | None, bool]:
+        """Decide whether the next value is kept; returns (parent, keep)."""
+        if not self._stack:
+            return None, True
+
+        parent = self._stack[-1]
+        if parent.value is None:
+            return parent, False
+        if parent.is_dict:
+            key = parent.key
+            return parent, key in self._keep_keys or (parent.keep_all and not is_container)
+        if parent.limit is not None and len(parent.value) >= parent.limit:
+            parent.dropped += 1
+            return parent, False
+        return parent, True
+
+    def _attach(self, parent: _Frame | None, value) -> None:
+        """Store a kept value in its parent container."""
+        if parent is None:
+            self._root = value
+        elif parent.is_dict:
+            parent.value[parent.key] = value
+        else:
+            parent.value.append(value)
+
+    def _value(self, value) -> None:
+        """Handle a scalar value."""
+        self._expect_value()
+        parent, keep = self._keep(False)
+        if parent is None:
+            self._root = value
+            self._done = True
+            return
+        if not keep:
+            return
+        self._attach(parent, value)
+        if (
+            parent.is_dict
+            and parent.key == "PosledniAktualizace"
+            and len(self._stack) == 1
+            and isinstance(value, str)
+        ):
+            self.last_update = value
+
+    def _open(self, is_dict: bool) -> None:
+        """Handle the start of an object or array."""
+        self._expect_value()
+        parent, keep = self._keep(True)
+        value = None
+        if keep:
+            value = {} if is_dict else []
+            self._attach(parent, value)
+
+        if is_dict:
+            # Objekt v poli data/data_dne je řádek (nebo obal modelu s vnořenými daty)
+            keep_all = parent is not None and not parent.is_dict and parent.rows
+            self._stack.append(_Frame(value, True, keep_all, None, False))
+        else:
+            key = parent.key if parent is not None and parent.is_dict else None
+            self._stack.append(_Frame(value, False, False, ARRAY_LIMITS.get(key), key in ARRAY_LIMITS))
@@ -0,0 +1,167 @@
+"""Payload layout detection for PočasíMeteo model files.
+
+Upstream has served the forecast in several layouts over time. Every layout
+has one specialized extractor; the layout a model file used last time is
+remembered, so extraction normally goes straight to the right extractor and
+full detection runs only when that fast path fails.
+"""
+import logging
+from collections import Counter, deque
+from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+# {"PosledniAktualizace": ..., "data": [řádky], "data_dne": [...]}
+LAYOUT_ROOT = "root"
+# {"data": [{"nazevModelu": model, "data": [řádky], "data_dne": [...]}, ...]}
+LAYOUT_NAMED_ARRAY = "named_array"
+# {"PosledniAktualizace": ..., "data": [{"data": [řádky], "data_dne": [...]}]}
+LAYOUT_NESTED = "nested"
+# {model: {"PosledniAktualizace": ..., "data": [řádky], "data_dne": [...]}}
+LAYOUT_NAMED_KEY = "named_key"
+
+# Počet uchovaných záznamů o změně formátu (pro diagnostiku)
+LAYOUT_DRIFT_HISTORY = 20
+
+
+def _is_container(item) -> bool:
+    """Return True if a list item wraps forecast rows instead of being a row."""
+    return isinstance(item, dict) and isinstance(item.get("data"), list)
+
+
+def _rows(container: dict) -> tuple[list, list] | None:
+    """Return (data, data_dne) of a container, unwrapping one level of nesting."""
+    data = container.get("data")
+    if not isinstance(data, list):
+        return None
+    data_dne = container.get("data_dne")
+    if not isinstance(data_dne, list):
+        data_dne = []
+
+    if data and isinstance(data[0], dict):
+        first = data[0]
+        if _is_container(first):
+            inner_dne = first.get("data_dne")
+            return first["data"], data_dne or (inner_dne if isinstance(inner_dne, list) else [])
+        if not data_dne and isinstance(first.get("data_dne"), list):
+            return data, first["data_dne"]
+
+    return data, data_dne
+
+
+def _result(rows: tuple[list, list], last_update) -> dict:
+    """Build the extracted model data."""
+    return {
+        "data": rows[0],
+        "data_dne": rows[1],
+        "last_update": last_update if isinstance(last_update, str) else "",
+    }
+
+
+def extract_root(doc: dict, model_name: str) -> dict | None:
+    """Extract rows stored directly in the document root."""
+    data = doc.get("data")
+    if not isinstance(data, list) or (data and _is_container(data[0])):
+        return None
+    return _result(_rows(doc), doc.get("PosledniAktualizace"))
+
+
+def extract_named_array(doc: dict, model_name: str) -> dict | None:
+    """Extract rows of the array item whose nazevModelu is the model."""
+    data = doc.get("data")
+    if not isinstance(data, list):
+        return None
+    for item in data:
+        if _is_container(item) and item.get("nazevModelu") == model_name:
+            return _result(
+                _rows(item), item.get("PosledniAktualizace") or doc.get("PosledniAktualizace")
+            )
+    return None
+
+
+def extract_nested(doc: dict, model_name: str) -> dict | None:
+    """Extract rows wrapped in the first item of the root data array."""
+    data = doc.get("data")
+    if not isinstance(data, list) or not data or not _is_container(data[0]):
+        return None
+    return _result(
+        _rows(doc), doc.get("PosledniAktualizace") or data[0].get("PosledniAktualizace")
+    )
+
+
+def extract_named_key(doc: dict, model_name: str) -> dict | None:
+    """Extract rows stored under a key with the model name."""
+    model_obj = doc.get(model_name)
+    if not isinstance(model_obj, dict):
+        return None
+    rows = _rows(model_obj)
+    if rows is None:
+        return None
+    return _result(rows, model_obj.get("PosledniAktualizace"))
+
+
+# Extraktory v pořadí, v jakém se zkouší při detekci
+EXTRACTORS = {
+    LAYOUT_ROOT: extract_root,
+    LAYOUT_NAMED_ARRAY: extract_named_array,
+    LAYOUT_NESTED: extract_nested,
+    LAYOUT_NAMED_KEY: extract_named_key,
+}
+
+
+def detect_layout(doc, model_name: str) -> tuple[str, dict] | None:
+    """Detect the layout of a document; returns (layout, extracted data)."""
+    if not isinstance(doc, dict):
+        return None
+    for layout, extractor in EXTRACTORS.items():
+        extracted = extractor(doc, model_name)
+        if extracted is not None:
+            return layout, extracted
+    return None
+
+
+class ModelLayoutCache:
+    """Remember the layout of every model file and report layout drift."""
+
+    def __init__(self, stats: Counter | None = None) -> None:
+        """Initialize the cache."""
+        self.layouts: dict[str, str] = {}
+        self.drift: deque = deque(maxlen=LAYOUT_DRIFT_HISTORY)
+        self._stats = stats if stats is not None else Counter()
+
+    def extract(self, doc, model_name: str) -> dict | None:
+        """Extract model data, using the remembered layout first."""
+        layout = self.layouts.get(model_name)
+        if layout is not None and isinstance(doc, dict):
+            extracted = EXTRACTORS[layout](doc, model_name)
+            if extracted is not None:
+                self._stats["layout_fast_path"] += 1
+                return extracted
+
+        self._stats["layout_detect"] += 1
+        detected = detect_layout(doc, model_name)
+        if detected is None:
+            _LOGGER.debug(f"Unknown payload layout for {model_name}")
+            return None
+
+        new_layout, extracted = detected
+        if layout is not None and layout != new_layout:
+            self._stats["layout_drift"] += 1
+            self.drift.append(
+                {
+                    "model": model_name,
+                    "from": layout,
+                    "to": new_layout,
+                    "time": datetime.now().isoformat(),
+                }
+            )
+            _LOGGER.warning(f"Payload layout of {model_name} changed: {layout} -> {new_layout}")
+        else:
+            _LOGGER.debug(f"Payload layout of {model_name}: {new_layout}")
+
+        self.layouts[model_name] = new_layout
+        return extracted
+
+    def as_dict(self) -> dict:
+        """Return remembered layouts and drift history for diagnostics."""
+        return {"models": dict(self.layouts), "drift": list(self.drift)}
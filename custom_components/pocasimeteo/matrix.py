@@ -0,0 +1,150 @@
+"""Time-aligned forecast matrix of all PočasíMeteo models.
+
+Hourly forecasts of all models are placed on one common UTC hour grid in a
+flat (model x hour x variable) array with an explicit mask of present values.
+Cross-model statistics (min, max, median, spread) are computed once per
+variable and cached, so questions like "does any model show rain in the next
+six hours" are simple reductions over the matrix.
+"""
+import logging
+import math
+import statistics
+from array import array
+
+from .forecast import HOURLY_NUMERIC_FIELDS, ForecastTable
+
+_LOGGER = logging.getLogger(__name__)
+
+_NAN = math.nan
+
+# Veličiny matice: čitelný název -> sloupec API
+MATRIX_VARIABLES = {
+    "temperature": "Te",
+    "precipitation": "S",
+    "wind_speed": "V",
+    "wind_gust": "VN",
+    "wind_bearing": "VSS",
+    "humidity": "Vl",
+    "pressure": "Tl",
+    "cloudiness": "O",
+    "precipitation_probability": "SP",
+    "snow": "SK",
+}
+
+# Směr ve stupních - min/max/medián mezi modely nemají smysl
+STATS_EXCLUDED_FIELDS = frozenset(("VSS",))
+
+
+class ModelMatrix:
+    """Forecasts of several models aligned on a common UTC hour grid.
+
+    values[(model * hours + hour) * variables + variable] holds the forecast
+    (NaN = missing) and mask marks which cells a model actually provided.
+    The matrix is shared between data generations and must be treated as
+    read-only.
+    """
+
+    __slots__ = ("models", "fields", "grid", "values", "mask", "_start", "_stats")
+
+    def __init__(
+        self, tables: dict[str, ForecastTable], fields: tuple[str, ...] = HOURLY_NUMERIC_FIELDS
+    ) -> None:
+        """Align the hourly tables of all models."""
+        self.models = tuple(tables)
+        self.fields = tuple(fields)
+
+        # Společná mřížka celých hodin (epoch) přes všechny modely
+        hours = {round(timestamp / 3600) for table in tables.values() for timestamp in table.times}
+        self._start = min(hours) if hours else 0
+        count = max(hours) - self._start + 1 if hours else 0
+        self.grid = array("d", ((self._start + hour) * 3600 for hour in range(count)))
+
+        size = len(self.models) * count * len(self.fields)
+        self.values = array("d", [_NAN]) * size
+        self.mask = bytearray(size)
+        self._stats: dict[str, dict[str, array]] = {}
+
+        width = len(self.fields)
+        for model_index, table in enumerate(tables.values()):
+            columns = [table.column(field) for field in self.fields]
+            for row, timestamp in enumerate(table.times):
+                base = (model_index * count + round(timestamp / 3600) - self._start) * width
+                for field_index, column in enumerate(columns):
+                    if column is None:
+                        continue
+                    value = column[row]
+                    if value == value:
+                        self.values[base + field_index] = value
+                        self.mask[base + field_index] = 1
+
+    def __len__(self) -> int:
+        """Return number of hours on the grid."""
+        return len(self.grid)
+
+    def hour_index(self, timestamp: float) -> int | None:
+        """Return the grid index of the hour containing timestamp."""
+        index = int(timestamp // 3600) - self._start
+        return index if 0 <= index < len(self.grid) else None
+
+    def series(self, model: str, field: str) -> array:
+        """Return the aligned forecast of one model and variable (NaN = missing)."""
+        width = len(self.fields)
+        start = self.models.index(model) * len(self.grid) * width + self.fields.index(field)
+        return self.values[start:start + len(self.grid) * width:width]
+
+    def present(self, model: str, field: str) -> bytearray:
+        """Return the mask of one model and variable (1 = value present)."""
+        width = len(self.fields)
+        start = self.models.index(model) * len(self.grid) * width + self.fields.index(field)
+        return self.mask[start:start + len(self.grid) * width:width]
+
+    def cross_section(self, hour: int, field: str) -> list[float]:
+        """Return the values of all models that forecast a variable for an hour."""
+        width = len(self.fields)
+        stride = len(self.grid) * width
+        start = hour * width + self.fields.index(field)
+        return [
+            value
+            for value, present in zip(self.values[start::stride], self.mask[start::stride])
+            if present
+        ]
+
+    def stats(self, field: str) -> dict[str, array]:
+        """Return per-hour count, min, max, median, mean and spread across models.
+
+        Spread is the standard deviation of the model forecasts. Results are
+        cached; hours without any model have NaN.
+        """
+        cached = self._stats.get(field)
+        if cached is not None:
+            return cached
+
+        result = {name: array("d") for name in ("count", "min", "max", "median", "mean", "spread")}
+        for hour in range(len(self.grid)):
+            values = self.cross_section(hour, field)
+            result["count"].append(len(values))
+            if not values:
+                for name in ("min", "max", "median", "mean", "spread"):
+                    result[name].append(_NAN)
+                continue
+            mean = math.fsum(values) / len(values)
+            result["min"].append(min(values))
+            result["max"].append(max(values))
+            result["median"].append(statistics.median(values))
+            result["mean"].append(mean)
+            result["spread"].append(
+                math.sqrt(math.fsum((value - mean) ** 2 for value in values) / len(values))
+            )
+
+        self._stats[field] = result
+        return result
+
+    def models_exceeding(self, field: str, threshold: float, start: int, hours: int) -> list[str]:
+        """Return models forecasting a value above threshold in [start, start + hours)."""
+        start = max(start, 0)
+        end = min(start + hours, len(self.grid))
+        return [
+            model
+            for model in self.models
+            if any(value > threshold for value in self.series(model, field)[start:end])
+        ]
@@ -0,0 +1,130 @@
+"""Integration-wide update scheduler for PočasíMeteo."""
+import asyncio
+import logging
+import zlib
+from datetime import datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    REFRESH_LEAD_SECONDS,
+    SCHEDULE_MAX_CONCURRENT_STATIONS,
+    SCHEDULE_START_MINUTE,
+    SCHEDULE_WINDOW_MINUTES,
+    UPDATE_INTERVAL,
+)
+from .coordinator import PocasimeteoDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PocasimeteoScheduler:
+    """Own the hourly refresh of every configured station.
+
+    Each station gets a deterministic offset inside the load-spreading window
+    and refreshes run under a global concurrency budget (both configurable in
+    configuration.yaml). A station can be configured only once (unique_id of
+    the config entry), so there are no duplicate downloads to share. The
+    refresh URL of a station is called REFRESH_LEAD_SECONDS ahead of its
+    download, so upstream has regenerated the data by the time it is fetched.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window_minutes: int = SCHEDULE_WINDOW_MINUTES,
+        start_minute: int = SCHEDULE_START_MINUTE,
+        max_concurrent: int = SCHEDULE_MAX_CONCURRENT_STATIONS,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._window_seconds = max(1, int(window_minutes * 60))
+        self._start_seconds = int(start_minute * 60)
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+        # Koordinátor každé stanice (stanice může být nastavena jen jednou)
+        self._stations: dict[str, PocasimeteoDataUpdateCoordinator] = {}
+        self._unsub: dict[str, CALLBACK_TYPE] = {}
+        self._refresh_unsub: dict[str, CALLBACK_TYPE] = {}
+
+    def station_offset(self, station: str) -> int:
+        """Return the deterministic offset (seconds past the hour) of a station."""
+        return self._start_seconds + zlib.crc32(station.encode()) % self._window_seconds
+
+    def next_run(self, station: str, now: datetime) -> datetime:
+        """Return the next scheduled refresh of a station after now (UTC)."""
+        run = now.replace(minute=0, second=0, microsecond=0) + timedelta(
+            seconds=self.station_offset(station)
+        )
+        while run <= now:
+            run += UPDATE_INTERVAL
+        return run
+
+    @callback
+    def async_register(self, coordinator: PocasimeteoDataUpdateCoordinator) -> None:
+        """Add a coordinator to the schedule."""
+        station = coordinator.station
+        scheduled = station in self._stations
+        self._stations[station] = coordinator
+        if not scheduled:
+            self._schedule(station)
+
+    @callback
+    def async_unregister(self, coordinator: PocasimeteoDataUpdateCoordinator) -> None:
+        """Remove a coordinator from the schedule."""
+        if self._stations.get(coordinator.station) is coordinator:
+            self._stations.pop(coordinator.station)
+            if (unsub := self._unsub.pop(coordinator.station, None)) is not None:
+                unsub()
+            if (unsub := self._refresh_unsub.pop(coordinator.station, None)) is not None:
+                unsub()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel all scheduled refreshes."""
+        for unsub in (*self._unsub.values(), *self._refresh_unsub.values()):
+            unsub()
+        self._unsub.clear()
+        self._refresh_unsub.clear()
+        self._stations.clear()
+
+    @callback
+    def _schedule(self, station: str) -> None:
+        """Schedule the next refresh of a station."""
+        now = dt_util.utcnow()
+        run = self.next_run(station, now)
+        _LOGGER.debug("Scheduling next update of %s at %s", station, run.isoformat())
+
+        @callback
+        def _fire(_now: datetime) -> None:
+            self._unsub.pop(station, None)
+            if station not in self._stations:
+                return
+            self._schedule(station)
+            self.hass.async_create_task(self.async_refresh_station(station))
+
+        self._unsub[station] = async_track_point_in_utc_time(self.hass, _fire, run)
+
+        # Refresh URL s předstihem - stahování na něj nečeká
+        refresh_at = run - timedelta(seconds=REFRESH_LEAD_SECONDS)
+        if refresh_at <= now:
+            return
+
+        @callback
+        def _fire_refresh(_now: datetime) -> None:
+            self._refresh_unsub.pop(station, None)
+            if (coordinator := self._stations.get(station)) is not None:
+                coordinator.async_start_refresh()
+
+        self._refresh_unsub[station] = async_track_point_in_utc_time(
+            self.hass, _fire_refresh, refresh_at
+        )
+
+    async def async_refresh_station(self, station: str) -> None:
+        """Refresh a station within the global concurrency budget."""
+        if (coordinator := self._stations.get(station)) is None:
+            return
+        async with self._semaphore:
+            await coordinator.async_refresh()
@@ -0,0 +1,270 @@
+"""Sensor entities for PočasíMeteo."""
+import logging
+import math
+import time
+from datetime import datetime, timezone
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    ACCURACY_HORIZONS,
+    ACCURACY_WINDOWS,
+    ALL_MODELS,
+    CONF_INSTRUMENTATION,
+    DEFAULT_INSTRUMENTATION,
+    DOMAIN,
+    MATRIX_RAIN_HOURS,
+    MATRIX_RAIN_THRESHOLD,
+    MATRIX_SUMMARY_HOURS,
+)
+from .coordinator import PocasimeteoDataUpdateCoordinator
+from .matrix import MATRIX_VARIABLES, STATS_EXCLUDED_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up PočasíMeteo sensors."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    entities: list[SensorEntity] = [
+        # Klouzavá přesnost předpovědi teploty pro každý model
+        PocasimeteoAccuracySensor(coordinator, entry, model) for model in ALL_MODELS
+    ]
+    # Shoda modelů - statistiky přes všechny modely po hodinách
+    entities.append(PocasimeteoSpreadSensor(coordinator, entry))
+    # Diagnostické senzory měření výkonu jen se zapnutým měřením
+    if entry.options.get(CONF_INSTRUMENTATION, DEFAULT_INSTRUMENTATION):
+        entities.append(PocasimeteoUpdateDurationSensor(coordinator, entry))
+        entities.append(PocasimeteoDownloadedSensor(coordinator, entry))
+    async_add_entities(entities)
+
+
+class PocasimeteoAccuracySensor(CoordinatorEntity, SensorEntity):
+    """Rolling temperature forecast error (MAE over 24 h) of a model."""
+
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:bullseye-arrow"
+
+    def __init__(
+        self,
+        coordinator: PocasimeteoDataUpdateCoordinator,
+        entry: ConfigEntry,
+        model: str,
+        variable: str = "temperature",
+        horizon: int = 0,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+
+        self._model = model
+        self._variable = variable
+        self._horizon = horizon
+        self._station = entry.data["station"]
+
+        station_clean = self._station.replace("-", "_")
+        model_label = ALL_MODELS.get(model, {}).get("label", model)
+        self._attr_unique_id = f"pocasimeteo_{station_clean}_{model.lower()}_accuracy"
+        self._attr_name = f"PočasíMeteo {self._station} {model_label} přesnost"
+
+    @property
+    def available(self) -> bool:
+        """Return True if data is available, including data restored from the snapshot."""
+        return super().available or self.coordinator.serving_snapshot
+
+    def _get_windows(self) -> dict:
+        """Get rolling statistics of all windows for this model."""
+        if not self.coordinator.data:
+            return {}
+        accuracy = self.coordinator.data.get("accuracy", {})
+        return accuracy.get(self._model, {}).get(self._variable, {}).get(self._horizon, {})
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean absolute error over the last 24 hours."""
+        return self._get_windows().get("24h", {}).get("mae")
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return MAE, RMSE, bias and sample count of every window."""
+        windows = self._get_windows()
+        attributes = {
+            "model": ALL_MODELS.get(self._model, {}).get("label", self._model),
+            "variable": self._variable,
+            "horizon_hours": self._horizon,
+        }
+        for window in ACCURACY_WINDOWS:
+            stats = windows.get(window, {})
+            attributes[f"mae_{window}"] = stats.get("mae")
+            attributes[f"rmse_{window}"] = stats.get("rmse")
+            attributes[f"bias_{window}"] = stats.get("bias")
+            attributes[f"samples_{window}"] = stats.get("samples", 0)
+
+        # Přehled všech vyhodnocovaných veličin a předstihů (MAE za 7 dní)
+        attributes["mae_7d_by_horizon"] = self._get_mae_by_horizon("7d")
+        return attributes
+
+    def _get_mae_by_horizon(self, window: str) -> dict:
+        """Get {variable: {"<h>h": MAE}} of this model for one window."""
+        if not self.coordinator.data:
+            return {}
+        variables = self.coordinator.data.get("accuracy", {}).get(self._model, {})
+        return {
+            variable: {
+                f"{horizon}h": horizons[horizon][window]["mae"]
+                for horizon in ACCURACY_HORIZONS
+                if horizon in horizons and horizons[horizon][window]["mae"] is not None
+            }
+            for variable, horizons in variables.items()
+        }
+
+
+class PocasimeteoSpreadSensor(CoordinatorEntity, SensorEntity):
+    """Spread of the temperature forecast across models for the current hour.
+
+    Attributes carry per-hour min, max, median and spread of every variable
+    for the next hours and the models that show rain soon.
+    """
+
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chart-bell-curve"
+    # Statistiky na další hodiny se mění každou hodinu - do historie nepatří
+    _unrecorded_attributes = frozenset(("hours", *MATRIX_VARIABLES))
+
+    def __init__(self, coordinator: PocasimeteoDataUpdateCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+
+        self._station = entry.data["station"]
+        station_clean = self._station.replace("-", "_")
+        self._attr_unique_id = f"pocasimeteo_{station_clean}_model_spread"
+        self._attr_name = f"PočasíMeteo {self._station} rozptyl modelů"
+
+    @property
+    def available(self) -> bool:
+        """Return True if data is available, including data restored from the snapshot."""
+        return super().available or self.coordinator.serving_snapshot
+
+    def _get_matrix(self):
+        """Get the aligned model matrix and the index of the current hour."""
+        if not self.coordinator.data:
+            return None, None
+        matrix = self.coordinator.data.get("matrix")
+        if matrix is None:
+            return None, None
+        return matrix, matrix.hour_index(time.time())
+
+    @staticmethod
+    def _rounded(values) -> list:
+        """Round statistics for attributes (NaN -> None)."""
+        return [None if value != value else round(value, 2) for value in values]
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the temperature spread across models in the current hour."""
+        matrix, hour = self._get_matrix()
+        if hour is None:
+            return None
+        spread = matrix.stats("Te")["spread"][hour]
+        return None if math.isnan(spread) else round(spread, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return cross-model statistics for the next hours."""
+        matrix, hour = self._get_matrix()
+        if hour is None:
+            return {}
+
+        end = min(hour + MATRIX_SUMMARY_HOURS, len(matrix))
+        attributes = {
+            "models": list(matrix.models),
+            "hours": [
+                datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+                for timestamp in matrix.grid[hour:end]
+            ],
+            "rain_models_next_hours": matrix.models_exceeding(
+                "S", MATRIX_RAIN_THRESHOLD, hour, MATRIX_RAIN_HOURS
+            ),
+        }
+        for name, field in MATRIX_VARIABLES.items():
+            if field in STATS_EXCLUDED_FIELDS:
+                continue
+            stats = matrix.stats(field)
+            attributes[name] = {
+                statistic: self._rounded(stats[statistic][hour:end])
+                for statistic in ("min", "max", "median", "spread")
+            }
+        return attributes
+
+
+class PocasimeteoUpdateDurationSensor(CoordinatorEntity, SensorEntity):
+    """Duration of the last full update; attributes carry all stage timings."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-outline"
+    _unrecorded_attributes = frozenset({"stages"})
+
+    def __init__(self, coordinator: PocasimeteoDataUpdateCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+
+        self._station = entry.data["station"]
+        station_clean = self._station.replace("-", "_")
+        self._attr_unique_id = f"pocasimeteo_{station_clean}_update_duration"
+        self._attr_name = f"PočasíMeteo {self._station} doba aktualizace"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last full update in milliseconds."""
+        return self.coordinator.instrumentation.last_ms("update")
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return count, last, max and mean duration of every stage."""
+        return {"stages": self.coordinator.instrumentation.as_dict()}
+
+
+class PocasimeteoDownloadedSensor(CoordinatorEntity, SensorEntity):
+    """Bytes downloaded from the API; attributes carry fetch and cache counters."""
+
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:download-network-outline"
+
+    def __init__(self, coordinator: PocasimeteoDataUpdateCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+
+        self._station = entry.data["station"]
+        station_clean = self._station.replace("-", "_")
+        self._attr_unique_id = f"pocasimeteo_{station_clean}_downloaded"
+        self._attr_name = f"PočasíMeteo {self._station} stažená data"
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of bytes downloaded since Home Assistant started."""
+        return self.coordinator.stats["http_bytes"]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return HTTP, cache, retry and entity counters."""
+        return dict(sorted(self.coordinator.stats.items()))
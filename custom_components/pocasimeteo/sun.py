@@ -0,0 +1,167 @@
+"""Sunrise and sunset calendar cached per location and date.
+
+Sun times of the next days are computed once per date (astral when
+available, otherwise the NOAA approximation) and kept as a flat
+sorted array of sunrise/sunset timestamps, so day/night lookups are a
+bisect over numbers instead of parsing "HH:MM" strings.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+
+from .const import SUN_CALENDAR_DAYS
+
+# Pokus importovat astral - pokud není dostupný, použij jednoduchý fallback
+try:
+    from astral import Observer
+    from astral.sun import sun
+    ASTRAL_AVAILABLE = True
+except ImportError:
+    ASTRAL_AVAILABLE = False
+
+_LOGGER = logging.getLogger(__name__)
+
+# Kalendáře podle polohy - stanice se stejnými souřadnicemi sdílí výpočet
+_CALENDARS: dict[tuple, SunCalendar] = {}
+
+
+def _approximate_sun(latitude: float, longitude: float, day: date) -> tuple[datetime, datetime]:
+    """Return (sunrise, sunset) in UTC by the NOAA approximation (no dependencies)."""
+    # Zlomek roku v radiánech
+    gamma = 2 * math.pi / 365 * (day.timetuple().tm_yday - 1)
+
+    # Časová rovnice (minuty) a sluneční deklinace (radiány)
+    equation_of_time = 229.18 * (
+        0.000075
+        + 0.001868 * math.cos(gamma)
+        - 0.032077 * math.sin(gamma)
+        - 0.014615 * math.cos(2 * gamma)
+        - 0.040849 * math.sin(2 * gamma)
+    )
+    declination = (
+        0.006918
+        - 0.399912 * math.cos(gamma)
+        + 0.070257 * math.sin(gamma)
+        - 0.006758 * math.cos(2 * gamma)
+        + 0.000907 * math.sin(2 * gamma)
+        - 0.002697 * math.cos(3 * gamma)
+        + 0.00148 * math.sin(3 * gamma)
+    )
+
+    # Časový úhel východu/západu (refrakce -0.833°; polární den/noc -> omezení na <-1, 1>)
+    latitude_rad = math.radians(latitude)
+    cos_hour_angle = math.cos(math.radians(90.833)) / (
+        math.cos(latitude_rad) * math.cos(declination)
+    ) - math.tan(latitude_rad) * math.tan(declination)
+    hour_angle = math.degrees(math.acos(max(-1.0, min(1.0, cos_hour_angle))))
+
+    midnight = datetime.combine(day, time(0), timezone.utc)
+    sunrise = midnight + timedelta(minutes=720 - 4 * (longitude + hour_angle) - equation_of_time)
+    sunset = midnight + timedelta(minutes=720 - 4 * (longitude - hour_angle) - equation_of_time)
+    return sunrise, sunset
+
+
+def compute_sun_times(
+    latitude: float, longitude: float, day: date, time_zone: tzinfo
+) -> tuple[datetime, datetime]:
+    """Return timezone-aware (sunrise, sunset) of a day at a location."""
+    if ASTRAL_AVAILABLE:
+        try:
+            observer = Observer(latitude=latitude, longitude=longitude, elevation=0)
+            sun_data = sun(observer, date=day, tzinfo=time_zone)
+            return sun_data["sunrise"], sun_data["sunset"]
+        except ValueError:
+            # Slunce nevychází/nezapadá (polární oblasti) - aproximace to zvládne
+            pass
+
+    sunrise, sunset = _approximate_sun(latitude, longitude, day)
+    return sunrise.astimezone(time_zone), sunset.astimezone(time_zone)
+
+
+class SunCalendar:
+    """Sunrise and sunset of the next days at one location."""
+
+    def __init__(
+        self,
+        latitude: float,
+        longitude: float,
+        time_zone: tzinfo,
+        days: int = SUN_CALENDAR_DAYS,
+    ) -> None:
+        """Initialize the calendar (computed lazily)."""
+        self.latitude = latitude
+        self.longitude = longitude
+        self.time_zone = time_zone
+        self.days = max(1, days)
+
+        # Datum -> (východ, západ) jako datetime s časovou zónou
+        self._days: dict[date, tuple[datetime, datetime]] = {}
+        # Seřazené časy [východ, západ, východ, západ, ...] pro bisect
+        self._bounds = array("d")
+        # Rozsah pokrytý _bounds (timestamp)
+        self._start = math.inf
+        self._end = -math.inf
+
+    def _fill(self, first_day: date) -> None:
+        """Compute sun times from the day before first_day for the next days."""
+        wanted = [first_day + timedelta(days=offset) for offset in range(-1, self.days + 1)]
+        self._days = {
+            day: self._days.get(day)
+            or compute_sun_times(self.latitude, self.longitude, day, self.time_zone)
+            for day in wanted
+        }
+        self._bounds = array(
+            "d",
+            (
+                moment.timestamp()
+                for day in wanted
+                for moment in self._days[day]
+            ),
+        )
+        # Den před a poslední den slouží jen jako okraj pro noc kolem půlnoci
+        self._start = self._bounds[1]
+        self._end = self._bounds[-2]
+        _LOGGER.debug(
+            f"Sun times computed for {self.latitude:.3f}, {self.longitude:.3f} "
+            f"from {wanted[1]} ({len(wanted) - 2} days)"
+        )
+
+    def _ensure(self, timestamp: float) -> None:
+        """Make sure the timestamp is covered by the precomputed days."""
+        if not self._start <= timestamp < self._end:
+            self._fill(datetime.fromtimestamp(timestamp, self.time_zone).date())
+
+    def times(self, day: date) -> tuple[datetime, datetime]:
+        """Return timezone-aware (sunrise, sunset) of a local date."""
+        if day not in self._days:
+            self._fill(day)
+        return self._days[day]
+
+    def is_night(self, timestamp: float) -> bool:
+        """Return True if the sun is below the horizon at the timestamp."""
+        self._ensure(timestamp)
+        # Sudý index = před východem nebo po západu
+        return bisect_right(self._bounds, timestamp) % 2 == 0
+
+    def as_dict(self, timestamp: float) -> dict:
+        """Return today's sun times in the format of coordinator data["sun_times"]."""
+        self._ensure(timestamp)
+        sunrise, sunset = self.times(datetime.fromtimestamp(timestamp, self.time_zone).date())
+        return {
+            "sunrise": sunrise.strftime("%H:%M"),
+            "sunset": sunset.strftime("%H:%M"),
+            "sunrise_datetime": sunrise.isoformat(),
+            "sunset_datetime": sunset.isoformat(),
+        }
+
+
+def get_sun_calendar(latitude: float, longitude: float, time_zone: tzinfo) -> SunCalendar:
+    """Return the shared sun calendar of a location."""
+    key = (round(latitude, 3), round(longitude, 3), str(time_zone))
+    if (calendar := _CALENDARS.get(key)) is None:
+        calendar = _CALENDARS[key] = SunCalendar(latitude, longitude, time_zone)
+    return calendar
@@ -1,5 +1,6 @@
 """Weather entity for PočasíMeteo."""
 import logging
+import time
 from datetime import datetime
 
 from homeassistant.components.weather import (
@@ -15,67 +16,32 @@ from homeassistant.components.weather import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfPressure, UnitOfSpeed, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONDITION_MAP, CONF_MODEL, DOMAIN, WEATHER_MODELS, ICON_CODE_MAP, PRAGUE_TIMEZONE
+from .const import (
+    ALL_MODELS,
+    CONF_FORECAST_ATTRIBUTES,
+    CONF_MODEL,
+    DATA_ENTITIES,
+    DEFAULT_FORECAST_ATTRIBUTES,
+    DOMAIN,
+    FORECAST_ATTRIBUTES,
+    FORECAST_DAILY_LIMIT,
+    FORECAST_HOURLY_LIMIT,
+)
 from .coordinator import PocasimeteoDataUpdateCoordinator
+from .holidays import holiday_name
 
 _LOGGER = logging.getLogger(__name__)
 
+# Hodnoty aktuální hodiny, které se promítají do stavu a atributů entity
+STATE_FINGERPRINT_FIELDS = ("Te", "Vl", "Tl", "V", "VN", "VSS", "VS", "O", "SP", "SK", "Ik")
+
 
-def _get_czech_holiday(date: datetime) -> str | None:
-    """Get Czech holiday name for given date, or None if no holiday."""
-    # Fixed Czech holidays (month, day)
-    fixed_holidays = {
-        (1, 1): "Nový rok",
-        (5, 1): "Svátek práce",
-        (5, 8): "Den vítězství",
-        (7, 5): "Den slovanských věrozvěstů",
-        (7, 6): "Upálení Jana Husa",
-        (9, 28): "Den české státnosti",
-        (10, 28): "Vznik samostatného československého státu",
-        (11, 17): "Den boje za svobodu a demokracii",
-        (12, 24): "Štedrej den",
-        (12, 25): "Boží hod",
-        (12, 26): "Den svatého Štěpána",
-    }
-
-    # Easter-dependent holidays - calculate Easter date
-    # Using simplified algorithm for Czech holidays
-    # For 2024-2026, use hardcoded values to avoid complex calculations
-    easter_holidays_2024 = {
-        (3, 29): "Velký pátek",
-        (3, 31): "Velikonoční neděle",
-        (4, 1): "Velikonoční pondělí",
-    }
-    easter_holidays_2025 = {
-        (4, 18): "Velký pátek",
-        (4, 20): "Velikonoční neděle",
-        (4, 21): "Velikonoční pondělí",
-    }
-    easter_holidays_2026 = {
-        (4, 3): "Velký pátek",
-        (4, 5): "Velikonoční neděle",
-        (4, 6): "Velikonoční pondělí",
-    }
-
-    month_day = (date.month, date.day)
-
-    # Check fixed holidays
-    if month_day in fixed_holidays:
-        return fixed_holidays[month_day]
-
-    # Check Easter-dependent holidays by year
-    if date.year == 2024 and month_day in easter_holidays_2024:
-        return easter_holidays_2024[month_day]
-    elif date.year == 2025 and month_day in easter_holidays_2025:
-        return easter_holidays_2025[month_day]
-    elif date.year == 2026 and month_day in easter_holidays_2026:
-        return easter_holidays_2026[month_day]
-
-    return None
+# České názvy dnů v týdnu (index podle datetime.weekday())
+CZECH_DAY_NAMES = ("Pondělí", "Úterý", "Středa", "Čtvrtek", "Pátek", "Sobota", "Neděle")
 
 
 async def async_setup_entry(
@@ -100,7 +66,7 @@ async def async_setup_entry(
     )
 
     # Pak vytvoř entity pro všechny ostatní modely (s suffixem)
-    for model in WEATHER_MODELS.keys():
+    for model in ALL_MODELS.keys():
         if model != "MASTER":
             entities.append(
                 PocasimeteoWeather(
@@ -123,6 +89,8 @@ class PocasimeteoWeather(CoordinatorEntity, WeatherEntity):
     _attr_supported_features = (
         WeatherEntityFeature.FORECAST_HOURLY | WeatherEntityFeature.FORECAST_DAILY
     )
+    # Předpověď v atributech se mění každou hodinu - do historie nepatří
+    _unrecorded_attributes = frozenset(FORECAST_ATTRIBUTES)
 
     def __init__(
         self,
@@ -137,12 +105,15 @@ class PocasimeteoWeather(CoordinatorEntity, WeatherEntity):
         self._model = model
         self._station = entry.data["station"]
         self._is_primary = is_primary
+        self._forecast_attributes = entry.options.get(
+            CONF_FORECAST_ATTRIBUTES, DEFAULT_FORECAST_ATTRIBUTES
+        )
 
         # Nastavení unique_id a entity_id
         station_clean = self._station.replace("-", "_")
 
-        # Get model label from WEATHER_MODELS
-        model_label = WEATHER_MODELS.get(model, {}).get("label", model)
+        # Get model label from ALL_MODELS (včetně virtuálních modelů)
+        model_label = ALL_MODELS.get(model, {}).get("label", model)
 
         if is_primary:
             # Primární entita bez suffixu
@@ -154,189 +125,215 @@ class PocasimeteoWeather(CoordinatorEntity, WeatherEntity):
             self._attr_unique_id = f"pocasimeteo_{station_clean}_{model_lower}"
             self._attr_name = f"PočasíMeteo {self._station} {model_label}"
 
-    def _is_after_sunset(self) -> bool:
-        """Check if current time is after sunset."""
-        if not self.coordinator.data:
-            return False
-
-        sun_times = self.coordinator.data.get("sun_times", {})
-        sunset_str = sun_times.get("sunset", "")
-
-        if not sunset_str:
-            return False
-
-        try:
-            # Parsuj čas západu slunce
-            sunset_time = datetime.strptime(sunset_str, "%H:%M").time()
-            # Porovnej s aktuálním časem
-            current_time = datetime.now(PRAGUE_TIMEZONE).time()
-            return current_time >= sunset_time
-        except (ValueError, TypeError):
-            return False
-
-    def _get_icon_with_night_adjustment(self, icon_code: str) -> str:
-        """Get icon code, replacing sunny icons with moon icon if after sunset."""
-        # Mapy ikon které se mají nahradit měsíčkem po западu
-        sunny_to_moon_map = {
-            "a01d": "a01n",  # Slunečno → Měsíc/jasno v noci
-            "a02d": "a02n",  # Polojasno → Polojasno v noci
-        }
+        # Memo aktuální hodiny: (tabulka, index, platné od, platné do)
+        self._current_index_cache: tuple | None = None
+        # Memo atributů: ((generace dat, index hodiny), atributy)
+        self._attributes_cache: tuple | None = None
+        # Otisk naposledy zapsaného stavu (viz _state_fingerprint)
+        self._last_fingerprint: tuple | None = None
+        # Memo předpovědi pro atributy/websocket: (tabulky modelu, předpověď)
+        self._forecast_cache: tuple | None = None
 
-        # Pokud jsme po západu slunce a je to denní ikona slunce, nahraď ji noční
-        if self._is_after_sunset() and icon_code in sunny_to_moon_map:
-            return sunny_to_moon_map[icon_code]
+    @property
+    def available(self) -> bool:
+        """Return True if data is available, including data restored from the snapshot."""
+        return super().available or self.coordinator.serving_snapshot
+
+    async def async_added_to_hass(self) -> None:
+        """Register the entity for the websocket API."""
+        await super().async_added_to_hass()
+        self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ENTITIES, {})[self.entity_id] = self
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unregister the entity from the websocket API."""
+        entities = self.hass.data.get(DOMAIN, {}).get(DATA_ENTITIES, {})
+        if entities.get(self.entity_id) is self:
+            entities.pop(self.entity_id)
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if this model's data or current-hour values changed.
+
+        Skipped writes save a recorder row with the whole attribute payload for
+        every entity whose model did not move in this coordinator generation.
+        """
+        self._current_index_cache = None
+        self._attributes_cache = None
+
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._last_fingerprint:
+            self.coordinator.stats["state_write_skipped"] += 1
+            return
+
+        self._last_fingerprint = fingerprint
+        self.coordinator.stats["state_write"] += 1
+        super()._handle_coordinator_update()
+
+    def _state_fingerprint(self) -> tuple:
+        """Return what the written state of this entity depends on."""
+        model_data = self._get_model_data()
+        index = self._get_current_index()
+        current = ()
+        if index is not None:
+            hourly = model_data["hourly"]
+            current = tuple(hourly.value(field, index) for field in STATE_FINGERPRINT_FIELDS)
+
+        sun_times = self.coordinator.data.get("sun_times", {}) if self.coordinator.data else {}
+        return (
+            self.available,
+            # Generace poslední změny modelu (mění se jen pokud je model v changed_models)
+            model_data.get("generation"),
+            model_data.get("data_stale"),
+            model_data.get("fallback_of"),
+            current,
+            # Stav "clear-night" se mění se západem/východem slunce
+            self.coordinator.sun.is_night(time.time()),
+            sun_times.get("sunrise"),
+            sun_times.get("sunset"),
+        )
 
-        return icon_code
+    def _night_condition(self, condition: str, timestamp: float) -> str:
+        """Return clear-night instead of sunny when the sun is below the horizon."""
+        # Předpočítané časy východu/západu - jen porovnání čísel
+        if condition == "sunny" and self.coordinator.sun.is_night(timestamp):
+            return "clear-night"
+        return condition
 
     @property
     def native_temperature(self) -> float | None:
         """Return the current temperature."""
-        current = self._get_current_data()
-        if current:
-            return current.get("Te")
-        return None
+        return self._get_current_value("Te")
 
     @property
     def humidity(self) -> int | None:
         """Return the humidity."""
-        current = self._get_current_data()
-        if current:
-            return current.get("Vl")
-        return None
+        return self._get_current_value("Vl")
 
     @property
     def native_pressure(self) -> float | None:
         """Return the pressure."""
-        current = self._get_current_data()
-        if current:
-            return current.get("Tl")
-        return None
+        return self._get_current_value("Tl")
 
     @property
     def native_wind_speed(self) -> float | None:
         """Return the wind speed."""
-        current = self._get_current_data()
-        if current:
-            return current.get("V")
-        return None
+        return self._get_current_value("V")
 
     @property
     def wind_bearing(self) -> float | None:
         """Return the wind bearing."""
-        current = self._get_current_data()
-        if current:
-            return current.get("VSS")
-        return None
+        return self._get_current_value("VSS")
 
     @property
     def condition(self) -> str | None:
         """Return the weather condition."""
-        current = self._get_current_data()
-        if current and current.get("Ik"):
-            icon_code = current["Ik"].split(".")[0][:2]
-            return CONDITION_MAP.get(icon_code, "unknown")
+        index = self._get_current_index()
+        if index is None:
+            return None
+        hourly = self._get_model_data()["hourly"]
+        if hourly.value("Ik", index):
+            return self._night_condition(hourly.conditions[index], time.time())
         return None
 
-    def _get_current_data(self) -> dict | None:
-        """Get current weather data for this model."""
+    def _get_model_data(self) -> dict:
+        """Get coordinator data of this model."""
         if not self.coordinator.data:
-            return None
+            return {}
+        return self.coordinator.data.get("models", {}).get(self._model, {})
 
-        model_data = self.coordinator.data.get("models", {}).get(self._model, {})
-        hourly_data = model_data.get("data", [])
+    def _get_current_index(self) -> int | None:
+        """Get index of the current hour in this model's hourly forecast.
 
-        if not hourly_data:
+        The lookup is memoized until the nearest hour changes or the coordinator
+        publishes new data.
+        """
+        hourly = self._get_model_data().get("hourly")
+        if not hourly:
             return None
 
-        # Pokus najít nejbližší aktuální čas
-        from datetime import datetime as dt_module
-        now = dt_module.now()
-
-        closest_item = None
-        closest_diff = float('inf')
+        now = time.time()
+        cached = self._current_index_cache
+        if cached is not None and cached[0] is hourly and cached[2] <= now < cached[3]:
+            return cached[1]
 
-        for item in hourly_data[:24]:  # Hledej v prvních 24 hodinách
-            try:
-                item_time = dt_module.strptime(item.get("Dat", ""), "%m/%d/%y %H:%M:%S")
-                diff = abs((item_time - now).total_seconds())
-                if diff < closest_diff:
-                    closest_diff = diff
-                    closest_item = item
-                # Pokud jsme našli budoucí čas a máme kandidáta, skončíme
-                if item_time > now and closest_item:
-                    break
-            except (ValueError, KeyError):
-                continue
+        # Najdi nejbližší aktuální čas (bisect nad seřazenými časy)
+        index, valid_from, valid_until = hourly.nearest_index(now)
+        self._current_index_cache = (hourly, index, valid_from, valid_until)
+        return index
 
-        return closest_item if closest_item else hourly_data[0]
+    def _get_current_value(self, field: str, default=None):
+        """Get a value of the current hour for this model."""
+        index = self._get_current_index()
+        if index is None:
+            return default
+        return self._get_model_data()["hourly"].value(field, index, default)
 
     async def async_forecast_hourly(self) -> list[Forecast] | None:
         """Return the hourly forecast."""
+        with self.coordinator.instrumentation.timer("entity.forecast_hourly"):
+            return self._hourly_forecast()
+
+    def _hourly_forecast(self) -> list[Forecast] | None:
+        """Build the hourly forecast."""
         if not self.coordinator.data:
             _LOGGER.warning(f"[{self._model}] No coordinator data available")
             return None
 
-        model_data = self.coordinator.data.get("models", {}).get(self._model, {})
+        model_data = self._get_model_data()
         if not model_data:
             _LOGGER.warning(f"[{self._model}] No model data in coordinator for this model")
             return None
 
-        hourly_data = model_data.get("data", [])
-        _LOGGER.debug(f"[{self._model}] async_forecast_hourly: found {len(hourly_data)} hourly items")
+        hourly = model_data["hourly"]
+        _LOGGER.debug(f"[{self._model}] async_forecast_hourly: found {len(hourly)} hourly items")
 
         forecasts = []
-        for item in hourly_data[:48]:  # 48 hodin dopředu
-            try:
-                dt = datetime.strptime(item["Dat"], "%m/%d/%y %H:%M:%S")
-                icon_code = item.get("Ik", "").split(".")[0][:2]
-
-                forecast = {
-                    ATTR_FORECAST_TIME: dt.isoformat(),
-                    ATTR_FORECAST_TEMP: item.get("Te"),
-                    ATTR_FORECAST_PRECIPITATION: item.get("S", 0),
-                    ATTR_FORECAST_WIND_SPEED: item.get("V"),
-                    ATTR_FORECAST_WIND_BEARING: item.get("VSS"),
-                    ATTR_FORECAST_CONDITION: CONDITION_MAP.get(icon_code, "unknown"),
-                }
-                forecasts.append(forecast)
-            except (KeyError, ValueError) as err:
-                _LOGGER.warning(f"[{self._model}] Error parsing forecast data: %s", err)
-                continue
+        for index in range(min(FORECAST_HOURLY_LIMIT, len(hourly))):  # 48 hodin dopředu
+            forecast = {
+                ATTR_FORECAST_TIME: hourly.iso[index],
+                ATTR_FORECAST_TEMP: hourly.value("Te", index),
+                ATTR_FORECAST_PRECIPITATION: hourly.value("S", index, 0),
+                ATTR_FORECAST_WIND_SPEED: hourly.value("V", index),
+                ATTR_FORECAST_WIND_BEARING: hourly.value("VSS", index),
+                ATTR_FORECAST_CONDITION: self._night_condition(
+                    hourly.conditions[index], hourly.times[index]
+                ),
+            }
+            forecasts.append(forecast)
 
         _LOGGER.debug(f"[{self._model}] async_forecast_hourly: returning {len(forecasts)} forecasts")
         return forecasts
 
     async def async_forecast_daily(self) -> list[Forecast] | None:
         """Return the daily forecast."""
+        with self.coordinator.instrumentation.timer("entity.forecast_daily"):
+            return self._daily_forecast()
+
+    def _daily_forecast(self) -> list[Forecast] | None:
+        """Build the daily forecast."""
         if not self.coordinator.data:
             _LOGGER.warning(f"[{self._model}] No coordinator data available")
             return None
 
-        model_data = self.coordinator.data.get("models", {}).get(self._model, {})
+        model_data = self._get_model_data()
         if not model_data:
             _LOGGER.warning(f"[{self._model}] No model data in coordinator for this model")
             return None
 
-        daily_data = model_data.get("data_dne", [])
-        _LOGGER.debug(f"[{self._model}] async_forecast_daily: found {len(daily_data)} daily items")
+        daily = model_data["daily"]
+        _LOGGER.debug(f"[{self._model}] async_forecast_daily: found {len(daily)} daily items")
 
         forecasts = []
-        for item in daily_data[:7]:  # 7 dní dopředu
-            try:
-                dt = datetime.strptime(item["Dat_dne"], "%m/%d/%y %H:%M:%S")
-                icon_code = item.get("IkD", "").split(".")[0][:2]
-
-                forecast = {
-                    ATTR_FORECAST_TIME: dt.isoformat(),
-                    ATTR_FORECAST_TEMP: item.get("Tmax"),  # Maximální teplota
-                    "templow": item.get("Tmin"),  # Minimální teplota
-                    ATTR_FORECAST_PRECIPITATION: item.get("S_den", 0),
-                    ATTR_FORECAST_CONDITION: CONDITION_MAP.get(icon_code, "unknown"),
-                }
-                forecasts.append(forecast)
-            except (KeyError, ValueError) as err:
-                _LOGGER.warning(f"[{self._model}] Error parsing daily forecast: %s", err)
-                continue
+        for index in range(min(FORECAST_DAILY_LIMIT, len(daily))):  # 7 dní dopředu
+            forecast = {
+                ATTR_FORECAST_TIME: daily.iso[index],
+                ATTR_FORECAST_TEMP: daily.value("Tmax", index),  # Maximální teplota
+                "templow": daily.value("Tmin", index),  # Minimální teplota
+                ATTR_FORECAST_PRECIPITATION: daily.value("S_den", index, 0),
+                ATTR_FORECAST_CONDITION: daily.conditions[index],
+            }
+            forecasts.append(forecast)
 
         _LOGGER.debug(f"[{self._model}] async_forecast_daily: returning {len(forecasts)} forecasts")
         return forecasts
@@ -344,25 +341,50 @@ class PocasimeteoWeather(CoordinatorEntity, WeatherEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return additional state attributes."""
-        current = self._get_current_data()
-        if not current:
+        with self.coordinator.instrumentation.timer("entity.extra_state_attributes"):
+            return self._state_attributes()
+
+    def _state_attributes(self) -> dict:
+        """Build additional state attributes.
+
+        The payload is built once per (coordinator generation, current hour);
+        only the date/time dependent keys are refreshed on every read.
+        """
+        index = self._get_current_index()
+        if index is None:
             return {}
 
-        model_data = self.coordinator.data.get("models", {}).get(self._model, {})
+        cache_key = (self.coordinator.data.get("generation"), index)
+        if self._attributes_cache is not None and self._attributes_cache[0] == cache_key:
+            self.coordinator.stats["attributes_cache_hit"] += 1
+        else:
+            self.coordinator.stats["attributes_cache_miss"] += 1
+            self._attributes_cache = (cache_key, self._build_attributes(index))
+
+        attributes = dict(self._attributes_cache[1])
+
+        # Get current date/time info
+        now = datetime.now()
+        day_name = CZECH_DAY_NAMES[now.weekday()]
+        attributes["current_date"] = f"{day_name} {now.day}. {now.strftime('%B')}"  # e.g., "Středa 19. listopadu"
+        attributes["current_time"] = now.strftime("%H:%M")
+
+        holiday = holiday_name(now.date())
+        if holiday:
+            attributes["current_holiday"] = holiday
+
+        return attributes
+
+    def _build_attributes(self, index: int) -> dict:
+        """Build the cacheable part of the state attributes for the current hour."""
+        model_data = self._get_model_data()
+        hourly = model_data["hourly"]
         data_stale = model_data.get("data_stale", False)
         data_age_minutes = model_data.get("data_age_minutes")
 
         # Vrať raw ikonu z API - frontend si řeší mapování
         # API vrací správný d/n suffix již v Ik (např. "01d.png", "01n.png", "46.png")
-        ik_value = current.get("Ik", "")
-
-        # Get current date/time info
-        now = datetime.now()
-        czech_day_names = ["Pondělí", "Úterý", "Středa", "Čtvrtek", "Pátek", "Sobota", "Neděle"]
-        day_name = czech_day_names[now.weekday()]
-        date_str = f"{day_name} {now.day}. {now.strftime('%B')}"  # e.g., "Středa 19. listopadu"
-        time_str = now.strftime("%H:%M")
-        holiday_name = _get_czech_holiday(now)
+        ik_value = hourly.value("Ik", index, "")
 
         # Získej sunrise/sunset
         sun_times = self.coordinator.data.get("sun_times", {})
@@ -373,86 +395,93 @@ class PocasimeteoWeather(CoordinatorEntity, WeatherEntity):
         available_models = self.coordinator.data.get("available_models", [])
 
         # Get model label
-        model_label = WEATHER_MODELS.get(self._model, {}).get("label", self._model)
+        model_label = ALL_MODELS.get(self._model, {}).get("label", self._model)
 
         attributes = {
             "model": model_label,
             "available_models": available_models,
-            "cloudiness": current.get("O"),
-            "precipitation_probability": current.get("SP"),
-            "snow": current.get("SK", 0),
-            "wind_gust": current.get("VN"),
-            "wind_direction": current.get("VS"),
-            "wind_direction_czech": current.get("VS", "--"),  # VS je již v češtině (S, J, V, Z, SV, atd.)
+            "cloudiness": hourly.value("O", index),
+            "precipitation_probability": hourly.value("SP", index),
+            "snow": hourly.value("SK", index, 0),
+            "wind_gust": hourly.value("VN", index),
+            "wind_direction": hourly.value("VS", index),
+            "wind_direction_czech": hourly.value("VS", index, "--"),  # VS je již v češtině (S, J, V, Z, SV, atd.)
             "data_stale": data_stale,
             "icon_code": ik_value,  # Raw ikona z API - frontend si řeší mapování
-            "current_date": date_str,
-            "current_time": time_str,
+            "current_date": None,  # Doplní se při každém čtení
+            "current_time": None,  # Doplní se při každém čtení
             "sunrise": sunrise_time,
             "sunset": sunset_time,
         }
 
-        if holiday_name:
-            attributes["current_holiday"] = holiday_name
-
         if data_age_minutes is not None:
             attributes["data_age_minutes"] = data_age_minutes
 
-        # Přidej hodinovou předpověď
-        hourly_data = model_data.get("data", [])
-        if hourly_data:
-            forecast_hourly = []
-            for item in hourly_data[:48]:  # 48 hodin dopředu
-                try:
-                    dt = datetime.strptime(item["Dat"], "%m/%d/%y %H:%M:%S")
-                    api_icon_code = item.get("Ik", "").split(".")[0][:2] if item.get("Ik") else ""
-
-                    forecast = {
-                        "datetime": dt.isoformat(),
-                        "temperature": item.get("Te"),
-                        "precipitation": item.get("S", 0),
-                        "wind_speed": item.get("V"),
-                        "wind_gust": item.get("VN"),
-                        "wind_bearing": item.get("VSS"),
-                        "condition": CONDITION_MAP.get(api_icon_code, "unknown"),
-                        "icon_code": item.get("Ik", ""),  # Raw ikona z API - frontend si řeší mapování
-                    }
-                    forecast_hourly.append(forecast)
-                except (KeyError, ValueError):
-                    continue
-
-            if forecast_hourly:
-                attributes["forecast_hourly"] = forecast_hourly
+        if fallback_of := model_data.get("fallback_of"):
+            attributes["fallback_of"] = fallback_of
 
-        # Přidej denní předpověď
-        daily_data = model_data.get("data_dne", [])
-        if daily_data:
-            forecast_daily = []
-            for item in daily_data[:7]:  # 7 dní dopředu
-                try:
-                    dt = datetime.strptime(item["Dat_dne"], "%m/%d/%y %H:%M:%S")
-                    api_icon_code = item.get("IkD", "").split(".")[0][:2] if item.get("IkD") else ""
-
-                    # Mapuj na PNG filename - fallback na "a04" pokud není znám
-                    icon_filename = ICON_CODE_MAP.get(api_icon_code, "a04")
-
-                    # Mapuj IkD přesně tak jak je (s .png, s d/n suffixy)
-                    ikd_value = item.get("IkD", "")
-                    forecast = {
-                        "datetime": dt.isoformat(),
-                        "temperature": item.get("Tmax"),  # Maximální teplota
-                        "templow": item.get("Tmin"),  # Minimální teplota
-                        "precipitation": item.get("S_den", 0),
-                        "wind_speed_max": item.get("Vmax"),  # Max vítr za den
-                        "wind_gust_max": item.get("VNmax"),  # Max poryvy za den
-                        "condition": CONDITION_MAP.get(api_icon_code, "unknown"),
-                        "icon_code": ikd_value,  # Raw ikona z API (např. "46.png", "04.png", "01d.png")
-                    }
-                    forecast_daily.append(forecast)
-                except (KeyError, ValueError):
-                    continue
-
-            if forecast_daily:
-                attributes["forecast_daily"] = forecast_daily
+        # Virtuální model BEST - ze kterých modelů vznikl
+        if sources := model_data.get("sources"):
+            attributes["ensemble_sources"] = sources
+
+        if self._forecast_attributes:
+            attributes.update(self.forecast_attributes())
 
         return attributes
+
+    def forecast_attributes(self) -> dict:
+        """Return the forecast_hourly/forecast_daily payload used by the custom card.
+
+        Built once per model data and shared by state attributes and the
+        pocasimeteo/forecast websocket command.
+        """
+        model_data = self._get_model_data()
+        if not model_data:
+            return {}
+
+        hourly = model_data["hourly"]
+        daily = model_data["daily"]
+        cached = self._forecast_cache
+        if cached is not None and cached[0] is hourly and cached[1] is daily:
+            return cached[2]
+
+        forecasts = {}
+
+        # Přidej hodinovou předpověď
+        forecast_hourly = []
+        for row in range(min(FORECAST_HOURLY_LIMIT, len(hourly))):  # 48 hodin dopředu
+            forecast = {
+                "datetime": hourly.iso[row],
+                "temperature": hourly.value("Te", row),
+                "precipitation": hourly.value("S", row, 0),
+                "wind_speed": hourly.value("V", row),
+                "wind_gust": hourly.value("VN", row),
+                "wind_bearing": hourly.value("VSS", row),
+                "condition": self._night_condition(hourly.conditions[row], hourly.times[row]),
+                "icon_code": hourly.value("Ik", row, ""),  # Raw ikona z API - frontend si řeší mapování
+            }
+            forecast_hourly.append(forecast)
+
+        if forecast_hourly:
+            forecasts["forecast_hourly"] = forecast_hourly
+
+        # Přidej denní předpověď
+        forecast_daily = []
+        for row in range(min(FORECAST_DAILY_LIMIT, len(daily))):  # 7 dní dopředu
+            forecast = {
+                "datetime": daily.iso[row],
+                "temperature": daily.value("Tmax", row),  # Maximální teplota
+                "templow": daily.value("Tmin", row),  # Minimální teplota
+                "precipitation": daily.value("S_den", row, 0),
+                "wind_speed_max": daily.value("Vmax", row),  # Max vítr za den
+                "wind_gust_max": daily.value("VNmax", row),  # Max poryvy za den
+                "condition": daily.conditions[row],
+                "icon_code": daily.value("IkD", row, ""),  # Raw ikona z API (např. "46.png", "04.png", "01d.png")
+            }
+            forecast_daily.append(forecast)
+
+        if forecast_daily:
+            forecasts["forecast_daily"] = forecast_daily
+
+        self._forecast_cache = (hourly, daily, forecasts)
+        return forecasts
@@ -0,0 +1,89 @@
+"""Websocket API for PočasíMeteo."""
+from datetime import date
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_ENTITIES,
+    DOMAIN,
+    FORECAST_ATTRIBUTES,
+    HOLIDAYS_UPCOMING_DAYS,
+    HOLIDAYS_UPCOMING_MAX_DAYS,
+)
+from .holidays import upcoming_holidays
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register websocket commands of the integration."""
+    websocket_api.async_register_command(hass, websocket_get_forecast)
+    websocket_api.async_register_command(hass, websocket_get_holidays)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/forecast",
+        vol.Required("entity_id"): str,
+        vol.Optional("forecast_type"): vol.In(["hourly", "daily"]),
+    }
+)
+@callback
+def websocket_get_forecast(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return forecast_hourly/forecast_daily of a weather entity on demand.
+
+    The payload has the same shape as the entity attributes, so the custom card
+    can load it lazily instead of reading it from the state.
+    """
+    entity = hass.data.get(DOMAIN, {}).get(DATA_ENTITIES, {}).get(msg["entity_id"])
+    if entity is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"Entity {msg['entity_id']} not found"
+        )
+        return
+
+    forecasts = entity.forecast_attributes()
+    if forecast_type := msg.get("forecast_type"):
+        key = f"forecast_{forecast_type}"
+        forecasts = {key: forecasts.get(key, [])}
+    else:
+        forecasts = {key: forecasts.get(key, []) for key in FORECAST_ATTRIBUTES}
+
+    connection.send_result(msg["id"], forecasts)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/holidays",
+        vol.Optional("start"): str,
+        vol.Optional("days", default=HOLIDAYS_UPCOMING_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HOLIDAYS_UPCOMING_MAX_DAYS)
+        ),
+    }
+)
+@callback
+def websocket_get_holidays(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return Czech public holidays from start (default today) for the given number of days."""
+    if start := msg.get("start"):
+        try:
+            start_date = date.fromisoformat(start)
+        except ValueError:
+            connection.send_error(
+                msg["id"], websocket_api.ERR_INVALID_FORMAT, f"Invalid start date {start}"
+            )
+            return
+    else:
+        start_date = dt_util.now().date()
+
+    holidays = upcoming_holidays(start_date, msg.get("days", HOLIDAYS_UPCOMING_DAYS))
+    connection.send_result(
+        msg["id"],
+        {"holidays": [{"date": day.isoformat(), "name": name} for day, name in holidays]},
+    )